@@ -0,0 +1 @@
+"""Synthetic datasets and benchmarks for the core hot paths (``python -m benchmarks``)."""
@@ -0,0 +1,110 @@
+"""Command line for the benchmark suite.
+
+    python -m benchmarks list
+    python -m benchmarks generate nudge-100k.db --items 100k
+    python -m benchmarks run --sizes 1k,10k [--filter 'model.*'] [--save NAME] [--compare NAME]
+    python -m benchmarks load http://127.0.0.1:8765/due --concurrency 8 --duration 5
+
+``run --compare`` exits with status 1 if any benchmark regressed past the
+threshold relative to the named baseline in benchmarks/baselines.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+from benchmarks.generator import DEFAULT_SEED, SIZES, generate_database
+from benchmarks.loadtest import run_load
+from benchmarks.runner import (
+    BASELINE_DIR,
+    DEFAULT_DATA_DIR,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_results,
+    run,
+    save_results,
+)
+from benchmarks.suites import BENCHMARKS
+
+
+def _size(value: str) -> int:
+    """Parse an item count such as 5000, 10k or 1m."""
+    value = value.strip().lower()
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        return int(value.replace("_", ""))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}") from None
+
+
+def _sizes(value: str) -> List[int]:
+    return [_size(part) for part in value.split(",") if part.strip()]
+
+
+def _baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINE_DIR / f"{name}.json"
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Nudge hot-path benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="list the benchmarks")
+
+    generate_parser = subparsers.add_parser("generate", help="write a synthetic database")
+    generate_parser.add_argument("path", help="database file to create")
+    generate_parser.add_argument("--items", type=_size, default=SIZES["10k"], help="number of items (e.g. 1k, 100k, 1m)")
+    generate_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=_sizes, default=[SIZES["1k"], SIZES["10k"]], help="comma-separated dataset sizes")
+    run_parser.add_argument("--filter", default="*", help="fnmatch pattern over benchmark names")
+    run_parser.add_argument("--repeat", type=int, default=5, help="minimum timed calls per benchmark")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="minimum measured seconds per benchmark")
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="where datasets are cached")
+    run_parser.add_argument("--save", metavar="NAME", help="save results as a baseline (name or .json path)")
+    run_parser.add_argument("--compare", metavar="NAME", help="compare with a saved baseline (name or .json path)")
+    run_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown ratio reported as a regression"
+    )
+
+    load_parser = subparsers.add_parser("load", help="load test a running 'nudge serve'")
+    load_parser.add_argument("url", help="URL to GET, e.g. http://127.0.0.1:8765/due?limit=50")
+    load_parser.add_argument("--concurrency", type=int, default=8, help="client connections")
+    load_parser.add_argument("--duration", type=float, default=5.0, help="seconds to run")
+    load_parser.add_argument("--no-etag", action="store_true", help="do not revalidate with If-None-Match")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, bench in BENCHMARKS.items():
+            notes = ", ".join(note for note, flag in (("writes", bench.writes), ("qt", bench.qt)) if flag)
+            print(name + (f"  ({notes})" if notes else ""))
+        return 0
+
+    if args.command == "generate":
+        path = generate_database(args.path, args.items, args.seed)
+        print(f"Wrote {args.items:,} items to {path}")
+        return 0
+
+    if args.command == "load":
+        result = run_load(args.url, args.concurrency, args.duration, revalidate=not args.no_etag)
+        result.report()
+        return 1 if result.errors else 0
+
+    results = run(args.sizes, args.filter, args.repeat, args.min_time, args.data_dir, args.seed)
+    if args.save:
+        save_results(results, _baseline_path(args.save))
+    if args.compare:
+        regressions = compare(results, load_results(_baseline_path(args.compare)), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Deterministic synthetic collections for benchmarks.
+
+``generate_records`` yields the same items for the same seed and reference
+time: Zipf-distributed tags from a fixed vocabulary, and review schedules
+whose interval, review count and dates follow a plausible study history
+(most items early in the ladder, a share of them overdue). The records go
+through the regular importer, so a generated database has exactly the shape
+of one built by the application, triggers and search index included.
+"""
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List
+
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.scheduler import INTERVALS
+
+DEFAULT_SEED = 20240101
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+_SYLLABLES = [
+    "ka", "lo", "mi", "ne", "su", "ta", "ri", "vo", "pe", "an", "or", "el",
+    "dy", "qu", "zen", "mar", "tol", "bis", "cor", "ph", "gra", "lum", "ex", "io",
+]
+_TOPICS = [
+    "python", "sql", "rust", "history", "biology", "chemistry", "french", "kanji",
+    "algebra", "music", "law", "anatomy", "physics", "art", "economics", "go",
+]
+
+# Share of items at each interval index; new collections are bottom-heavy
+_INTERVAL_WEIGHTS = [30, 22, 16, 12, 9, 6, 5]
+# Number of tags per item
+_TAG_COUNT_WEIGHTS = [10, 45, 30, 12, 3]
+
+
+def _word(rng: random.Random, syllables: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(syllables))
+
+
+def tag_vocabulary(items: int, seed: int = DEFAULT_SEED) -> List[str]:
+    """Tag names for a collection of the given size (about 1 tag per 50 items, at least 16)."""
+    rng = random.Random(seed ^ 0x7A6)
+    count = max(len(_TOPICS), min(5_000, items // 50))
+    names = list(_TOPICS)
+    seen = set(names)
+    while len(names) < count:
+        name = f"{rng.choice(_TOPICS)}-{_word(rng, 2)}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate_records(items: int, seed: int = DEFAULT_SEED, now: datetime | None = None) -> Iterator[ImportRecord]:
+    """Yield a deterministic synthetic collection.
+
+    Args:
+        items: Number of items
+        seed: Random seed; the same seed and now give the same records
+        now: Reference time for schedule dates (defaults to the start of today)
+
+    Yields:
+        ImportRecord for each item
+    """
+    if now is None:
+        now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = random.Random(seed)
+    tags = tag_vocabulary(items, seed)
+    # Zipf-like popularity: the k-th tag is used about 1/k as often as the first
+    tag_weights = list(accumulate(1.0 / rank for rank in range(1, len(tags) + 1)))
+    interval_weights = list(accumulate(_INTERVAL_WEIGHTS))
+    tag_count_weights = list(accumulate(_TAG_COUNT_WEIGHTS))
+
+    for index in range(items):
+        interval_index = rng.choices(range(len(INTERVALS)), cum_weights=interval_weights)[0]
+        tag_count = rng.choices(range(len(_TAG_COUNT_WEIGHTS)), cum_weights=tag_count_weights)[0]
+        item_tags = sorted(set(rng.choices(tags, cum_weights=tag_weights, k=tag_count)))
+
+        # Some reviews are missed, so review_count can exceed the interval reached
+        review_count = interval_index + rng.choices((0, 0, 0, 1, 2), k=1)[0] if interval_index else 0
+        if review_count:
+            # Last review happened somewhere within (1.5x) the current interval, so some are overdue
+            last_review = now - timedelta(minutes=rng.randrange(int(INTERVALS[interval_index] * 1.5 * 24 * 60)))
+            next_review = last_review + timedelta(days=INTERVALS[interval_index])
+            date_added = last_review - timedelta(days=sum(INTERVALS[:interval_index]), minutes=rng.randrange(600))
+        else:
+            last_review = None
+            date_added = now - timedelta(minutes=rng.randrange(3 * 24 * 60))
+            next_review = date_added + timedelta(days=INTERVALS[0])
+
+        yield ImportRecord(
+            name=f"{_word(rng, rng.randint(2, 4)).capitalize()} {_word(rng, rng.randint(1, 3))} #{index}",
+            tags=item_tags,
+            date_added=date_added,
+            next_review_date=next_review,
+            last_review_date=last_review,
+            interval_index=interval_index,
+            review_count=review_count,
+        )
+
+
+def generate_database(path: str | Path, items: int, seed: int = DEFAULT_SEED, now: datetime | None = None) -> Path:
+    """Create a database at path holding a synthetic collection.
+
+    Args:
+        path: Database file to create; must not exist yet
+        items: Number of items
+        seed: Random seed
+        now: Reference time for schedule dates (defaults to the start of today)
+
+    Returns:
+        The database path
+
+    Raises:
+        FileExistsError: If path already exists
+    """
+    path = Path(path)
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+
+    db = Database(str(path))
+    session = db.get_session()
+    try:
+        import_records(session, generate_records(items, seed, now), chunk_size=10_000)
+        # Fresh statistics for the query planner, as a long-lived database would have
+        session.connection().exec_driver_sql("ANALYZE")
+        session.commit()
+    finally:
+        session.close()
+        db.close()
+    return path
@@ -0,0 +1,92 @@
+"""Load test client for ``nudge serve``.
+
+Each worker thread keeps one HTTP/1.1 connection open and sends GET
+requests for its share of the duration, revalidating with the ETag it last
+received, as a browser extension polling the due queue would.
+"""
+import http.client
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, TextIO
+from urllib.parse import urlsplit
+
+
+@dataclass
+class LoadResult:
+    """Requests completed during a load test."""
+
+    duration: float
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    @property
+    def requests_per_second(self) -> float:
+        return len(self.latencies) / self.duration if self.duration else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def report(self, file: TextIO | None = None):
+        file = file or sys.stdout
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        print(f"{len(self.latencies)} requests in {self.duration:.1f} s: {self.requests_per_second:,.0f} req/s", file=file)
+        print(
+            f"latency p50 {self.percentile(0.5) * 1000:.2f} ms, p99 {self.percentile(0.99) * 1000:.2f} ms; "
+            f"statuses {statuses}; errors {self.errors}",
+            file=file,
+        )
+
+
+def run_load(url: str, concurrency: int = 8, duration: float = 5.0, revalidate: bool = True) -> LoadResult:
+    """GET url from concurrency keep-alive connections for duration seconds.
+
+    Args:
+        url: Full URL, e.g. http://127.0.0.1:8765/due?limit=50
+        concurrency: Number of client threads (one connection each)
+        duration: Seconds to run
+        revalidate: Send If-None-Match with the last ETag received
+
+    Returns:
+        LoadResult with every request's latency and status
+    """
+    parts = urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    result = LoadResult(duration)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        latencies, statuses, errors, etag = [], Counter(), 0, None
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request("GET", target, headers={"If-None-Match": etag} if revalidate and etag else {})
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] += 1
+            etag = response.getheader("ETag") or etag
+        connection.close()
+        with lock:
+            result.latencies.extend(latencies)
+            result.statuses.update(statuses)
+            result.errors += errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return result
@@ -0,0 +1,196 @@
+"""Timing, result files and baseline comparison for the benchmark suites."""
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, TextIO
+
+from benchmarks.generator import DEFAULT_SEED, generate_database
+from benchmarks.suites import BENCHMARKS, BenchContext, Benchmark, ensure_qapp
+from nudge.core.database import Database
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+# A benchmark whose median is this many times the baseline's is reported as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+@dataclass
+class Timing:
+    """Per-call timings of one benchmark at one dataset size, in seconds."""
+
+    samples: int
+    min: float
+    median: float
+    mean: float
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> "Timing":
+        return cls(len(samples), min(samples), statistics.median(samples), statistics.fmean(samples))
+
+
+def dataset_path(data_dir: Path, items: int, seed: int = DEFAULT_SEED) -> Path:
+    """Generate the dataset for items and seed unless it is already cached, and return its path.
+
+    Schedule dates are relative to the day of generation, so the file name
+    carries the date and a new day gets a fresh dataset.
+    """
+    path = Path(data_dir) / f"nudge-{items}-{seed}-{date.today().isoformat()}.db"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_suffix(".partial")
+        partial_path.unlink(missing_ok=True)
+        generate_database(partial_path, items, seed)
+        partial_path.rename(path)
+    return path
+
+
+def time_benchmark(bench: Benchmark, ctx: BenchContext, repeat: int, min_time: float, max_samples: int = 1000) -> Timing:
+    """Time single calls of a benchmark.
+
+    Calls are timed until there are at least ``repeat`` samples and
+    ``min_time`` seconds have been measured (capped at ``max_samples``).
+    One untimed warm-up call comes first.
+    """
+    call = bench.setup(ctx)
+    session = ctx.session
+    call()
+    session.expunge_all()
+
+    samples: List[float] = []
+    measured = 0.0
+    while len(samples) < max_samples and (len(samples) < repeat or measured < min_time):
+        started = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - started
+        session.expunge_all()
+        samples.append(elapsed)
+        measured += elapsed
+    return Timing.from_samples(samples)
+
+
+def run(
+    sizes: Iterable[int],
+    pattern: str = "*",
+    repeat: int = 5,
+    min_time: float = 0.2,
+    data_dir: Path = DEFAULT_DATA_DIR,
+    seed: int = DEFAULT_SEED,
+    file: TextIO | None = None,
+) -> Dict[str, Dict[str, Timing]]:
+    """Run the benchmarks matching pattern against a dataset of each size.
+
+    Args:
+        sizes: Dataset sizes in items
+        pattern: fnmatch pattern over benchmark names
+        repeat: Minimum number of timed calls per benchmark
+        min_time: Minimum measured seconds per benchmark
+        data_dir: Where generated datasets are cached
+        seed: Dataset seed
+        file: Where progress is printed (stderr by default)
+
+    Returns:
+        Timing per benchmark name, then per size (as a string, for JSON)
+    """
+    file = file or sys.stderr
+    selected = [bench for name, bench in BENCHMARKS.items() if fnmatch(name, pattern)]
+    if any(bench.qt for bench in selected):
+        ensure_qapp()
+
+    results: Dict[str, Dict[str, Timing]] = {}
+    for items in sizes:
+        source = dataset_path(data_dir, items, seed)
+        for bench in selected:
+            with tempfile.TemporaryDirectory() as scratch:
+                path = source
+                if bench.writes:
+                    path = Path(scratch) / source.name
+                    shutil.copyfile(source, path)
+                db = Database(str(path))
+                session = db.get_session()
+                try:
+                    timing = time_benchmark(bench, BenchContext(path, items, session, seed), repeat, min_time)
+                finally:
+                    session.close()
+                    db.close()
+            results.setdefault(bench.name, {})[str(items)] = timing
+            print(f"{bench.name:<36} {items:>9,}  {_format_seconds(timing.median):>10}", file=file)
+    return results
+
+
+def save_results(results: Dict[str, Dict[str, Timing]], path: Path):
+    """Write results with a description of the machine they were measured on."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "date": date.today().isoformat(),
+        "results": {name: {size: asdict(timing) for size, timing in sizes.items()} for name, sizes in results.items()},
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Timing]]:
+    """Read results written by save_results."""
+    document = json.loads(Path(path).read_text())
+    return {
+        name: {size: Timing(**timing) for size, timing in sizes.items()}
+        for name, sizes in document["results"].items()
+    }
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def compare(
+    results: Dict[str, Dict[str, Timing]],
+    baseline: Dict[str, Dict[str, Timing]],
+    threshold: float = DEFAULT_THRESHOLD,
+    file: TextIO | None = None,
+) -> List[str]:
+    """Print medians next to the baseline's and return the regressed benchmarks.
+
+    Args:
+        results: Current results
+        baseline: Results to compare against
+        threshold: Ratio of current to baseline median counted as a regression
+        file: Where the table is printed (stdout by default)
+
+    Returns:
+        "name@size" for every benchmark slower than threshold times its baseline
+    """
+    file = file or sys.stdout
+    regressions = []
+    print(f"{'benchmark':<36} {'items':>9}  {'baseline':>10}  {'current':>10}  {'ratio':>6}", file=file)
+    for name, sizes in results.items():
+        for size, timing in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            if before is None:
+                print(f"{name:<36} {int(size):>9,}  {'-':>10}  {_format_seconds(timing.median):>10}", file=file)
+                continue
+            ratio = timing.median / before.median
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}@{size}")
+            print(
+                f"{name:<36} {int(size):>9,}  {_format_seconds(before.median):>10}  "
+                f"{_format_seconds(timing.median):>10}  {ratio:>5.2f}x{flag}",
+                file=file,
+            )
+    return regressions
@@ -0,0 +1,269 @@
+"""Benchmarks of the core hot paths.
+
+Each benchmark is a setup function registered with ``@benchmark``. It
+receives a BenchContext over a generated database and returns the callable
+to time; whatever it does before returning is not measured. Between timed
+calls the session's identity map is cleared, so every call loads its rows
+the way a fresh request would.
+
+Benchmarks marked ``writes=True`` get their own copy of the database and
+commit real changes to it; they pick different items on every call so
+repeated calls do not turn into no-ops.
+"""
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from benchmarks.generator import DEFAULT_SEED, generate_records, tag_vocabulary
+from nudge.core.events import ChangeBus
+from nudge.core.importer import import_records
+from nudge.core.items import create_item
+from nudge.core.models import Item, Tag, item_tags
+from nudge.core.scheduler import (
+    count_by_tag,
+    count_due,
+    due_histogram,
+    get_due_items,
+    get_upcoming_items,
+    iter_due_items,
+    make_algorithm,
+    mark_as_reviewed,
+    mark_many_reviewed,
+    reschedule_all,
+    set_algorithm,
+)
+from nudge.core.search import search_items
+from nudge.core.stats import get_dashboard
+from nudge.core.tags import TagRegistry
+
+
+@dataclass
+class BenchContext:
+    """What a benchmark setup gets to work with."""
+
+    path: Path
+    items: int
+    session: Session
+    seed: int = DEFAULT_SEED
+
+    def item_ids(self) -> List[int]:
+        """All item ids in a random order that is the same on every run."""
+        ids = list(self.session.scalars(select(Item.id)))
+        random.Random(self.seed).shuffle(ids)
+        return ids
+
+    def tag_names(self, limit: int = 200) -> List[str]:
+        """Names of existing tags, most used first."""
+        statement = (
+            select(Tag.name)
+            .join(item_tags, item_tags.c.tag_id == Tag.id)
+            .group_by(Tag.id)
+            .order_by(func.count().desc(), Tag.id)
+            .limit(limit)
+        )
+        return list(self.session.scalars(statement))
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Callable[[BenchContext], Callable[[], Any]]
+    writes: bool = False
+    # Needs a QApplication (created offscreen)
+    qt: bool = False
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, writes: bool = False, qt: bool = False):
+    """Register a benchmark setup function under name."""
+
+    def register(setup: Callable[[BenchContext], Callable[[], Any]]):
+        BENCHMARKS[name] = Benchmark(name, setup, writes, qt)
+        return setup
+
+    return register
+
+
+def ensure_qapp():
+    """Return the QApplication, creating an offscreen one if needed."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def _cycle(values: List[Any]) -> Callable[[], Any]:
+    """A function returning the next value of values on every call, wrapping around."""
+    position = -1
+
+    def next_value():
+        nonlocal position
+        position = (position + 1) % len(values)
+        return values[position]
+
+    return next_value
+
+
+# Scheduler queries
+
+
+@benchmark("scheduler.get_due_items")
+def bench_get_due_items(ctx: BenchContext):
+    return lambda: get_due_items(ctx.session)
+
+
+@benchmark("scheduler.get_upcoming_items")
+def bench_get_upcoming_items(ctx: BenchContext):
+    return lambda: get_upcoming_items(ctx.session, days_ahead=7)
+
+
+@benchmark("scheduler.iter_due_items")
+def bench_iter_due_items(ctx: BenchContext):
+    return lambda: sum(1 for _ in iter_due_items(ctx.session))
+
+
+@benchmark("scheduler.iter_due_items_page_100")
+def bench_iter_due_page(ctx: BenchContext):
+    # The page after the first one, as when paging through the queue
+    first = list(iter_due_items(ctx.session, limit=100))
+    after = first[-1].cursor if first else None
+    return lambda: list(iter_due_items(ctx.session, limit=100, after=after))
+
+
+@benchmark("scheduler.count_due")
+def bench_count_due(ctx: BenchContext):
+    return lambda: count_due(ctx.session)
+
+
+@benchmark("scheduler.due_histogram_7")
+def bench_due_histogram(ctx: BenchContext):
+    return lambda: due_histogram(ctx.session, days_ahead=7)
+
+
+@benchmark("scheduler.count_by_tag")
+def bench_count_by_tag(ctx: BenchContext):
+    return lambda: count_by_tag(ctx.session)
+
+
+@benchmark("stats.get_dashboard")
+def bench_get_dashboard(ctx: BenchContext):
+    return lambda: get_dashboard(ctx.session)
+
+
+# Scheduler writes
+
+
+@benchmark("scheduler.mark_as_reviewed", writes=True)
+def bench_mark_as_reviewed(ctx: BenchContext):
+    next_id = _cycle(ctx.item_ids())
+    return lambda: mark_as_reviewed(ctx.session, next_id())
+
+
+@benchmark("scheduler.mark_many_reviewed_500", writes=True)
+def bench_mark_many_reviewed(ctx: BenchContext):
+    ids = ctx.item_ids()
+    next_batch = _cycle([ids[start:start + 500] for start in range(0, len(ids), 500)])
+    return lambda: mark_many_reviewed(ctx.session, next_batch())
+
+
+@benchmark("scheduler.set_algorithm_fsrs", writes=True)
+def bench_set_algorithm(ctx: BenchContext):
+    # Alternate the retention so every call reschedules the whole collection
+    next_algorithm = _cycle([make_algorithm("fsrs", {"desired_retention": retention}) for retention in (0.9, 0.85)])
+    return lambda: set_algorithm(ctx.session, next_algorithm())
+
+
+@benchmark("scheduler.reschedule_all_dry_run", writes=True)
+def bench_reschedule_all(ctx: BenchContext):
+    return lambda: reschedule_all(ctx.session, [2, 5, 10, 20, 40, 80, 160], "nearest", dry_run=True)
+
+
+# Items, tags and import
+
+
+@benchmark("items.create_item", writes=True)
+def bench_create_item(ctx: BenchContext):
+    vocabulary = tag_vocabulary(ctx.items, ctx.seed)
+    rng = random.Random(ctx.seed)
+    return lambda: create_item(ctx.session, f"benchmark item {rng.random()}", rng.sample(vocabulary, 2))
+
+
+@benchmark("tags.resolve_cold")
+def bench_resolve_cold(ctx: BenchContext):
+    names = ctx.tag_names()
+    # A private bus, so the registries created here are not notified of later benchmarks' writes
+    bus = ChangeBus()
+    return lambda: TagRegistry(bus).resolve(ctx.session, names)
+
+
+@benchmark("tags.resolve_warm")
+def bench_resolve_warm(ctx: BenchContext):
+    names = ctx.tag_names()
+    registry = TagRegistry(ChangeBus())
+    registry.resolve(ctx.session, names)
+    return lambda: registry.resolve(ctx.session, names)
+
+
+@benchmark("importer.import_records_1k", writes=True)
+def bench_import_records(ctx: BenchContext):
+    seeds = iter(range(ctx.seed + 1, ctx.seed + 1_000_000))
+    return lambda: import_records(ctx.session, generate_records(1_000, seed=next(seeds)))
+
+
+# Search
+
+
+@benchmark("search.search_items")
+def bench_search_items(ctx: BenchContext):
+    return lambda: search_items(ctx.session, "python", limit=50)
+
+
+# Item table model (offscreen Qt, queries run inline without a worker)
+
+
+@benchmark("model.load_items", qt=True)
+def bench_model_load(ctx: BenchContext):
+    from nudge.ui.models.item_table_model import ItemTableModel
+
+    model = ItemTableModel(ctx.session)
+    return model.load_items
+
+
+@benchmark("model.scroll_10_pages", qt=True)
+def bench_model_scroll(ctx: BenchContext):
+    from nudge.ui.models.item_table_model import ItemTableModel
+
+    def scroll():
+        model = ItemTableModel(ctx.session)
+        for _ in range(10):
+            model.fetchMore()
+        # Revisit the first page after it has been evicted
+        model.data(model.index(0, 0))
+
+    return scroll
+
+
+@benchmark("model.sort_by_tags", qt=True)
+def bench_model_sort(ctx: BenchContext):
+    from nudge.ui.models.item_table_model import ItemTableModel
+
+    model = ItemTableModel(ctx.session)
+    ascending = _cycle([False, True])
+    return lambda: model.sort_items(1, ascending())
+
+
+@benchmark("model.on_search", qt=True)
+def bench_model_search(ctx: BenchContext):
+    from nudge.ui.models.item_table_model import ItemTableModel
+
+    model = ItemTableModel(ctx.session)
+    # What typing a query produces: one search per keystroke
+    text = _cycle(["p", "py", "pyt", "pyth", "pytho", "python", ""])
+    return lambda: model.set_search_text(text())
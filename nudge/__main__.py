@@ -1,13 +1,51 @@
 """Main entry point for the Nudge application."""
 import sys
 
-from nudge.app import NudgeApp
+PROFILE_STARTUP_FLAG = "--profile-startup"
+# Options of the command-line interface itself rather than of a subcommand
+CLI_FLAGS = ("-h", "--help")
 
 
-def main():
-    """Main entry point."""
-    app = NudgeApp()
-    sys.exit(app.run())
+def main() -> None:
+    """Main entry point.
+
+    A subcommand (e.g. ``nudge import deck.csv``) or ``--help`` runs the
+    command-line interface without loading Qt; otherwise the GUI is started. With
+    ``--profile-startup`` the GUI reports how long each startup phase took,
+    imports included, once the item table has been populated.
+
+    Setting ``NUDGE_PERF=1`` (or ``NUDGE_PERF_TRACE=path.jsonl``) records SQL
+    statements and hot-path timings and prints a summary on exit.
+    """
+    if len(sys.argv) > 1 and (not sys.argv[1].startswith("-") or sys.argv[1] in CLI_FLAGS):
+        from nudge.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    profiler = None
+    if PROFILE_STARTUP_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_STARTUP_FLAG)
+        from nudge.startup import StartupProfiler
+
+        profiler = StartupProfiler()
+        # Imported up front only to time the heavy dependencies separately
+        import PyQt6.QtWidgets  # noqa: F401
+        profiler.mark("import PyQt6")
+        import sqlalchemy.orm  # noqa: F401
+        profiler.mark("import SQLAlchemy")
+
+    from nudge.app import NudgeApp
+    from nudge.core import perf
+
+    if profiler is not None:
+        profiler.mark("import nudge")
+
+    recorder = perf.enable_from_environment()
+    app = NudgeApp(profiler)
+    status = app.run()
+    if recorder is not None:
+        recorder.report()
+        perf.disable()
+    sys.exit(status)
 
 
 if __name__ == "__main__":
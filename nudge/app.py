@@ -1,37 +1,95 @@
 """Application initialization and setup."""
 import sys
+from typing import Callable
 
+from PyQt6.QtCore import QEvent, QObject
 from PyQt6.QtWidgets import QApplication
 
 from nudge.core.database import get_database
+from nudge.services.db_worker import get_worker
+from nudge.services.notifier import ReviewNotifier
 from nudge.services.tray_service import TrayService
+from nudge.startup import StartupProfiler
 from nudge.ui.windows.main_window import MainWindow
 
 
+class _FirstPaintFilter(QObject):
+    """Calls back once, the first time the filtered widget paints."""
+
+    def __init__(self, on_paint: Callable[[], None], parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.on_paint = on_paint
+
+    def eventFilter(self, obj: QObject | None, event: QEvent | None) -> bool:
+        if obj is not None and event is not None and event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self.on_paint()
+        return False
+
+
 class NudgeApp:
-    """Main application class."""
+    """Main application class.
+
+    Startup does only what the first paint needs: the window is shown with
+    an empty table, which is filled by a background query once the event
+    loop runs, and dialogs are imported when first opened.
+    """
     
-    def __init__(self):
+    def __init__(self, profiler: StartupProfiler | None = None) -> None:
+        self.profiler = profiler
+        
         self.app = QApplication(sys.argv)
         self.app.setApplicationName("Nudge")
         self.app.setOrganizationName("Nudge")
         
         # Keep app running when windows are closed
         self.app.setQuitOnLastWindowClosed(False)
+        self._mark("QApplication")
         
-        # Initialize database
+        # Initialize database; one GUI-thread session is shared by the window and tray
         self.db = get_database()
         self.session = self.db.get_session()
+        self._mark("database")
         
-        # Create main window
-        self.main_window = MainWindow()
+        # Background database worker; let running queries finish on quit
+        self.worker = get_worker()
+        self.app.aboutToQuit.connect(self.worker.shutdown)
+        
+        # Create main window (its table starts loading on the worker)
+        self.main_window = MainWindow(self.session)
+        self._mark("main window")
+        
+        # Due-review notifications (timer-driven, no polling)
+        self.notifier = ReviewNotifier(self.worker)
         
         # Create system tray
-        self.tray = TrayService(self.app, self.main_window, self.session)
+        self.tray = TrayService(self.app, self.main_window, self.session, self.notifier)
+        self.notifier.start()
+        self._mark("tray and notifier")
+        
+        if self.profiler is not None:
+            # Reported once both have happened, in whichever order they come
+            self._pending_phases = {"first paint", "first table page"}
+            self._paint_filter = _FirstPaintFilter(lambda: self._startup_event("first paint"), self.main_window)
+            self.main_window.installEventFilter(self._paint_filter)
+            self.main_window.model.loaded.connect(lambda: self._startup_event("first table page"))
         
         # Show main window on first launch
         self.main_window.show()
     
+    def _mark(self, phase: str) -> None:
+        if self.profiler is not None:
+            self.profiler.mark(phase)
+    
+    def _startup_event(self, phase: str) -> None:
+        """Mark a post-show startup phase and report once the last one is done."""
+        if self.profiler is None or phase not in self._pending_phases:
+            return
+        self._pending_phases.discard(phase)
+        self.profiler.mark(phase)
+        if not self._pending_phases:
+            self.profiler.report()
+    
     def run(self):
         """Run the application."""
         return self.app.exec()
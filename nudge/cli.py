@@ -0,0 +1,375 @@
+"""Command-line interface for non-GUI tasks.
+
+Nothing here imports PyQt6, and each subcommand imports only the core
+modules it needs, so scripts and cron jobs do not pay for the GUI.
+"""
+import argparse
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from nudge.core.scheduler import ScheduledItem
+
+# Mirror nudge.core.importer/exporter so building the parser does not import SQLAlchemy
+IMPORT_FORMATS = ("csv", "jsonl", "tsv")
+# Mirror nudge.core.scheduler.Grade and nudge.core.algorithms.ALGORITHMS, which load NumPy
+GRADES = ("again", "hard", "good", "easy")
+ALGORITHM_NAMES = ("fixed", "sm2", "fsrs")
+# Mirror nudge.core.scheduler.RESCHEDULE_POLICIES
+RESCHEDULE_POLICIES = ("nearest", "index", "keep-dates")
+EXPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 5000
+
+
+@contextmanager
+def _session(args: argparse.Namespace) -> Iterator["Session"]:
+    """Open the database named by --db and yield a session, closing both afterwards."""
+    from nudge.core.database import Database
+
+    db = Database(args.db)
+    session = db.get_session()
+    try:
+        yield session
+    finally:
+        session.close()
+        db.close()
+
+
+def _print_items(session: "Session", items: Iterable["ScheduledItem"]) -> None:
+    """Print one line per ScheduledItem (id, next review date, name and tags) as they stream in."""
+    from nudge.core.tags import get_tag_registry
+
+    tag_names = {tag.id: tag.name for tag in get_tag_registry().get_tags(session)}
+    for item in items:
+        tags = ", ".join(sorted(tag_names.get(tag_id, "?") for tag_id in item.tag_ids))
+        due = item.next_review_date.strftime("%Y-%m-%d %H:%M")
+        print(f"{item.id:>6}  {due}  {item.name}" + (f"  [{tags}]" if tags else ""))
+
+
+def cmd_due(args: argparse.Namespace) -> int:
+    """List items due for review."""
+    from nudge.core.scheduler import count_due, iter_due_items
+
+    with _session(args) as session:
+        if args.count:
+            print(count_due(session, datetime.now() + timedelta(days=args.days)))
+        else:
+            _print_items(session, iter_due_items(session, days_ahead=args.days, limit=args.limit))
+    return 0
+
+
+def cmd_upcoming(args: argparse.Namespace) -> int:
+    """List items due within the next few days."""
+    from nudge.core.scheduler import iter_upcoming_items
+
+    with _session(args) as session:
+        _print_items(session, iter_upcoming_items(session, days_ahead=args.days, limit=args.limit))
+    return 0
+
+
+def cmd_add(args: argparse.Namespace) -> int:
+    """Add an item."""
+    from nudge.core.items import create_item
+
+    with _session(args) as session:
+        item = create_item(session, args.name, args.tag)
+        due = item.review_schedule.next_review_date.strftime("%Y-%m-%d")
+        print(f"Added item {item.id} '{item.name}' (next review {due})")
+    return 0
+
+
+def cmd_review(args: argparse.Namespace) -> int:
+    """Mark items as reviewed."""
+    from nudge.core.scheduler import Grade, mark_many_reviewed
+
+    with _session(args) as session:
+        count = mark_many_reviewed(session, args.ids, grade=Grade[args.grade.upper()])
+    print(f"Marked {count} item{'s' if count != 1 else ''} as reviewed")
+    return 0
+
+
+def _parse_param(text: str) -> Tuple[str, Any]:
+    """Parse a --param NAME=VALUE argument; the value is read as JSON, or kept as a string."""
+    import json
+
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got '{text}'")
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+
+def cmd_algorithm(args: argparse.Namespace) -> int:
+    """Show the scheduling algorithm, or switch to another one and reschedule every item."""
+    from nudge.core.scheduler import get_algorithm, make_algorithm, set_algorithm
+
+    with _session(args) as session:
+        if args.name is None:
+            algorithm = get_algorithm(session)
+            print(algorithm.name)
+            for name, value in algorithm.params.items():
+                print(f"  {name} = {value}")
+            return 0
+        algorithm = make_algorithm(args.name, dict(args.param))
+        count = set_algorithm(session, algorithm)
+    print(f"Switched to {algorithm.name}; rescheduled {count} item{'s' if count != 1 else ''}")
+    return 0
+
+
+def _parse_intervals(text: str) -> List[int]:
+    """Parse a comma-separated list of interval days."""
+    try:
+        return [int(days) for days in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated days, got '{text}'") from None
+
+
+def cmd_reschedule(args: argparse.Namespace) -> int:
+    """Move every item onto an interval ladder, or preview the move with --dry-run."""
+    from nudge.core.scheduler import INTERVALS, reschedule_all
+
+    intervals = args.intervals or INTERVALS
+    with _session(args) as session:
+        report = reschedule_all(session, intervals, args.policy, dry_run=args.dry_run, days_ahead=args.days)
+
+    verb = "Would reschedule" if report.dry_run else "Rescheduled"
+    print(f"{verb} {report.changed} item{'s' if report.changed != 1 else ''} onto {', '.join(map(str, intervals))} days")
+    for status in sorted(report.status_before.keys() | report.status_after.keys()):
+        print(f"  {status:<9} {report.status_before.get(status, 0):>7} -> {report.status_after.get(status, 0)}")
+    print("Due per day (overdue counted today):")
+    for (day, before), (_, after) in zip(report.due_before, report.due_after):
+        print(f"  {day.isoformat()}  {before:>7} -> {after:<7} ({after - before:+d})")
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Serve the HTTP/JSON API until interrupted."""
+    from nudge.core.database import Database
+    from nudge.server import serve
+
+    db = Database(args.db)
+    try:
+        serve(db, args.host, args.port, verbose=args.verbose)
+    finally:
+        db.close()
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Summarise the collection, or report query and timing statistics with --perf."""
+    if args.perf:
+        # A trace written by another process (e.g. the GUI with NUDGE_PERF_TRACE)
+        from nudge.core.perf import PerfRecorder
+
+        print(f"Performance (from {args.perf}):")
+        PerfRecorder.from_trace(args.perf).report(sys.stdout)
+        return 0
+
+    from nudge.core.history import retention_curve, review_streak
+    from nudge.core.scheduler import due_histogram, get_next_review_date
+    from nudge.core.stats import get_dashboard, rebuild_stats
+
+    with _session(args) as session:
+        if args.rebuild:
+            rebuild_stats(session.connection())
+            session.commit()
+            print("Statistics rebuilt.")
+        dashboard = get_dashboard(session)
+        next_review = get_next_review_date(session)
+        week = due_histogram(session, days_ahead=6)
+        streak = review_streak(session)
+        recent = retention_curve(session, since=datetime.now() - timedelta(days=30))
+
+    reviewed = sum(count for _, count in dashboard.reviews_per_day[-7:])
+    print(f"Items:     {dashboard.items}")
+    print(f"Tags:      {len(dashboard.by_tag)}")
+    print(f"Due now:   {dashboard.overdue}")
+    print(f"Learning:  {dashboard.by_status.get('learning', 0)}")
+    print(f"Mastered:  {dashboard.by_status.get('mastered', 0)}")
+    if dashboard.by_interval:
+        print("By step:   " + ", ".join(f"{index}: {count}" for index, count in dashboard.by_interval))
+    if next_review is not None:
+        print(f"Next due:  {next_review.strftime('%Y-%m-%d %H:%M')}")
+    print(f"Streak:    {streak.current} days (longest {streak.longest})")
+    print(f"Reviewed:  {reviewed} in the last 7 days")
+    repeats = sum(point.reviews for point in recent)
+    if repeats:
+        print(f"Recall:    {sum(point.recalled for point in recent) / repeats:.0%} of {repeats} repeat reviews in 30 days")
+    print("Due this week (overdue counted today):")
+    for day, count in week:
+        print(f"  {day.strftime('%a %Y-%m-%d')}  {count}")
+
+    if args.perf is not None:
+        from nudge.core.perf import get_recorder
+
+        recorder = get_recorder()
+        if recorder is not None:
+            print()
+            print("Performance (this command):")
+            recorder.report(sys.stdout)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Bulk import items from a CSV, JSONL or Anki TSV file."""
+    from nudge.core.importer import ImportResult, import_file
+
+    def report(result: ImportResult) -> None:
+        print(
+            f"  chunk {result.chunks}: {result.items} items, {result.rows_per_second:,.0f} rows/s",
+            file=sys.stderr,
+        )
+
+    with _session(args) as session:
+        result = import_file(
+            session,
+            args.path,
+            file_format=args.format,
+            chunk_size=args.chunk_size,
+            on_chunk=None if args.quiet else report,
+        )
+
+    print(
+        f"Imported {result.items} items ({result.tags_created} new tags, {result.skipped} skipped) "
+        f"in {result.elapsed:.2f}s - {result.rows_per_second:,.0f} rows/s"
+    )
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Export items and review progress to a CSV or JSONL file."""
+    from nudge.core.exporter import export_file
+
+    with _session(args) as session:
+        count = export_file(session, args.path, file_format=args.format)
+    print(f"Exported {count} items to {args.path}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the nudge command."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", metavar="PATH", help="database file (defaults to the user data directory)")
+    common.add_argument(
+        "--trace", metavar="PATH", help="append a JSON Lines trace of SQL statements and timings to PATH"
+    )
+
+    parser = argparse.ArgumentParser(prog="nudge", description="Nudge spaced repetition study reminder.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    due_parser = subparsers.add_parser("due", parents=[common], help="list items due for review")
+    due_parser.add_argument("--days", type=int, default=0, help="also include items due within this many days")
+    due_parser.add_argument("-c", "--count", action="store_true", help="print only the number of due items")
+    due_parser.add_argument("-n", "--limit", type=int, help="list at most this many items")
+    due_parser.set_defaults(func=cmd_due)
+
+    upcoming_parser = subparsers.add_parser("upcoming", parents=[common], help="list items due in the next days")
+    upcoming_parser.add_argument("--days", type=int, default=7, help="number of days to look ahead")
+    upcoming_parser.add_argument("-n", "--limit", type=int, help="list at most this many items")
+    upcoming_parser.set_defaults(func=cmd_upcoming)
+
+    add_parser = subparsers.add_parser("add", parents=[common], help="add an item")
+    add_parser.add_argument("name", help="item name")
+    add_parser.add_argument("-t", "--tag", action="append", default=[], help="tag to attach (repeatable)")
+    add_parser.set_defaults(func=cmd_add)
+
+    review_parser = subparsers.add_parser("review", parents=[common], help="mark items as reviewed")
+    review_parser.add_argument("ids", type=int, nargs="+", metavar="ID", help="item ids")
+    review_parser.add_argument("-g", "--grade", choices=GRADES, default="good", help="how well the items were recalled")
+    review_parser.set_defaults(func=cmd_review)
+
+    algorithm_parser = subparsers.add_parser(
+        "algorithm", parents=[common], help="show or change the scheduling algorithm"
+    )
+    algorithm_parser.add_argument(
+        "name", nargs="?", choices=ALGORITHM_NAMES, help="switch to this algorithm and reschedule every item"
+    )
+    algorithm_parser.add_argument(
+        "-p", "--param", type=_parse_param, action="append", default=[], metavar="NAME=VALUE",
+        help="algorithm parameter, e.g. desired_retention=0.85 (repeatable)",
+    )
+    algorithm_parser.set_defaults(func=cmd_algorithm)
+
+    reschedule_parser = subparsers.add_parser(
+        "reschedule", parents=[common], help="move every item onto a new interval ladder"
+    )
+    reschedule_parser.add_argument(
+        "--intervals", type=_parse_intervals, metavar="DAYS,...", help="the ladder (defaults to the built-in one)"
+    )
+    reschedule_parser.add_argument(
+        "--policy", choices=RESCHEDULE_POLICIES, default="nearest", help="how items are placed on the new ladder"
+    )
+    reschedule_parser.add_argument("-n", "--dry-run", action="store_true", help="only report how the due load shifts")
+    reschedule_parser.add_argument("--days", type=int, default=14, help="days of due load to report")
+    reschedule_parser.set_defaults(func=cmd_reschedule)
+
+    stats_parser = subparsers.add_parser("stats", parents=[common], help="summarise the collection")
+    stats_parser.add_argument(
+        "--perf",
+        nargs="?",
+        const="",
+        metavar="TRACE",
+        help="print query and timing statistics: of this command, or aggregated from a trace file",
+    )
+    stats_parser.add_argument(
+        "--rebuild", action="store_true", help="recompute the statistics summary tables from scratch first"
+    )
+    stats_parser.set_defaults(func=cmd_stats)
+
+    import_parser = subparsers.add_parser("import", parents=[common], help="bulk import items from a file")
+    import_parser.add_argument("path", help="file to import")
+    import_parser.add_argument(
+        "--format", choices=IMPORT_FORMATS, help="input format (detected from the extension by default)"
+    )
+    import_parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="items written per transaction"
+    )
+    import_parser.add_argument("-q", "--quiet", action="store_true", help="do not report per-chunk progress")
+    import_parser.set_defaults(func=cmd_import)
+
+    export_parser = subparsers.add_parser("export", parents=[common], help="export items and review progress")
+    export_parser.add_argument("path", help="file to write")
+    export_parser.add_argument(
+        "--format", choices=EXPORT_FORMATS, help="output format (detected from the extension by default)"
+    )
+    export_parser.set_defaults(func=cmd_export)
+
+    serve_parser = subparsers.add_parser("serve", parents=[common], help="serve a local HTTP/JSON API")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port")
+    serve_parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the command-line interface.
+
+    Args:
+        argv: Arguments excluding the program name (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    recorder = None
+    if args.trace or getattr(args, "perf", None) == "":
+        from nudge.core import perf
+
+        recorder = perf.enable(args.trace)
+    command: Callable[[argparse.Namespace], int] = args.func
+    try:
+        return command(args)
+    except (OSError, ValueError) as e:
+        print(f"nudge: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if recorder is not None:
+            perf.disable()
@@ -1 +1,4 @@
 """Core module for database and business logic."""
+from nudge.core.search import search_items
+
+__all__ = ["search_items"]
@@ -0,0 +1,226 @@
+"""asyncio interface to the database and scheduler.
+
+AsyncDatabase opens the same SQLite database as Database through
+SQLAlchemy's async engine and aiosqlite, with the same profile pragmas,
+migrations and models. The async helpers run the synchronous query
+functions of nudge.core through ``AsyncSession.run_sync``, so both paths
+share one definition of every query; statements run on aiosqlite's
+connection threads and the event loop stays free while they do.
+
+Concurrency is bounded by the connection pool (the profile's pool_size plus
+max_overflow): further requests wait for a connection without blocking
+the loop. SQLite still runs one write at a time.
+
+ORM objects cannot lazy-load attributes outside ``run_sync``, so the
+helpers return plain rows (ScheduledItem) or objects with the relationships
+callers need already loaded.
+
+Needs the optional dependencies aiosqlite and greenlet
+(``pip install "nudge[async]"``).
+"""
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, List, Tuple, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from nudge.core import scheduler
+from nudge.core.database import (
+    DEFAULT_PROFILE,
+    SQLiteProfile,
+    configure_engine,
+    default_database_path,
+    is_memory_database,
+    migrate,
+)
+from nudge.core.models import Item, ReviewSchedule
+from nudge.core.scheduler import Grade, ScheduleCursor, ScheduledItem
+from nudge.core.search import search_items as _search_items
+
+T = TypeVar("T")
+
+
+def create_async_sqlite_engine(
+    db_path: str, profile: SQLiteProfile = DEFAULT_PROFILE, echo: bool = False
+) -> AsyncEngine:
+    """Create an aiosqlite engine configured like create_sqlite_engine.
+
+    Args:
+        db_path: Path to the database file, or ":memory:"
+        profile: Pragmas and pool sizing to apply
+        echo: Whether to log emitted SQL
+
+    Returns:
+        Configured async engine
+    """
+    connect_args = {"check_same_thread": False, "timeout": profile.busy_timeout_ms / 1000}
+    if is_memory_database(db_path):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{db_path}", echo=echo, connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{db_path}",
+            echo=echo,
+            connect_args=connect_args,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+        )
+    configure_engine(engine.sync_engine, profile)
+    return engine
+
+
+class AsyncDatabase:
+    """asyncio counterpart of Database.
+
+    Use as ``async with AsyncDatabase(path) as db:``, or call ``open()``
+    and ``close()`` yourself; ``open()`` creates or upgrades the schema.
+    """
+
+    def __init__(self, db_path: str | None = None, profile: SQLiteProfile | None = None):
+        """Create the engine; no connection is opened until open() or the first query.
+
+        Args:
+            db_path: Optional custom database path. If None, uses default location.
+            profile: Optional SQLite connection profile. If None, uses DEFAULT_PROFILE.
+        """
+        self.db_path = db_path if db_path is not None else default_database_path()
+        self.profile = profile or DEFAULT_PROFILE
+        self.engine = create_async_sqlite_engine(self.db_path, self.profile)
+        # Attributes expired by a commit could only be reloaded inside run_sync, so keep them
+        self.SessionLocal = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+
+    async def open(self) -> "AsyncDatabase":
+        """Create or upgrade the schema.
+
+        Returns:
+            This database
+        """
+        async with self.engine.begin() as conn:
+            await conn.run_sync(migrate)
+        return self
+
+    def get_session(self) -> AsyncSession:
+        """Get a new async session; use it as ``async with db.get_session() as session:``."""
+        return self.SessionLocal()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call a synchronous function taking a Session as its first argument, in a session of its own.
+
+        Args:
+            fn: For example nudge.core.items.create_item
+            *args: Further positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            What fn returned
+        """
+        async with self.get_session() as session:
+            return await session.run_sync(fn, *args, **kwargs)
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        await self.engine.dispose()
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+def _listed(session: Session, fn: Callable[..., Iterable[T]], *args: Any) -> List[T]:
+    return list(fn(session, *args))
+
+
+def _search_loaded(session: Session, query: str, limit: int, offset: int) -> List[Item]:
+    items = _search_items(session, query, limit, offset)
+    if items:
+        # Load what callers read from a result while still inside run_sync
+        session.scalars(
+            select(Item)
+            .where(Item.id.in_([item.id for item in items]))
+            .options(selectinload(Item.tags), selectinload(Item.review_schedule))
+            .execution_options(populate_existing=True)
+        ).all()
+    return items
+
+
+async def get_due_items(
+    session: AsyncSession, days_ahead: int = 0, limit: int | None = None, after: ScheduleCursor | None = None
+) -> List[ScheduledItem]:
+    """Get the items due for review, most overdue first (see scheduler.iter_due_items).
+
+    Returns ScheduledItem rows rather than Items: they carry the schedule
+    and tag ids and need no further loading.
+    """
+    return await session.run_sync(_listed, scheduler.iter_due_items, days_ahead, limit, after)
+
+
+async def get_upcoming_items(
+    session: AsyncSession, days_ahead: int = 7, limit: int | None = None, after: ScheduleCursor | None = None
+) -> List[ScheduledItem]:
+    """Get the items due within the next N days, soonest first (see scheduler.iter_upcoming_items)."""
+    return await session.run_sync(_listed, scheduler.iter_upcoming_items, days_ahead, limit, after)
+
+
+async def mark_as_reviewed(
+    session: AsyncSession, item_id: int, reviewed_at: datetime | None = None, grade: Grade = Grade.GOOD
+) -> ReviewSchedule:
+    """Mark an item as reviewed (see scheduler.mark_as_reviewed).
+
+    Raises:
+        ValueError: If item or schedule not found
+    """
+    return await session.run_sync(scheduler.mark_as_reviewed, item_id, reviewed_at, grade)
+
+
+async def mark_many_reviewed(
+    session: AsyncSession, item_ids: Iterable[int], reviewed_at: datetime | None = None, grade: Grade = Grade.GOOD
+) -> int:
+    """Mark many items as reviewed in one transaction (see scheduler.mark_many_reviewed).
+
+    Raises:
+        ValueError: If any item has no review schedule
+    """
+    return await session.run_sync(scheduler.mark_many_reviewed, list(item_ids), reviewed_at, grade)
+
+
+async def create_review_schedule(session: AsyncSession, item: Item) -> ReviewSchedule:
+    """Create a new review schedule for an item in this session (see scheduler.create_review_schedule)."""
+    return await session.run_sync(scheduler.create_review_schedule, item)
+
+
+async def search_items(session: AsyncSession, query: str, limit: int = 50, offset: int = 0) -> List[Item]:
+    """Search items by name and tag names (see search.search_items), with tags and schedules loaded."""
+    return await session.run_sync(_search_loaded, query, limit, offset)
+
+
+async def count_due(session: AsyncSession, now: datetime | None = None) -> int:
+    """Count items due for review (see scheduler.count_due)."""
+    return await session.run_sync(scheduler.count_due, now)
+
+
+async def get_next_review_date(session: AsyncSession, after: datetime | None = None) -> datetime | None:
+    """Get the earliest next review date after a point in time (see scheduler.get_next_review_date)."""
+    return await session.run_sync(scheduler.get_next_review_date, after)
+
+
+async def due_histogram(
+    session: AsyncSession, days_ahead: int = 7, today: date | None = None
+) -> List[Tuple[date, int]]:
+    """Count the items due on each day from today (see scheduler.due_histogram)."""
+    return await session.run_sync(scheduler.due_histogram, days_ahead, today)
+
+
+async def count_by_status(session: AsyncSession) -> List[Tuple[str, int]]:
+    """Count schedules per status (see scheduler.count_by_status)."""
+    return await session.run_sync(scheduler.count_by_status)
+
+
+async def count_by_tag(session: AsyncSession, now: datetime | None = None) -> List[Tuple[str, int, int]]:
+    """Count the items with each tag and how many of them are due (see scheduler.count_by_tag)."""
+    return await session.run_sync(scheduler.count_by_tag, now)
@@ -0,0 +1,365 @@
+"""Scheduling algorithm implementations, vectorized over batches of cards.
+
+Every algorithm works on a CardBatch: one NumPy array per review schedule
+column, so reviewing or rescheduling a batch is a handful of array
+operations however many cards it holds. load_cards and store_cards move
+batches in and out of the database with plain DB-API statements, without
+creating ORM objects, which is what makes switching algorithms on a large
+collection take seconds.
+
+The interval ladder index and status are kept up to date for every
+algorithm: an interval that is not a ladder step maps to the largest step
+not above it, and a card is mastered once its interval reaches the last
+step.
+"""
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence, Type
+
+import numpy as np
+from numpy.typing import ArrayLike
+from sqlalchemy.orm import Session
+
+from nudge.core.scheduler import INTERVALS, Grade, SchedulingAlgorithm
+
+_DAY = np.timedelta64(1, "D")
+_COLUMNS = (
+    "id, item_id, current_interval_index, review_count, last_review_date, next_review_date, "
+    "ease, stability, difficulty"
+)
+_UPDATE = (
+    "UPDATE review_schedules SET current_interval_index = ?, review_count = ?, last_review_date = ?, "
+    "next_review_date = ?, status = ?, ease = ?, stability = ?, difficulty = ? WHERE id = ?"
+)
+
+
+@dataclass(frozen=True)
+class CardBatch:
+    """Review schedules as parallel arrays, one element per card."""
+
+    ids: np.ndarray
+    item_ids: np.ndarray
+    interval_index: np.ndarray
+    review_count: np.ndarray
+    # datetime64[us]; NaT for cards never reviewed
+    last_review: np.ndarray
+    next_review: np.ndarray
+    ease: np.ndarray
+    stability: np.ndarray
+    difficulty: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def mastered(self, intervals: Sequence[int] = INTERVALS) -> np.ndarray:
+        """Mask of the cards on the last step of the ladder."""
+        return self.interval_index >= len(intervals) - 1
+
+    def take(self, selection: np.ndarray) -> "CardBatch":
+        """The cards picked by a boolean mask or index array."""
+        return CardBatch(*(getattr(self, name)[selection] for name in self.__dataclass_fields__))
+
+    def changed_from(self, other: "CardBatch") -> np.ndarray:
+        """Mask of the cards whose stored state differs from the same cards in other."""
+        mask = np.zeros(len(self), dtype=bool)
+        for name in self.__dataclass_fields__:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            # NaT != NaT, so compare missing dates separately
+            differs = mine != theirs
+            if mine.dtype.kind == "M":
+                differs &= ~(np.isnat(mine) & np.isnat(theirs))
+            mask |= differs
+        return mask
+
+    @property
+    def interval_days(self) -> np.ndarray:
+        """Days between the last and the next review (0 for cards never reviewed)."""
+        days = (self.next_review - self.last_review) / _DAY
+        return np.where(np.isnan(days), 0.0, days)
+
+
+def _parse_dates(values: Sequence[Any]) -> np.ndarray:
+    # SQLite DateTime columns hold 'YYYY-MM-DD HH:MM:SS.ffffff' text; None becomes NaT
+    return np.array(values, dtype="datetime64[us]")
+
+
+def _format_dates(values: np.ndarray) -> List[str | None]:
+    # Back to SQLAlchemy's storage format, so stored dates compare correctly as text
+    texts = np.datetime_as_string(values, unit="us").tolist()
+    return [None if text == "NaT" else text.replace("T", " ") for text in texts]
+
+
+def _batch_from_rows(rows: Sequence[Sequence[Any]]) -> CardBatch:
+    if not rows:
+        ints = np.array([], dtype=np.int64)
+        dates = np.array([], dtype="datetime64[us]")
+        floats = np.array([], dtype=np.float64)
+        return CardBatch(ints, ints, ints, ints, dates, dates, floats, floats, floats)
+    columns = list(zip(*rows))
+    return CardBatch(
+        ids=np.array(columns[0], dtype=np.int64),
+        item_ids=np.array(columns[1], dtype=np.int64),
+        interval_index=np.array(columns[2], dtype=np.int64),
+        review_count=np.array(columns[3], dtype=np.int64),
+        last_review=_parse_dates(columns[4]),
+        next_review=_parse_dates(columns[5]),
+        ease=np.array(columns[6], dtype=np.float64),
+        stability=np.array(columns[7], dtype=np.float64),
+        difficulty=np.array(columns[8], dtype=np.float64),
+    )
+
+
+def load_cards(session: Session, item_ids: Sequence[int]) -> CardBatch:
+    """Load the schedules of the given items (at most SQLite's parameter limit at once), ordered by item id."""
+    placeholders = ", ".join("?" * len(item_ids))
+    rows = session.connection().exec_driver_sql(
+        f"SELECT {_COLUMNS} FROM review_schedules WHERE item_id IN ({placeholders}) ORDER BY item_id",
+        tuple(item_ids),
+    ).fetchall()
+    return _batch_from_rows(rows)
+
+
+def iter_card_chunks(session: Session, chunk_size: int) -> Iterator[CardBatch]:
+    """Yield every schedule in batches of chunk_size, keyset-paged by schedule id."""
+    connection = session.connection()
+    last_id = 0
+    while True:
+        rows = connection.exec_driver_sql(
+            f"SELECT {_COLUMNS} FROM review_schedules WHERE id > ? ORDER BY id LIMIT ?", (last_id, chunk_size)
+        ).fetchall()
+        if not rows:
+            return
+        yield _batch_from_rows(rows)
+        last_id = rows[-1][0]
+
+
+def store_cards(session: Session, cards: CardBatch, intervals: Sequence[int] = INTERVALS) -> int:
+    """Write a batch back with one executemany UPDATE (not committed).
+
+    The status is set from the position on the intervals ladder.
+
+    Returns:
+        Number of schedules written
+    """
+    if not len(cards):
+        return 0
+    status = np.where(cards.mastered(intervals), "mastered", "learning")
+    parameters = list(zip(
+        cards.interval_index.tolist(),
+        cards.review_count.tolist(),
+        _format_dates(cards.last_review),
+        _format_dates(cards.next_review),
+        status.tolist(),
+        cards.ease.tolist(),
+        cards.stability.tolist(),
+        cards.difficulty.tolist(),
+        cards.ids.tolist(),
+    ))
+    session.connection().exec_driver_sql(_UPDATE, parameters)
+    return len(parameters)
+
+
+def ladder_index(interval_days: np.ndarray, intervals: Sequence[int] = INTERVALS) -> np.ndarray:
+    """Index of the largest ladder step not above each interval (0 below the first step)."""
+    steps = np.asarray(intervals, dtype=np.float64)
+    return np.maximum(np.searchsorted(steps, interval_days, side="right") - 1, 0)
+
+
+def _grades(grades: ArrayLike, size: int) -> np.ndarray:
+    values = np.broadcast_to(np.asarray(grades, dtype=np.int64), (size,))
+    if values.size and (values.min() < Grade.AGAIN or values.max() > Grade.EASY):
+        raise ValueError(f"Grades must be between {int(Grade.AGAIN)} and {int(Grade.EASY)}")
+    return values
+
+
+def _reviewed(
+    cards: CardBatch, reviewed_at: datetime, interval_days: np.ndarray, intervals: Sequence[int], **state: np.ndarray
+) -> CardBatch:
+    """The batch after a review at reviewed_at scheduling the next one interval_days later."""
+    when = np.datetime64(reviewed_at, "us")
+    return replace(
+        cards,
+        interval_index=ladder_index(interval_days, intervals),
+        review_count=cards.review_count + 1,
+        last_review=np.full(len(cards), when),
+        next_review=when + np.round(interval_days * 86400e6).astype("timedelta64[us]"),
+        **state,
+    )
+
+
+class FixedLadder(SchedulingAlgorithm):
+    """The interval ladder: each review moves a card one step up.
+
+    Again restarts the ladder, Hard repeats the current step, Good moves one
+    step up and Easy two.
+    """
+
+    name = "fixed"
+
+    def review(self, cards: CardBatch, grades: ArrayLike, reviewed_at: datetime) -> CardBatch:
+        grades = _grades(grades, len(cards))
+        steps = np.asarray(self.intervals, dtype=np.int64)
+        index = cards.interval_index
+        index = np.select(
+            [grades == Grade.AGAIN, grades == Grade.HARD, grades == Grade.GOOD], [0, index, index + 1], index + 2
+        )
+        index = np.clip(index, 0, len(steps) - 1)
+        when = np.datetime64(reviewed_at, "us")
+        return replace(
+            cards,
+            interval_index=index,
+            review_count=cards.review_count + 1,
+            last_review=np.full(len(cards), when),
+            next_review=when + steps[index].astype("timedelta64[D]"),
+        )
+
+    def adopt(self, cards: CardBatch, now: datetime) -> CardBatch:
+        # Ladder positions are maintained by every algorithm, so they carry over as they are
+        return cards
+
+
+class SM2(SchedulingAlgorithm):
+    """SuperMemo 2: intervals grow by a per-card ease factor.
+
+    Grades map to SM-2 qualities Again=1, Hard=3, Good=4 and Easy=5. The
+    ease factor moves by 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02) after every
+    review and never drops below minimum_ease. A failed card starts over at
+    1 day; otherwise the first interval is 1 day, the second 6 and later
+    ones the previous interval times the ease.
+    """
+
+    name = "sm2"
+    QUALITY = np.array([0, 1, 3, 4, 5])
+
+    def __init__(self, minimum_ease: float = 1.3, maximum_interval: int = 36500):
+        super().__init__(minimum_ease=minimum_ease, maximum_interval=maximum_interval)
+        self.minimum_ease = float(minimum_ease)
+        self.maximum_interval = int(maximum_interval)
+
+    def review(self, cards: CardBatch, grades: ArrayLike, reviewed_at: datetime) -> CardBatch:
+        grades = _grades(grades, len(cards))
+        lapse = 5 - self.QUALITY[grades]
+        ease = np.maximum(cards.ease + 0.1 - lapse * (0.08 + lapse * 0.02), self.minimum_ease)
+
+        previous = cards.interval_days
+        interval = np.select([previous <= 0, previous <= 1], [1.0, 6.0], np.round(previous * ease))
+        interval = np.where(grades == Grade.AGAIN, 1.0, np.clip(interval, 1, self.maximum_interval))
+        return _reviewed(cards, reviewed_at, interval, self.intervals, ease=ease)
+
+    def adopt(self, cards: CardBatch, now: datetime) -> CardBatch:
+        return replace(cards, ease=np.maximum(cards.ease, self.minimum_ease))
+
+
+class FSRS(SchedulingAlgorithm):
+    """Free Spaced Repetition Scheduler (FSRS-4.5).
+
+    Each card has a stability S (days until recall probability falls to
+    90%) and a difficulty D from 1 to 10. Recall probability after t days
+    is (1 + FACTOR * t / S) ** DECAY, and the next review is scheduled when
+    it falls to desired_retention. Cards without FSRS state get the initial
+    stability of their first grade.
+    """
+
+    name = "fsrs"
+    DECAY = -0.5
+    FACTOR = 19 / 81
+    DEFAULT_WEIGHTS = (
+        0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+        0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+    )
+
+    def __init__(
+        self,
+        weights: Sequence[float] = DEFAULT_WEIGHTS,
+        desired_retention: float = 0.9,
+        maximum_interval: int = 36500,
+    ):
+        if len(weights) != len(self.DEFAULT_WEIGHTS):
+            raise ValueError(f"FSRS needs {len(self.DEFAULT_WEIGHTS)} weights, got {len(weights)}")
+        if not 0 < desired_retention < 1:
+            raise ValueError(f"desired_retention must be between 0 and 1, got {desired_retention}")
+        super().__init__(
+            weights=list(weights), desired_retention=desired_retention, maximum_interval=maximum_interval
+        )
+        self.w = np.asarray(weights, dtype=np.float64)
+        self.desired_retention = float(desired_retention)
+        self.maximum_interval = int(maximum_interval)
+
+    def initial_difficulty(self, grades: np.ndarray) -> np.ndarray:
+        difficulty: np.ndarray = np.clip(self.w[4] - (grades - 3) * self.w[5], 1, 10)
+        return difficulty
+
+    def retrievability(self, elapsed_days: np.ndarray, stability: np.ndarray) -> np.ndarray:
+        recall: np.ndarray = (1 + self.FACTOR * elapsed_days / stability) ** self.DECAY
+        return recall
+
+    def interval(self, stability: np.ndarray) -> np.ndarray:
+        days = stability / self.FACTOR * (self.desired_retention ** (1 / self.DECAY) - 1)
+        interval: np.ndarray = np.clip(np.round(days), 1, self.maximum_interval)
+        return interval
+
+    def _seeded(self, cards: CardBatch) -> CardBatch:
+        """Give reviewed cards without FSRS state their current interval as stability."""
+        seed = ~np.isnat(cards.last_review) & (cards.stability <= 0)
+        if not seed.any():
+            return cards
+        return replace(
+            cards,
+            stability=np.where(seed, np.maximum(cards.interval_days, 1.0), cards.stability),
+            difficulty=np.where(seed, self.initial_difficulty(np.full(len(cards), Grade.GOOD)), cards.difficulty),
+        )
+
+    def review(self, cards: CardBatch, grades: ArrayLike, reviewed_at: datetime) -> CardBatch:
+        grades = _grades(grades, len(cards))
+        w = self.w
+        cards = self._seeded(cards)
+        new = cards.stability <= 0
+        # Placeholder state for new cards keeps the formulas below finite; their result is replaced
+        stability = np.where(new, 1.0, cards.stability)
+        difficulty = np.where(new, self.initial_difficulty(np.full(len(cards), Grade.GOOD)), cards.difficulty)
+
+        elapsed = (np.datetime64(reviewed_at, "us") - cards.last_review) / _DAY  # type: ignore[operator]
+        elapsed = np.maximum(np.where(np.isnan(elapsed), 0.0, elapsed), 0.0)
+        recall = self.retrievability(elapsed, stability)
+
+        success = stability * (
+            1
+            + np.exp(w[8]) * (11 - difficulty) * stability ** -w[9] * (np.exp(w[10] * (1 - recall)) - 1)
+            * np.where(grades == Grade.HARD, w[15], 1.0)
+            * np.where(grades == Grade.EASY, w[16], 1.0)
+        )
+        lapse = w[11] * difficulty ** -w[12] * ((stability + 1) ** w[13] - 1) * np.exp(w[14] * (1 - recall))
+        next_stability = np.where(grades == Grade.AGAIN, lapse, success)
+        next_difficulty = np.clip(
+            w[7] * self.initial_difficulty(np.full(len(cards), Grade.GOOD))
+            + (1 - w[7]) * (difficulty - w[6] * (grades - 3)),
+            1,
+            10,
+        )
+
+        next_stability = np.where(new, w[grades - 1], next_stability)
+        next_difficulty = np.where(new, self.initial_difficulty(grades), next_difficulty)
+        return _reviewed(
+            cards,
+            reviewed_at,
+            self.interval(next_stability),
+            self.intervals,
+            stability=next_stability,
+            difficulty=next_difficulty,
+        )
+
+    def adopt(self, cards: CardBatch, now: datetime) -> CardBatch:
+        cards = self._seeded(cards)
+        reviewed = ~np.isnat(cards.last_review)
+        # Reschedule reviewed cards for the desired retention; new cards keep their first review
+        interval = self.interval(np.where(reviewed, cards.stability, 1.0))
+        next_review = np.where(
+            reviewed,
+            cards.last_review + np.round(interval * 86400e6).astype("timedelta64[us]"),
+            cards.next_review,
+        )
+        index = np.where(reviewed, ladder_index(interval, self.intervals), cards.interval_index)
+        return replace(cards, next_review=next_review, interval_index=index)
+
+
+ALGORITHMS: Dict[str, Type[SchedulingAlgorithm]] = {algorithm.name: algorithm for algorithm in (FixedLadder, SM2, FSRS)}
@@ -1,34 +1,334 @@
 """Database initialization and session management."""
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, List, Tuple
 
 from platformdirs import user_data_dir
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, Engine, create_engine, event, inspect
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.schema import CreateIndex
 
-from nudge.core.models import Base
+from nudge.core import perf
+from nudge.core.models import Base, create_tag_key_triggers, rebuild_tag_keys
+from nudge.core.search import create_search_index, rebuild_search_index
+from nudge.core.stats import create_stats_tables, rebuild_stats
+
+
+def _create_indexes(conn: Connection, *names: str) -> None:
+    """Create model-declared indexes by name, skipping any that already exist."""
+    indexes = {str(index.name): index for table in Base.metadata.tables.values() for index in table.indexes}
+    for name in names:
+        conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+
+
+def _add_column(conn: Connection, table: str, column: str, definition: str) -> None:
+    """Add a column unless the table already has it."""
+    existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+    if column not in existing:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _migration_initial_schema(conn: Connection) -> None:
+    """Create any tables missing from a database that predates versioning."""
+    for name in ("items", "tags", "item_tags", "review_schedules"):
+        Base.metadata.tables[name].create(conn, checkfirst=True)
+
+
+def _migration_review_indexes(conn: Connection) -> None:
+    """Add the indexes backing the due/upcoming queries and tag lookups."""
+    _create_indexes(
+        conn,
+        "ix_review_schedules_next_review_date",
+        "ix_review_schedules_status_next_review_date",
+        "ix_item_tags_tag_id",
+    )
+
+
+def _migration_search_index(conn: Connection) -> None:
+    """Add the FTS5 item search index and backfill it."""
+    create_search_index(conn)
+    rebuild_search_index(conn)
+
+
+def _migration_sort_keys(conn: Connection) -> None:
+    """Add the persisted tag sort key and the indexes behind each item table sort."""
+    _add_column(conn, "items", "tag_key", "VARCHAR DEFAULT '' NOT NULL")
+    _create_indexes(
+        conn,
+        "ix_items_name_lower",
+        "ix_items_date_added",
+        "ix_items_tag_key",
+        "ix_review_schedules_current_interval_index",
+    )
+    create_tag_key_triggers(conn)
+    rebuild_tag_keys(conn)
+
+
+def _migration_scheduling_state(conn: Connection) -> None:
+    """Add per-card scheduling algorithm state and the settings table."""
+    _add_column(conn, "review_schedules", "ease", "FLOAT DEFAULT 2.5 NOT NULL")
+    _add_column(conn, "review_schedules", "stability", "FLOAT DEFAULT 0 NOT NULL")
+    _add_column(conn, "review_schedules", "difficulty", "FLOAT DEFAULT 0 NOT NULL")
+    Base.metadata.tables["settings"].create(conn, checkfirst=True)
+
+
+def _migration_review_log(conn: Connection) -> None:
+    """Add the append-only review history."""
+    Base.metadata.tables["review_log"].create(conn, checkfirst=True)
+
+
+def _migration_stats(conn: Connection) -> None:
+    """Add the statistics summary tables and backfill them."""
+    create_stats_tables(conn)
+    rebuild_stats(conn)
+
+
+# Ordered schema migrations. A migration's version is its position in this list
+# (starting at 1); the applied version is stored in SQLite's user_version pragma.
+# Never reorder or remove entries - only append.
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("initial schema", _migration_initial_schema),
+    ("review schedule and item tag indexes", _migration_review_indexes),
+    ("full-text search index", _migration_search_index),
+    ("item table sort keys", _migration_sort_keys),
+    ("scheduling algorithm state", _migration_scheduling_state),
+    ("review log", _migration_review_log),
+    ("statistics summary tables", _migration_stats),
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Get the schema version stored in the database.
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Applied schema version (0 for an unversioned database)
+    """
+    return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+
+def _set_schema_version(conn: Connection, version: int) -> None:
+    # PRAGMA statements cannot take bound parameters
+    conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
+def _begin_immediate(conn: Connection) -> None:
+    # pysqlite only opens a transaction before INSERT/UPDATE/DELETE, so DDL would
+    # autocommit statement by statement; begin explicitly, taking the write lock
+    driver_connection: Any = conn.connection.driver_connection
+    if not driver_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def migrate(conn: Connection) -> int:
+    """Bring the schema up to SCHEMA_VERSION within the caller's transaction.
+
+    A brand-new database is created directly from the models and stamped with
+    the latest version. An existing database is upgraded in place by applying
+    every migration newer than its stored version. The SQLite transaction is
+    begun explicitly before any change, so the schema changes and the new
+    version are committed together or not at all.
+
+    Args:
+        conn: Connection with a transaction in progress
+
+    Returns:
+        The schema version after migrating
+
+    Raises:
+        RuntimeError: If the database was written by a newer version of Nudge
+    """
+    version = get_schema_version(conn)
+    if version < SCHEMA_VERSION:
+        _begin_immediate(conn)
+        # Another process may have migrated while we waited for the lock
+        version = get_schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than supported version {SCHEMA_VERSION}"
+        )
+
+    if version == 0 and not inspect(conn).has_table("items"):
+        # Fresh database: the models already describe the latest schema
+        Base.metadata.create_all(conn)
+    else:
+        for _description, migration in MIGRATIONS[version:]:
+            migration(conn)
+
+    if version != SCHEMA_VERSION:
+        _set_schema_version(conn, SCHEMA_VERSION)
+
+    return SCHEMA_VERSION
+
+
+def run_migrations(engine: Engine) -> int:
+    """Bring the database schema up to SCHEMA_VERSION in one transaction (see migrate).
+
+    Args:
+        engine: Engine bound to the database to migrate
+
+    Returns:
+        The schema version after migrating
+
+    Raises:
+        RuntimeError: If the database was written by a newer version of Nudge
+    """
+    with engine.begin() as conn:
+        return migrate(conn)
+
+
+@dataclass(frozen=True)
+class SQLiteProfile:
+    """Connection settings applied to every SQLite connection the engine opens.
+
+    The defaults favour a desktop app with one GUI writer and background
+    readers: WAL lets readers proceed while a write is in progress, and
+    synchronous=NORMAL is durable under WAL except for the last commits
+    before a power loss.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    foreign_keys: bool = True
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 64 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    pool_size: int = 5
+    max_overflow: int = 10
+
+    def pragmas(self) -> List[Tuple[str, Any]]:
+        """Get the PRAGMA statements for this profile, in the order they are applied.
+
+        Returns:
+            List of (pragma name, value) pairs
+        """
+        return [
+            ("journal_mode", self.journal_mode),
+            ("synchronous", self.synchronous),
+            ("foreign_keys", "ON" if self.foreign_keys else "OFF"),
+            ("busy_timeout", int(self.busy_timeout_ms)),
+            # A negative cache_size is a size in KiB rather than a page count
+            ("cache_size", -int(self.cache_size_kib)),
+            ("mmap_size", int(self.mmap_size)),
+            ("temp_store", self.temp_store),
+        ]
+
+
+# Stock SQLite behaviour: rollback journal, synchronous FULL, no foreign keys
+LEGACY_PROFILE = SQLiteProfile(
+    journal_mode="DELETE",
+    synchronous="FULL",
+    foreign_keys=False,
+    busy_timeout_ms=0,
+    cache_size_kib=2000,
+    mmap_size=0,
+    temp_store="DEFAULT",
+)
+
+DEFAULT_PROFILE = SQLiteProfile()
+
+
+def is_memory_database(db_path: str) -> bool:
+    """Whether db_path names an in-memory database, which exists only on its one connection."""
+    return db_path in ("", ":memory:") or db_path.startswith("file::memory:")
+
+
+def default_database_path() -> str:
+    """Path of the database in the platform's user data directory, creating the directory."""
+    data_dir = Path(user_data_dir("Nudge", "Nudge"))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return str(data_dir / "nudge.db")
+
+
+def configure_engine(engine: Engine, profile: SQLiteProfile) -> None:
+    """Apply profile's pragmas to every connection engine opens, and instrument it if enabled.
+
+    Args:
+        engine: Engine to configure (for an async engine, its sync_engine)
+        profile: Pragmas to apply
+    """
+    pragmas = profile.pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply_profile(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                # PRAGMA statements cannot take bound parameters
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    recorder = perf.get_recorder()
+    if recorder is not None:
+        recorder.instrument(engine)
+
+
+def create_sqlite_engine(db_path: str, profile: SQLiteProfile = DEFAULT_PROFILE, echo: bool = False) -> Engine:
+    """Create an engine whose connections are configured with a SQLite profile.
+
+    File databases use a QueuePool so the GUI thread and background workers
+    each check out their own connection. An in-memory database only exists on
+    its one connection, so it is shared through a StaticPool.
+
+    While instrumentation is enabled (see nudge.core.perf), the engine
+    reports every statement to the global recorder.
+
+    Args:
+        db_path: Path to the database file, or ":memory:"
+        profile: Pragmas and pool sizing to apply
+        echo: Whether to log emitted SQL
+
+    Returns:
+        Configured SQLAlchemy engine
+    """
+    # Pooled connections may be used from threads other than the one that opened them
+    connect_args = {"check_same_thread": False, "timeout": profile.busy_timeout_ms / 1000}
+    if is_memory_database(db_path):
+        engine = create_engine(
+            f"sqlite:///{db_path}", echo=echo, connect_args=connect_args, poolclass=StaticPool
+        )
+    else:
+        engine = create_engine(
+            f"sqlite:///{db_path}",
+            echo=echo,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=profile.pool_size,
+            max_overflow=profile.max_overflow,
+        )
+
+    configure_engine(engine, profile)
+    return engine
 
 
 class Database:
     """Database manager for the Nudge application."""
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, profile: SQLiteProfile | None = None):
         """Initialize database connection.
         
         Args:
             db_path: Optional custom database path. If None, uses default location.
+            profile: Optional SQLite connection profile. If None, uses DEFAULT_PROFILE.
         """
         if db_path is None:
             # Use platform-specific data directory
-            data_dir = Path(user_data_dir("Nudge", "Nudge"))
-            data_dir.mkdir(parents=True, exist_ok=True)
-            db_path = str(data_dir / "nudge.db")
+            db_path = default_database_path()
         
         self.db_path = db_path
-        self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        self.profile = profile or DEFAULT_PROFILE
+        self.engine = create_sqlite_engine(db_path, self.profile, echo=False)
         self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
         
-        # Create all tables
-        Base.metadata.create_all(self.engine)
+        # Create or upgrade the schema
+        run_migrations(self.engine)
     
     def get_session(self) -> Session:
         """Get a new database session.
@@ -38,7 +338,7 @@ class Database:
         """
         return self.SessionLocal()
     
-    def close(self):
+    def close(self) -> None:
         """Close database connection."""
         self.engine.dispose()
 
@@ -47,16 +347,17 @@ class Database:
 _db_instance: Database | None = None
 
 
-def get_database(db_path: str | None = None) -> Database:
+def get_database(db_path: str | None = None, profile: SQLiteProfile | None = None) -> Database:
     """Get or create the global database instance.
     
     Args:
         db_path: Optional custom database path
+        profile: Optional SQLite connection profile
         
     Returns:
         Database instance
     """
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database(db_path)
+        _db_instance = Database(db_path, profile)
     return _db_instance
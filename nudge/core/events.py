@@ -0,0 +1,100 @@
+"""Change notifications for committed writes.
+
+Scheduler and item operations publish the ids of the items they inserted,
+updated or deleted, and of any tags they created, once their transaction has
+committed, so views and caches can refresh just those rows instead of
+reloading everything. Listeners are called synchronously on the publishing
+thread, which for the GUI is usually a DatabaseWorker pool thread.
+"""
+import sys
+import threading
+import traceback
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Iterable, List
+
+
+@dataclass(frozen=True)
+class ItemChanges:
+    """Ids of the items and tags touched by one committed write.
+
+    ``updated`` covers any change to an item's row, tags or review schedule;
+    ``tags`` holds the ids of tags that were created, changed or removed.
+    """
+
+    inserted: FrozenSet[int] = frozenset()
+    updated: FrozenSet[int] = frozenset()
+    deleted: FrozenSet[int] = frozenset()
+    tags: FrozenSet[int] = frozenset()
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted or self.tags)
+
+
+Listener = Callable[[ItemChanges], None]
+
+
+class ChangeBus:
+    """Fan-out of ItemChanges to subscribed listeners."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Register a listener.
+
+        Args:
+            listener: Called with every published ItemChanges
+
+        Returns:
+            Function that unsubscribes the listener
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def publish(
+        self,
+        inserted: Iterable[int] = (),
+        updated: Iterable[int] = (),
+        deleted: Iterable[int] = (),
+        tags: Iterable[int] = (),
+    ) -> None:
+        """Notify listeners of items changed by a committed transaction.
+
+        A failing listener is reported on stderr and does not stop the
+        others: the write it reports on has already been committed.
+        """
+        changes = ItemChanges(frozenset(inserted), frozenset(updated), frozenset(deleted), frozenset(tags))
+        if not changes:
+            return
+
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(changes)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+
+# Global change bus instance
+_bus_instance: ChangeBus | None = None
+
+
+def get_change_bus() -> ChangeBus:
+    """Get or create the global change bus.
+
+    Returns:
+        ChangeBus instance
+    """
+    global _bus_instance
+    if _bus_instance is None:
+        _bus_instance = ChangeBus()
+    return _bus_instance
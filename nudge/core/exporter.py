@@ -0,0 +1,132 @@
+"""Export of study items and their review schedules.
+
+Files are written in the import formats, so an export can be imported again
+(into the same or another database) without losing review progress. Rows are
+streamed from a single column-projection query rather than loaded as ORM
+objects, so memory use does not grow with the collection size.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, TextIO
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from nudge.core.importer import detect_format
+from nudge.core.models import Item, ReviewSchedule, Tag, item_tags
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+COLUMNS = ("name", "tags", "date_added", "next_review_date", "last_review_date", "interval_index", "review_count")
+
+# Rows fetched from the cursor at a time
+_YIELD_PER = 1000
+
+
+def _format_datetime(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _csv_tags(names: List[str]) -> str:
+    """Join tag names into one CSV field the importer splits back into the same names.
+
+    Names are separated by ";" and quoted CSV-style when they contain one
+    (or a quote). The importer splits a field on commas when it has no ";",
+    so a field that needs CSV parsing or has commas in a name always gets a
+    ";" (a trailing one for a single tag).
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=";", lineterminator="").writerow(names)
+    joined = buffer.getvalue()
+    if ";" not in joined and ("," in joined or '"' in joined):
+        joined += ";"
+    return joined
+
+
+def iter_export_rows(session: Session) -> Iterator[Dict[str, Any]]:
+    """Stream every item as a dict keyed by COLUMNS, in id order.
+
+    Tags are a list of names; each writer encodes them for its format.
+    """
+    tags = (
+        select(func.json_group_array(Tag.name))
+        .select_from(item_tags.join(Tag, Tag.id == item_tags.c.tag_id))
+        .where(item_tags.c.item_id == Item.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            Item.name,
+            tags,
+            Item.date_added,
+            ReviewSchedule.next_review_date,
+            ReviewSchedule.last_review_date,
+            ReviewSchedule.current_interval_index,
+            ReviewSchedule.review_count,
+        )
+        .join(ReviewSchedule, ReviewSchedule.item_id == Item.id)
+        .order_by(Item.id)
+        .execution_options(yield_per=_YIELD_PER)
+    )
+    for name, tag_names, date_added, next_review, last_review, interval_index, review_count in session.execute(statement):
+        yield {
+            "name": name,
+            "tags": json.loads(tag_names),
+            "date_added": _format_datetime(date_added),
+            "next_review_date": _format_datetime(next_review),
+            "last_review_date": _format_datetime(last_review),
+            "interval_index": interval_index,
+            "review_count": review_count,
+        }
+
+
+def write_csv(rows: Iterator[Dict[str, Any]], f: TextIO) -> int:
+    """Write rows as CSV with a header row and tags joined into one field; returns the number of rows."""
+    writer = csv.DictWriter(f, fieldnames=COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow({**row, "tags": _csv_tags(row["tags"])})
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterator[Dict[str, Any]], f: TextIO) -> int:
+    """Write rows as JSON Lines with tags as a list; returns the number of rows."""
+    count = 0
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+WRITERS: Dict[str, Callable[[Iterator[Dict[str, Any]], TextIO], int]] = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
+
+
+def export_file(session: Session, path: str | Path, file_format: str | None = None) -> int:
+    """Export every item with its tags and review schedule to a file.
+
+    Args:
+        session: Database session
+        path: File to write
+        file_format: One of EXPORT_FORMATS (detected from the extension by default)
+
+    Returns:
+        Number of items written
+
+    Raises:
+        ValueError: If the format is unknown or cannot be detected
+    """
+    path = Path(path)
+    file_format = file_format or detect_format(path)
+    if file_format not in WRITERS:
+        raise ValueError(f"Cannot export to '{file_format}'; expected one of {', '.join(EXPORT_FORMATS)}")
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        return WRITERS[file_format](iter_export_rows(session), f)
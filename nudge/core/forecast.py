@@ -0,0 +1,143 @@
+"""Review workload forecast.
+
+Projects every schedule forward along the interval ladder, assuming each
+review happens on the day it is due, and counts the reviews falling on each
+day of the horizon. The work is done on NumPy arrays: schedules are grouped
+into a (interval index, due day) histogram, and since every card starting
+at the same interval index follows the same sequence of gaps, each group's
+histogram is shifted by those gaps and summed. The cost is one query plus
+O(intervals x reviews per card x horizon), however many cards there are.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import List, Sequence
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from nudge.core.models import ReviewSchedule
+from nudge.core.perf import timed
+from nudge.core.scheduler import INTERVALS, get_intervals
+
+DEFAULT_HORIZON_DAYS = 180
+
+
+@dataclass(frozen=True)
+class WorkloadForecast:
+    """Reviews expected on each day, starting today."""
+
+    start: date
+    # counts[d] is the number of reviews on start + d days
+    counts: np.ndarray
+
+    @property
+    def dates(self) -> List[date]:
+        return [self.start + timedelta(days=offset) for offset in range(len(self.counts))]
+
+
+def review_offsets(interval_index: int, horizon_days: int, intervals: Sequence[int] = INTERVALS) -> List[int]:
+    """Days after its next review on which a card at interval_index is reviewed again, within the horizon.
+
+    Args:
+        interval_index: The card's current interval index
+        horizon_days: Number of days projected
+        intervals: Interval ladder in days
+
+    Returns:
+        Offsets starting with 0 (the next review itself)
+    """
+    offsets = []
+    offset, index = 0, interval_index
+    while offset < horizon_days:
+        offsets.append(offset)
+        index = min(index + 1, len(intervals) - 1)
+        offset += intervals[index]
+    return offsets
+
+
+def project_reviews(
+    interval_indexes: np.ndarray,
+    due_days: np.ndarray,
+    horizon_days: int,
+    intervals: Sequence[int] = INTERVALS,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Count the reviews on each day when every card is reviewed on time.
+
+    Args:
+        interval_indexes: Current interval index of each card
+        due_days: Days from today until each card's next review; overdue cards
+            (negative values) are taken to be reviewed today
+        horizon_days: Number of days to project
+        intervals: Interval ladder in days
+        weights: Optional number of cards each (interval index, due day) pair stands for
+
+    Returns:
+        int64 array of length horizon_days with the number of reviews per day
+    """
+    levels = len(intervals)
+    counts = np.zeros(horizon_days, dtype=np.int64)
+    if horizon_days <= 0 or len(due_days) == 0:
+        return counts
+
+    indexes = np.clip(np.asarray(interval_indexes, dtype=np.int64), 0, levels - 1)
+    days = np.maximum(np.asarray(due_days, dtype=np.int64), 0)
+    within = days < horizon_days
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.int64)[within]
+    # Cards per (interval index, first review day)
+    grid = np.bincount(
+        indexes[within] * horizon_days + days[within], weights=weights, minlength=levels * horizon_days
+    ).astype(np.int64).reshape(levels, horizon_days)
+
+    for index in range(levels):
+        row = grid[index]
+        if not row.any():
+            continue
+        for offset in review_offsets(index, horizon_days, intervals):
+            counts[offset:] += row[:horizon_days - offset]
+    return counts
+
+
+@timed
+def forecast_workload(
+    session: Session, horizon_days: int = DEFAULT_HORIZON_DAYS, today: date | None = None
+) -> WorkloadForecast:
+    """Forecast the number of reviews per day over the next horizon_days days.
+
+    Only schedules due before the end of the horizon can contribute, so just
+    those are read, through the next_review_date index, and SQLite groups
+    them into (interval index, days until due, cards) triples: at most
+    intervals x horizon rows reach Python, however many cards there are.
+
+    Args:
+        session: Database session
+        horizon_days: Number of days to forecast, starting today
+        today: Optional first day (defaults to today)
+
+    Returns:
+        WorkloadForecast with one count per day
+
+    Raises:
+        ValueError: If horizon_days is negative
+    """
+    if horizon_days < 0:
+        raise ValueError(f"horizon_days must not be negative, got {horizon_days}")
+    if today is None:
+        today = date.today()
+    end = datetime.combine(today + timedelta(days=horizon_days), datetime.min.time())
+
+    due_day = cast(
+        func.julianday(func.date(ReviewSchedule.next_review_date)) - func.julianday(today.isoformat()), Integer
+    )
+    rows = session.execute(
+        select(ReviewSchedule.current_interval_index, due_day, func.count())
+        .where(ReviewSchedule.next_review_date < end)
+        .group_by(ReviewSchedule.current_interval_index, due_day)
+    )
+    groups = np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 3)
+
+    counts = project_reviews(groups[:, 0], groups[:, 1], horizon_days, get_intervals(session), weights=groups[:, 2])
+    return WorkloadForecast(today, counts)
@@ -0,0 +1,248 @@
+"""Review history: the append-only review log and analytics over it.
+
+Every review written by scheduler.mark_as_reviewed / mark_many_reviewed
+appends one review_log row (item id, timestamp, grade, interval) in the same
+transaction as the schedule update. The helpers below answer questions the
+schedules alone cannot - how well items are remembered after a given gap,
+review streaks, accuracy per tag - as SQL aggregates, so they stay fast on
+logs of tens of millions of rows:
+
+- retention_curve walks the (item_id, ts, grade) index in order, so the
+  window function pairing each review with the previous one needs no sort;
+  with ``since`` it only windows the reviews in range.
+- review_streak never scans the log: it finds each day with reviews by
+  seeking the ts index for the first review at or after the next day.
+- accuracy_by_tag aggregates the log per item before joining tags, so the
+  join is per item rather than per review.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import ColumnElement, SQLColumnExpression, case, func, select, text
+from sqlalchemy.orm import Session, aliased
+
+from nudge.core.models import ReviewLog, Tag, item_tags
+from nudge.core.perf import timed
+
+if TYPE_CHECKING:
+    from nudge.core.algorithms import CardBatch
+
+SECONDS_PER_DAY = 86400
+
+_EPOCH = datetime(1970, 1, 1)
+
+_INSERT = "INSERT INTO review_log (item_id, ts, grade, interval_days) VALUES (?, ?, ?, ?)"
+
+# Days with at least one review, one index seek per day, then runs of consecutive days
+_STREAKS = text("""
+WITH RECURSIVE days(day) AS (
+    SELECT (SELECT min(ts) FROM review_log) / 86400
+    UNION ALL
+    SELECT (SELECT min(ts) FROM review_log WHERE ts >= (day + 1) * 86400) / 86400
+      FROM days WHERE day IS NOT NULL
+),
+runs AS (
+    SELECT day, day - row_number() OVER (ORDER BY day) AS run FROM days WHERE day IS NOT NULL
+)
+SELECT max(day) AS last_day, count(*) AS length FROM runs GROUP BY run
+""")
+
+
+class RetentionPoint(NamedTuple):
+    """Reviews that came a number of days after the item's previous review."""
+
+    days: int
+    reviews: int
+    recalled: int
+
+    @property
+    def retention(self) -> float:
+        """Fraction of those reviews not graded AGAIN."""
+        return self.recalled / self.reviews if self.reviews else 0.0
+
+
+class Streak(NamedTuple):
+    """Runs of consecutive days with at least one review."""
+
+    # Days in the run ending today, or yesterday if nothing was reviewed today yet
+    current: int
+    longest: int
+
+
+class TagAccuracy(NamedTuple):
+    """Reviews of the items with a tag, and how many were not graded AGAIN."""
+
+    name: str
+    reviews: int
+    recalled: int
+
+    @property
+    def accuracy(self) -> float:
+        return self.recalled / self.reviews if self.reviews else 0.0
+
+
+def to_timestamp(when: datetime) -> int:
+    """Seconds since the epoch of a naive local datetime, as stored in review_log.ts."""
+    return calendar.timegm(when.timetuple())
+
+
+def from_timestamp(ts: int) -> datetime:
+    """Naive local datetime of a review_log.ts value."""
+    return _EPOCH + timedelta(seconds=ts)
+
+
+def day_number(day: date) -> int:
+    """Days since the epoch of a date, the day of a review_log.ts value (ts // 86400)."""
+    return (day - _EPOCH.date()).days
+
+
+def _recalled(grade: SQLColumnExpression[int]) -> ColumnElement[int]:
+    return func.sum(case((grade > 1, 1), else_=0))
+
+
+def log_reviews(session: Session, cards: "CardBatch", grade: int) -> int:
+    """Append a review_log row for every card of a batch just reviewed (not committed).
+
+    Every review gets its own row, even several of one item within a second.
+
+    Args:
+        session: Database session
+        cards: The batch as returned by SchedulingAlgorithm.review
+        grade: Grade given to every card
+
+    Returns:
+        Number of rows written
+    """
+    if not len(cards):
+        return 0
+    parameters = list(zip(
+        cards.item_ids.tolist(),
+        cards.last_review.astype("datetime64[s]").astype("int64").tolist(),
+        [int(grade)] * len(cards),
+        cards.interval_days.round().astype("int64").tolist(),
+    ))
+    session.connection().exec_driver_sql(_INSERT, parameters)
+    return len(parameters)
+
+
+@timed
+def retention_curve(session: Session, since: datetime | None = None, max_days: int | None = None) -> List[RetentionPoint]:
+    """Share of reviews recalled, by days since the item's previous review.
+
+    An item's first review has no previous one and is not counted.
+
+    Args:
+        session: Database session
+        since: Optional start; only reviews from then on are counted (their
+            previous review may be older)
+        max_days: Optional cap; longer gaps are counted at max_days
+
+    Returns:
+        One RetentionPoint per gap length with any reviews, shortest first
+    """
+    previous: ColumnElement[int] = func.lag(ReviewLog.ts).over(partition_by=ReviewLog.item_id, order_by=ReviewLog.ts)
+    reviews = select(ReviewLog.ts, ReviewLog.grade)
+    if since is not None:
+        # Window only the reviews in range; the first one of each item seeks its predecessor
+        start = to_timestamp(since)
+        before = aliased(ReviewLog)
+        previous = func.coalesce(
+            previous,
+            select(func.max(before.ts))
+            .where(before.item_id == ReviewLog.item_id, before.ts < start)
+            .scalar_subquery(),
+        )
+        reviews = reviews.where(ReviewLog.ts >= start)
+    gaps = reviews.add_columns(previous.label("previous")).subquery()
+    days = (gaps.c.ts - gaps.c.previous) // SECONDS_PER_DAY
+    if max_days is not None:
+        days = func.min(days, max_days)
+    days = days.label("days")
+    statement = (
+        select(days, func.count(), _recalled(gaps.c.grade))
+        .where(gaps.c.previous.is_not(None))
+        .group_by(days)
+        .order_by(days)
+    )
+    return [RetentionPoint(gap, reviews, recalled) for gap, reviews, recalled in session.execute(statement)]
+
+
+@timed
+def review_streak(session: Session, today: date | None = None) -> Streak:
+    """Current and longest runs of consecutive days with reviews.
+
+    Args:
+        session: Database session
+        today: Optional day the current streak is counted up to (defaults to today)
+
+    Returns:
+        Streak, with zeros for an empty log
+    """
+    if today is None:
+        today = date.today()
+
+    day = day_number(today)
+    current = longest = 0
+    for last_day, length in session.execute(_STREAKS):
+        longest = max(longest, length)
+        if last_day in (day, day - 1):
+            current = length
+    return Streak(current, longest)
+
+
+@timed
+def reviews_per_day(session: Session, days: int = 30, today: date | None = None) -> List[Tuple[date, int]]:
+    """Count the reviews on each of the last N days.
+
+    Args:
+        session: Database session
+        days: Number of days, ending today
+        today: Optional last day (defaults to today)
+
+    Returns:
+        (day, reviews) for every day, oldest first, including days without reviews
+    """
+    if today is None:
+        today = date.today()
+
+    first = today - timedelta(days=days - 1)
+    day = (ReviewLog.ts // SECONDS_PER_DAY).label("day")
+    rows = session.execute(
+        select(day, func.count())
+        .where(ReviewLog.ts >= day_number(first) * SECONDS_PER_DAY)
+        .where(ReviewLog.ts < (day_number(today) + 1) * SECONDS_PER_DAY)
+        .group_by(day)
+    )
+    counts: Dict[int, int] = dict(rows.all())
+    return [(first + timedelta(days=offset), counts.get(day_number(first) + offset, 0)) for offset in range(days)]
+
+
+@timed
+def accuracy_by_tag(session: Session, since: datetime | None = None) -> List[TagAccuracy]:
+    """Reviews and recall rate of the items with each tag.
+
+    Args:
+        session: Database session
+        since: Optional start; only reviews from then on are counted
+
+    Returns:
+        TagAccuracy for every tag with logged reviews, sorted by name
+    """
+    reviews = select(
+        ReviewLog.item_id,
+        func.count().label("reviews"),
+        _recalled(ReviewLog.grade).label("recalled"),
+    ).group_by(ReviewLog.item_id)
+    if since is not None:
+        reviews = reviews.where(ReviewLog.ts >= to_timestamp(since))
+    per_item = reviews.subquery()
+    rows = session.execute(
+        select(Tag.name, func.sum(per_item.c.reviews), func.sum(per_item.c.recalled))
+        .select_from(per_item)
+        .join(item_tags, item_tags.c.item_id == per_item.c.item_id)
+        .join(Tag, Tag.id == item_tags.c.tag_id)
+        .group_by(Tag.id)
+        .order_by(Tag.name)
+    )
+    return [TagAccuracy(name, reviews, recalled) for name, reviews, recalled in rows]
@@ -0,0 +1,313 @@
+"""Bulk import of study items, tags and review schedules.
+
+Records are streamed from the input file and written in chunks. Each chunk
+resolves all of its tag names with one set-based query and inserts its items,
+item/tag links and review schedules with executemany in a single transaction,
+so importing a large deck costs a handful of statements per chunk rather than
+several queries and commits per item.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from nudge.core.events import get_change_bus
+from nudge.core.models import Base, item_tags
+from nudge.core.perf import timed
+from nudge.core.scheduler import get_intervals
+from nudge.core.tags import get_tag_registry
+
+FORMATS = ("csv", "jsonl", "tsv")
+
+DEFAULT_CHUNK_SIZE = 5000
+
+@dataclass
+class ImportRecord:
+    """A single item read from an import file."""
+
+    name: str
+    tags: List[str] = field(default_factory=list)
+    date_added: datetime | None = None
+    next_review_date: datetime | None = None
+    last_review_date: datetime | None = None
+    interval_index: int = 0
+    review_count: int = 0
+
+
+@dataclass
+class ImportResult:
+    """Summary of a finished import."""
+
+    items: int = 0
+    tags_created: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Imported items per second of wall-clock time."""
+        return self.items / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _split_tags(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        # Exports separate tags with ";", quoting names that contain one (see
+        # exporter._csv_tags); hand-written files may use commas instead
+        value = next(csv.reader([value], delimiter=";")) if ";" in value else value.split(",")
+    return [tag.strip() for tag in value if tag and tag.strip()]
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).strip())
+
+
+def _parse_int(value: Any, default: int = 0) -> int:
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _record_from_mapping(row: dict) -> ImportRecord | None:
+    name = (row.get("name") or "").strip()
+    if not name:
+        return None
+    return ImportRecord(
+        name=name,
+        tags=_split_tags(row.get("tags")),
+        date_added=_parse_datetime(row.get("date_added")),
+        next_review_date=_parse_datetime(row.get("next_review_date")),
+        last_review_date=_parse_datetime(row.get("last_review_date")),
+        interval_index=_parse_int(row.get("interval_index")),
+        review_count=_parse_int(row.get("review_count")),
+    )
+
+
+def read_csv(path: Path) -> Iterator[ImportRecord | None]:
+    """Read records from a CSV file with a header row.
+
+    The ``name`` column is required. ``tags`` holds tag names separated by
+    commas or semicolons; ``date_added``, ``next_review_date``,
+    ``last_review_date`` (ISO 8601), ``interval_index`` and ``review_count``
+    are optional. Rows without a name yield None.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            yield _record_from_mapping(row)
+
+
+def read_jsonl(path: Path) -> Iterator[ImportRecord | None]:
+    """Read records from a JSON Lines file, one object per line.
+
+    Objects use the same keys as the CSV columns; ``tags`` may be a list or
+    a separated string. Blank lines are ignored.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield _record_from_mapping(json.loads(line))
+
+
+def read_anki_tsv(path: Path) -> Iterator[ImportRecord | None]:
+    """Read records from an Anki "Notes in Plain Text" export.
+
+    The first field becomes the item name. Tags are read from the column named
+    by a ``#tags column:N`` header, or from the last column when the export
+    has more than two fields and no header; Anki separates tags with spaces.
+    """
+    tags_column: int | None = None
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.startswith("#"):
+                key, _, value = line[1:].partition(":")
+                if key.strip() == "tags column":
+                    tags_column = int(value) - 1
+                continue
+            if not line.strip():
+                continue
+
+            fields = line.split("\t")
+            name = fields[0].strip()
+            if not name:
+                yield None
+                continue
+
+            column = tags_column if tags_column is not None else (len(fields) - 1 if len(fields) > 2 else None)
+            tags = fields[column].split() if column is not None and column < len(fields) else []
+            yield ImportRecord(name=name, tags=tags)
+
+
+READERS: Dict[str, Callable[[Path], Iterator[ImportRecord | None]]] = {
+    "csv": read_csv,
+    "jsonl": read_jsonl,
+    "tsv": read_anki_tsv,
+}
+
+
+def detect_format(path: Path) -> str:
+    """Guess the import format from a file extension.
+
+    Raises:
+        ValueError: If the extension is not recognised
+    """
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("csv",):
+        return "csv"
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix in ("tsv", "txt"):
+        return "tsv"
+    raise ValueError(f"Cannot detect import format of '{path.name}'; expected one of {', '.join(FORMATS)}")
+
+
+def _chunks(records: Iterable[ImportRecord | None], size: int) -> Iterator[List[ImportRecord | None]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def resolve_tag_ids(session: Session, names: Set[str]) -> Tuple[Dict[str, int], List[int]]:
+    """Map tag names to ids, inserting any tags that do not exist yet.
+
+    Resolved through the TagRegistry: cached tags cost nothing, the rest are
+    fetched with set-based ``IN`` queries and the missing ones inserted in
+    one executemany. The caller owns the transaction.
+
+    Args:
+        session: Database session
+        names: Tag names to resolve
+
+    Returns:
+        Tuple of ({tag_name: tag_id}, ids of the tags created)
+    """
+    tags, created = get_tag_registry().resolve(session, names)
+    return {name: tag.id for name, tag in tags.items()}, created
+
+
+@timed
+def import_records(
+    session: Session,
+    records: Iterable[ImportRecord | None],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Insert records in chunks, committing once per chunk.
+
+    Args:
+        session: Database session
+        records: Records to import; None entries are counted as skipped
+        chunk_size: Number of records written per transaction
+        on_chunk: Optional callback invoked with the running totals after each chunk
+
+    Returns:
+        ImportResult with counts and elapsed time
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    result = ImportResult()
+    started = time.perf_counter()
+    intervals = get_intervals(session)
+    last_index = len(intervals) - 1
+    items_table = Base.metadata.tables["items"]
+    schedules_table = Base.metadata.tables["review_schedules"]
+
+    for chunk in _chunks(records, chunk_size):
+        valid = [record for record in chunk if record is not None]
+        result.skipped += len(chunk) - len(valid)
+        if not valid:
+            continue
+
+        now = datetime.now()
+        try:
+            tag_ids, created = resolve_tag_ids(session, {tag for record in valid for tag in record.tags})
+
+            # SQLite hands out rowids in VALUES order within the write transaction, so sorting
+            # the returned ids lines them up with the records. (sort_by_parameter_order would
+            # make SQLAlchemy fall back to one INSERT per row.)
+            item_ids: Sequence[int] = sorted(session.execute(
+                insert(items_table).returning(items_table.c.id),
+                [{"name": record.name, "date_added": record.date_added or now} for record in valid],
+            ).scalars())
+
+            links = [
+                {"item_id": item_id, "tag_id": tag_id}
+                for item_id, record in zip(item_ids, valid)
+                for tag_id in {tag_ids[tag] for tag in record.tags}
+            ]
+            if links:
+                session.execute(insert(item_tags), links)
+
+            schedules = []
+            for item_id, record in zip(item_ids, valid):
+                index = min(max(record.interval_index, 0), last_index)
+                next_review_date = record.next_review_date or (
+                    (record.last_review_date or now) + timedelta(days=intervals[index])
+                )
+                schedules.append({
+                    "item_id": item_id,
+                    "current_interval_index": index,
+                    "review_count": record.review_count,
+                    "last_review_date": record.last_review_date,
+                    "next_review_date": next_review_date,
+                    "status": "mastered" if index == last_index else "learning",
+                })
+            session.execute(insert(schedules_table), schedules)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        get_change_bus().publish(inserted=item_ids, tags=created)
+
+        result.items += len(valid)
+        result.tags_created += len(created)
+        result.chunks += 1
+        result.elapsed = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(result)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def import_file(
+    session: Session,
+    path: str | Path,
+    file_format: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Stream an import file into the database.
+
+    Args:
+        session: Database session
+        path: File to import
+        file_format: One of FORMATS; detected from the extension if None
+        chunk_size: Number of records written per transaction
+        on_chunk: Optional progress callback, see import_records
+
+    Returns:
+        ImportResult with counts and elapsed time
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    path = Path(path)
+    file_format = file_format or detect_format(path)
+    if file_format not in READERS:
+        raise ValueError(f"Unknown import format '{file_format}'; expected one of {', '.join(FORMATS)}")
+    return import_records(session, READERS[file_format](path), chunk_size=chunk_size, on_chunk=on_chunk)
@@ -0,0 +1,99 @@
+"""Creating and deleting study items."""
+from typing import Iterable, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from nudge.core.events import get_change_bus
+from nudge.core.models import Item, item_tags
+from nudge.core.perf import timed
+from nudge.core.scheduler import IN_CLAUSE_BATCH, new_review_schedule
+from nudge.core.tags import get_tag_registry
+
+
+@timed
+def create_item(session: Session, name: str, tag_names: List[str]) -> Item:
+    """Create an item with its tags and first review schedule.
+    
+    Tags are resolved through the TagRegistry; the ones that do not exist
+    yet are created with a random color. Everything is committed in one
+    transaction.
+    
+    Args:
+        session: Database session
+        name: Item name
+        tag_names: Names of the tags to attach
+        
+    Returns:
+        The new Item
+    """
+    try:
+        tags, created = get_tag_registry().resolve(session, tag_names)
+        
+        item = Item(name=name)
+        session.add(item)
+        session.flush()  # Flush to ensure item gets an ID before linking tags
+        if tags:
+            session.execute(insert(item_tags), [{"item_id": item.id, "tag_id": tag.id} for tag in tags.values()])
+        new_review_schedule(session, item)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    
+    get_change_bus().publish(inserted=[item.id], tags=created)
+    return item
+
+
+@timed
+def delete_item(session: Session, item_id: int) -> None:
+    """Delete an item along with its review schedule and tag links.
+    
+    Args:
+        session: Database session
+        item_id: ID of the item to delete
+        
+    Raises:
+        ValueError: If the item does not exist
+    """
+    item = session.get(Item, item_id)
+    if item is None:
+        raise ValueError(f"Item {item_id} not found")
+    session.delete(item)
+    session.commit()
+    get_change_bus().publish(deleted=[item_id])
+
+
+@timed
+def delete_items(session: Session, item_ids: Iterable[int]) -> int:
+    """Delete many items in one transaction, like delete_item.
+    
+    Either every item is deleted or none is.
+    
+    Args:
+        session: Database session
+        item_ids: IDs of the items to delete
+        
+    Returns:
+        Number of items deleted
+        
+    Raises:
+        ValueError: If any of the items does not exist
+    """
+    ids = sorted(set(item_ids))
+    deleted: List[int] = []
+    try:
+        for start in range(0, len(ids), IN_CLAUSE_BATCH):
+            for item in session.query(Item).filter(Item.id.in_(ids[start:start + IN_CLAUSE_BATCH])):
+                session.delete(item)
+                deleted.append(item.id)
+        if len(deleted) != len(ids):
+            missing = sorted(set(ids) - set(deleted))
+            raise ValueError(f"Items {missing} not found")
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    
+    get_change_bus().publish(deleted=deleted)
+    return len(deleted)
@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table
+from sqlalchemy import Column, Connection, DateTime, Float, ForeignKey, Index, Integer, String, Table, event, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -17,6 +17,8 @@ item_tags = Table(
     Base.metadata,
     Column("item_id", Integer, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # The composite primary key already covers lookups by item_id; tag_id needs its own index
+    Index("ix_item_tags_tag_id", "tag_id"),
 )
 
 
@@ -28,6 +30,10 @@ class Item(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     date_added: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, nullable=False)
     
+    # Sort key for the tags column: lower-cased tag names in alphabetical order, joined
+    # with ", ". Maintained by the triggers in TAG_KEY_TRIGGERS; never set it directly.
+    tag_key: Mapped[str] = mapped_column(String, default="", server_default="", nullable=False)
+    
     # Relationships
     tags: Mapped[List["Tag"]] = relationship(
         "Tag", secondary=item_tags, back_populates="items", lazy="selectin"
@@ -36,6 +42,13 @@ class Item(Base):
         "ReviewSchedule", back_populates="item", cascade="all, delete-orphan", uselist=False, lazy="selectin"
     )
 
+    __table_args__ = (
+        # Sort keys for the item table; the implicit rowid makes each one a (key, id) keyset
+        Index("ix_items_name_lower", func.lower(name)),
+        Index("ix_items_date_added", "date_added"),
+        Index("ix_items_tag_key", "tag_key"),
+    )
+
     def __repr__(self) -> str:
         return f"<Item(id={self.id}, name='{self.name}')>"
 
@@ -48,9 +61,10 @@ class Tag(Base):
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     color: Mapped[str] = mapped_column(String, nullable=False)  # Hex color code like "#FF6B6B"
     
-    # Relationships
+    # Relationships (loaded on access: eager loading would pull in every item of the tag,
+    # and through Item.tags every tag of those items)
     items: Mapped[List["Item"]] = relationship(
-        "Item", secondary=item_tags, back_populates="tags", lazy="selectin"
+        "Item", secondary=item_tags, back_populates="tags", lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -60,6 +74,14 @@ class Tag(Base):
 class ReviewSchedule(Base):
     """Spaced repetition schedule for an item."""
     __tablename__ = "review_schedules"
+    __table_args__ = (
+        # Due/upcoming queries and the item table order by next_review_date
+        Index("ix_review_schedules_next_review_date", "next_review_date"),
+        # Status filters ("learning" vs "mastered") ordered by date; also serves status-only lookups
+        Index("ix_review_schedules_status_next_review_date", "status", "next_review_date"),
+        # Item table sort by interval
+        Index("ix_review_schedules_current_interval_index", "current_interval_index"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id", ondelete="CASCADE"), unique=True, nullable=False)
@@ -75,8 +97,87 @@ class ReviewSchedule(Base):
     # Status: 'learning', 'mastered'
     status: Mapped[str] = mapped_column(String, default="learning", nullable=False)
     
+    # Scheduling algorithm state (see nudge.core.algorithms): SM-2 ease factor, and FSRS
+    # stability (days) and difficulty (1-10), where 0 means the card has no FSRS state yet
+    ease: Mapped[float] = mapped_column(Float, default=2.5, server_default="2.5", nullable=False)
+    stability: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False)
+    difficulty: Mapped[float] = mapped_column(Float, default=0.0, server_default="0", nullable=False)
+    
     # Relationships
     item: Mapped["Item"] = relationship("Item", back_populates="review_schedule")
 
     def __repr__(self) -> str:
         return f"<ReviewSchedule(item_id={self.item_id}, interval_index={self.current_interval_index}, status='{self.status}')>"
+
+
+class ReviewLog(Base):
+    """One past review of an item. Rows are only ever appended (or removed with their item).
+    
+    Kept compact for histories of tens of millions of reviews: the timestamp
+    is whole seconds since the epoch in local clock time (like the naive
+    datetimes elsewhere, so ts // 86400 is the local day number) and the
+    interval is whole days. An item may have several reviews in the same
+    second; each is its own row.
+    """
+    __tablename__ = "review_log"
+    __table_args__ = (
+        # Per-item history in time order; with the grade it covers the analytics queries
+        Index("ix_review_log_item_id_ts", "item_id", "ts", "grade"),
+        # Day-range queries: reviews per day, streaks
+        Index("ix_review_log_ts", "ts"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    item_id: Mapped[int] = mapped_column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    ts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # nudge.core.scheduler.Grade value (1 = again ... 4 = easy)
+    grade: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Days until the next review this review scheduled
+    interval_days: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReviewLog(item_id={self.item_id}, ts={self.ts}, grade={self.grade})>"
+
+
+class Setting(Base):
+    """Application setting, stored as JSON text."""
+    __tablename__ = "settings"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    value: Mapped[str] = mapped_column(String, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Setting(key='{self.key}', value={self.value})>"
+
+
+_ITEM_TAG_KEY = """
+(SELECT COALESCE(group_concat(tag_name, ', '), '')
+   FROM (SELECT lower(tags.name) AS tag_name
+           FROM item_tags JOIN tags ON tags.id = item_tags.tag_id
+          WHERE item_tags.item_id = {item_id}
+          ORDER BY tag_name))
+"""
+
+TAG_KEY_TRIGGERS: List[str] = [
+    "CREATE TRIGGER IF NOT EXISTS items_tag_key_link AFTER INSERT ON item_tags BEGIN "
+    f"UPDATE items SET tag_key = {_ITEM_TAG_KEY.format(item_id='new.item_id')} WHERE id = new.item_id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_tag_key_unlink AFTER DELETE ON item_tags BEGIN "
+    f"UPDATE items SET tag_key = {_ITEM_TAG_KEY.format(item_id='old.item_id')} WHERE id = old.item_id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_tag_key_rename AFTER UPDATE OF name ON tags BEGIN "
+    f"UPDATE items SET tag_key = {_ITEM_TAG_KEY.format(item_id='items.id')} "
+    "WHERE id IN (SELECT item_id FROM item_tags WHERE tag_id = new.id); END",
+]
+
+
+def create_tag_key_triggers(conn: Connection) -> None:
+    """Create the triggers that keep Item.tag_key in sync with item_tags and tags."""
+    for statement in TAG_KEY_TRIGGERS:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild_tag_keys(conn: Connection) -> None:
+    """Recompute Item.tag_key for every item."""
+    conn.exec_driver_sql(f"UPDATE items SET tag_key = {_ITEM_TAG_KEY.format(item_id='items.id')}")
+
+
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: create_tag_key_triggers(connection))
@@ -0,0 +1,306 @@
+"""Opt-in query and hot-path instrumentation.
+
+When enabled (``enable()``, or ``NUDGE_PERF=1`` in the environment), every
+engine created afterwards reports each SQL statement through SQLAlchemy's
+``before/after_cursor_execute`` events, and functions wrapped with ``timed``
+report how long they took and how many statements they issued. Statements
+are grouped by their SQL with ``IN`` lists and multi-row ``VALUES``
+collapsed, so a query repeated once per item (an N+1 pattern) shows up as
+one line with a large count.
+
+A statement's time covers executing it; its rows are the rows the driver
+reports as affected (SQLite reports none for a ``SELECT``, whose rows are
+produced lazily as they are fetched). With a trace path
+(``NUDGE_PERF_TRACE``) every statement and timer is also appended to a
+JSON Lines file, which ``PerfRecorder.from_trace`` aggregates again later.
+
+While disabled, ``timed`` functions cost one global lookup per call and no
+event listeners are installed.
+"""
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, TextIO, TypeVar
+
+from sqlalchemy import Engine, event
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Latency samples kept per statement or timer for the percentile
+MAX_SAMPLES = 4096
+
+# conn.info key of the start times of the statements running on a connection
+_STARTED = "nudge_perf_started"
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_MULTI_VALUES = re.compile(r"\bVALUES (\([^()]*\))(?:, \([^()]*\))+", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """Group key for a statement: whitespace collapsed, IN lists and multi-row VALUES shortened."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _IN_LIST.sub("IN (?...)", statement)
+    return _MULTI_VALUES.sub(r"VALUES \1, ...", statement)
+
+
+class Stat:
+    """Aggregated calls of one statement or timer."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        # Statements issued (timers only)
+        self.queries = 0
+        self.samples: Deque[float] = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, duration: float, rows: int = 0, queries: int = 0) -> None:
+        self.count += 1
+        self.total += duration
+        self.rows += rows
+        self.queries += queries
+        self.samples.append(duration)
+
+    @property
+    def p95(self) -> float:
+        """95th percentile duration of the recent calls (nearest rank)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "p95_ms": self.p95 * 1000,
+            "rows": self.rows,
+            "queries": self.queries,
+        }
+
+
+class PerfRecorder:
+    """Aggregates statement and timer measurements, optionally tracing them to JSON Lines.
+
+    Thread-safe: the GUI thread and database workers record into the same
+    recorder. Each timer counts the statements issued on its own thread
+    while it runs.
+    """
+
+    def __init__(self, trace_path: str | Path | None = None) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.started = time.time()
+        self.statements: Dict[str, Stat] = {}
+        self.timers: Dict[str, Stat] = {}
+        self.trace_path = Path(trace_path) if trace_path is not None else None
+        self._tracing = self.trace_path is not None
+
+    def instrument(self, engine: Engine) -> None:
+        """Record every statement executed through engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        # Keyed by execution context, so a statement that fails cannot shift later timings
+        conn.info.setdefault(_STARTED, {})[context] = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        started = conn.info.get(_STARTED, {}).pop(context, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        for counter in self._active_timers():
+            counter[0] += 1
+        self.record_query(normalize_sql(statement), elapsed, max(cursor.rowcount, 0))
+
+    def _handle_error(self, exception_context: Any) -> None:
+        conn = exception_context.connection
+        if conn is not None:
+            conn.info.get(_STARTED, {}).pop(exception_context.execution_context, None)
+
+    def _active_timers(self) -> List[List[int]]:
+        active: List[List[int]] | None = getattr(self._local, "timers", None)
+        if active is None:
+            active = self._local.timers = []
+        return active
+
+    def record_query(self, statement: str, duration: float, rows: int = 0) -> None:
+        """Add one execution of a (normalized) statement."""
+        with self._lock:
+            self.statements.setdefault(statement, Stat()).add(duration, rows)
+        self._write({"type": "query", "sql": statement, "ms": duration * 1000, "rows": rows})
+
+    def record_timer(self, name: str, duration: float, queries: int = 0) -> None:
+        """Add one call of a timed function."""
+        with self._lock:
+            self.timers.setdefault(name, Stat()).add(duration, queries=queries)
+        self._write({"type": "timer", "name": name, "ms": duration * 1000, "queries": queries})
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the body and count the statements it issues on this thread."""
+        counter = [0]
+        active = self._active_timers()
+        active.append(counter)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            # Timers on one thread nest, so this one is innermost
+            active.pop()
+            self.record_timer(name, duration, counter[0])
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if not self._tracing or self.trace_path is None:
+            return
+        record["ts"] = time.time()
+        record["thread"] = threading.current_thread().name
+        line = json.dumps(record)
+        with self._lock:
+            if self._tracing:
+                with open(self.trace_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def close(self) -> None:
+        """Stop appending to the trace file."""
+        with self._lock:
+            self._tracing = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aggregates as plain data, for JSON output."""
+        with self._lock:
+            return {
+                "timers": {name: stat.as_dict() for name, stat in self.timers.items()},
+                "statements": {sql: stat.as_dict() for sql, stat in self.statements.items()},
+            }
+
+    @classmethod
+    def from_trace(cls, path: str | Path) -> "PerfRecorder":
+        """Aggregate a trace file written by a (possibly different) process.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If a line is not a trace record
+        """
+        recorder = cls()
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    if record["type"] == "query":
+                        recorder.statements.setdefault(record["sql"], Stat()).add(record["ms"] / 1000, record["rows"])
+                    elif record["type"] == "timer":
+                        recorder.timers.setdefault(record["name"], Stat()).add(
+                            record["ms"] / 1000, queries=record["queries"]
+                        )
+                except (KeyError, TypeError, json.JSONDecodeError) as e:
+                    raise ValueError(f"{path}:{line_number}: not a trace record ({e})") from None
+        return recorder
+
+    def report(self, file: TextIO | None = None, top: int = 20) -> None:
+        """Print timers and the statements with the most total time (to stderr by default)."""
+        file = file or sys.stderr
+        with self._lock:
+            timers = sorted(self.timers.items(), key=lambda entry: entry[1].total, reverse=True)
+            statements = sorted(self.statements.items(), key=lambda entry: entry[1].total, reverse=True)
+
+        print("Timers:", file=file)
+        print(f"  {'calls':>7} {'total ms':>10} {'p95 ms':>9} {'queries/call':>12}  name", file=file)
+        for name, stat in timers:
+            print(
+                f"  {stat.count:>7} {stat.total * 1000:>10.1f} {stat.p95 * 1000:>9.2f} "
+                f"{stat.queries / stat.count:>12.1f}  {name}",
+                file=file,
+            )
+
+        shown = statements[:top]
+        print(f"Statements (top {len(shown)} of {len(statements)} by total time):", file=file)
+        print(f"  {'calls':>7} {'total ms':>10} {'p95 ms':>9} {'rows':>9}  sql", file=file)
+        for sql, stat in shown:
+            text = sql if len(sql) <= 160 else sql[:157] + "..."
+            print(f"  {stat.count:>7} {stat.total * 1000:>10.1f} {stat.p95 * 1000:>9.2f} {stat.rows:>9}  {text}", file=file)
+
+
+# Global recorder, None while instrumentation is disabled
+_recorder: PerfRecorder | None = None
+
+
+def enable(trace_path: str | Path | None = None) -> PerfRecorder:
+    """Turn instrumentation on for engines created from now on.
+
+    Args:
+        trace_path: Optional JSON Lines file to append every measurement to
+
+    Returns:
+        The global recorder (the existing one if already enabled)
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = PerfRecorder(trace_path)
+    return _recorder
+
+
+def enable_from_environment() -> PerfRecorder | None:
+    """Enable instrumentation if NUDGE_PERF or NUDGE_PERF_TRACE is set."""
+    trace_path = os.environ.get("NUDGE_PERF_TRACE") or None
+    if trace_path or os.environ.get("NUDGE_PERF", "") not in ("", "0"):
+        return enable(trace_path)
+    return None
+
+
+def disable() -> None:
+    """Turn instrumentation off and close the trace file.
+
+    Engines already instrumented keep reporting to the old recorder.
+    """
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def get_recorder() -> PerfRecorder | None:
+    """Get the global recorder, or None while instrumentation is disabled."""
+    return _recorder
+
+
+def timed(fn: F) -> F:
+    """Decorator recording each call of fn as the timer "<module>.<function>"."""
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        recorder = _recorder
+        if recorder is None:
+            return fn(*args, **kwargs)
+        with recorder.timer(name):
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def call_timed(name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call fn, recording the call as the timer name while instrumentation is enabled."""
+    recorder = _recorder
+    if recorder is None:
+        return fn(*args, **kwargs)
+    with recorder.timer(name):
+        return fn(*args, **kwargs)
@@ -1,22 +1,240 @@
-"""Spaced repetition scheduler based on forgetting curve."""
-from datetime import datetime, timedelta
-from typing import List
+"""Spaced repetition scheduler based on forgetting curve.
 
+How a review moves a card's next review date is up to the active
+SchedulingAlgorithm: the fixed interval ladder (the default), SM-2 or FSRS,
+implemented on NumPy arrays in nudge.core.algorithms. That module is only
+imported when a review is recorded or the algorithm changes, so listing and
+counting items does not load NumPy.
+"""
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, Select, SQLColumnExpression, String, case, cast, func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from nudge.core.models import Item, ReviewSchedule
+from nudge.core.events import get_change_bus
+from nudge.core.models import Item, ReviewSchedule, Setting, Tag, item_tags
+from nudge.core.perf import timed
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+    from nudge.core.algorithms import CardBatch
 
 # Forgetting curve intervals in days
 INTERVALS: List[int] = [1, 3, 7, 14, 30, 60, 120]
 
+# Keep IN (...) lists below SQLite's historical limit of 999 bound parameters
+IN_CLAUSE_BATCH = 900
+
+# Rows fetched from the cursor at a time by the streaming queries
+_YIELD_PER = 500
+
+# Schedules rescheduled per batch when switching algorithms
+_RESCHEDULE_CHUNK = 50000
+
+# How reschedule_all places cards on a new interval ladder
+RESCHEDULE_POLICIES = ("nearest", "index", "keep-dates")
+
+# Setting holding the active algorithm as {"name": ..., "params": {...}}
+ALGORITHM_SETTING = "scheduler"
+
+# Setting holding the interval ladder set by reschedule_all, as a JSON list of days
+INTERVALS_SETTING = "intervals"
+
+# Keyset cursor over the due queue: (next_review_date, schedule id) of the last row seen
+ScheduleCursor = Tuple[datetime, int]
+
+
+class ScheduledItem(NamedTuple):
+    """Compact read-only view of an item and its schedule, read without ORM objects."""
+    
+    id: int
+    name: str
+    tag_ids: Tuple[int, ...]
+    date_added: datetime
+    next_review_date: datetime
+    last_review_date: datetime | None
+    interval_index: int
+    review_count: int
+    schedule_id: int
+    
+    @property
+    def cursor(self) -> ScheduleCursor:
+        """Keyset cursor for continuing after this row."""
+        return (self.next_review_date, self.schedule_id)
+
+
+class Grade(IntEnum):
+    """How well an item was recalled at a review."""
+    
+    AGAIN = 1
+    HARD = 2
+    GOOD = 3
+    EASY = 4
+
+
+class SchedulingAlgorithm:
+    """Strategy deciding when each card is reviewed next.
+    
+    Implementations work on whole CardBatch arrays (see nudge.core.algorithms)
+    and return a new batch rather than changing the one passed in. The
+    keyword arguments given to the constructor are the algorithm's tunable
+    parameters; they are stored with its name so the same instance can be
+    recreated with make_algorithm.
+    """
+    
+    name = ""
+    
+    def __init__(self, **params: Any):
+        self.params: Dict[str, Any] = params
+        # The collection's interval ladder; get_algorithm sets the stored one
+        self.intervals: List[int] = list(INTERVALS)
+    
+    def review(self, cards: "CardBatch", grades: "ArrayLike", reviewed_at: datetime) -> "CardBatch":
+        """Apply one review to every card.
+        
+        Args:
+            cards: Cards being reviewed
+            grades: One Grade for all cards, or an array with one per card
+            reviewed_at: Time of the reviews
+            
+        Returns:
+            The cards with their new state and next review date
+        """
+        raise NotImplementedError
+    
+    def adopt(self, cards: "CardBatch", now: datetime) -> "CardBatch":
+        """Take over cards scheduled by another algorithm or other parameters.
+        
+        Args:
+            cards: Cards to reschedule
+            now: Current time
+            
+        Returns:
+            The cards with any missing state filled in and their next review
+            date recomputed where this algorithm would schedule it differently
+        """
+        raise NotImplementedError
+    
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}({self.params})>"
+
 
-def mark_as_reviewed(session: Session, item_id: int, reviewed_at: datetime | None = None) -> ReviewSchedule:
-    """Mark an item as reviewed and advance to next interval.
+def make_algorithm(name: str, params: Dict[str, Any] | None = None) -> SchedulingAlgorithm:
+    """Create a scheduling algorithm by name.
+    
+    Args:
+        name: "fixed", "sm2" or "fsrs"
+        params: Optional constructor parameters
+        
+    Returns:
+        New SchedulingAlgorithm
+        
+    Raises:
+        ValueError: If the name or a parameter is unknown or invalid
+    """
+    from nudge.core.algorithms import ALGORITHMS
+    
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown scheduling algorithm '{name}' (choose from {', '.join(ALGORITHMS)})")
+    try:
+        return ALGORITHMS[name](**(params or {}))
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for {name}: {e}") from None
+
+
+def get_intervals(session: Session) -> List[int]:
+    """Get the collection's interval ladder (INTERVALS unless reschedule_all set another).
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        Interval ladder in days
+    """
+    setting = session.get(Setting, INTERVALS_SETTING)
+    if setting is None:
+        return list(INTERVALS)
+    intervals: List[int] = json.loads(setting.value)
+    return intervals
+
+
+def get_algorithm(session: Session) -> SchedulingAlgorithm:
+    """Get the active scheduling algorithm (the fixed ladder unless another was set).
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        SchedulingAlgorithm instance, using the collection's interval ladder
+    """
+    setting = session.get(Setting, ALGORITHM_SETTING)
+    if setting is None:
+        algorithm = make_algorithm("fixed")
+    else:
+        config = json.loads(setting.value)
+        algorithm = make_algorithm(config["name"], config.get("params"))
+    algorithm.intervals = get_intervals(session)
+    return algorithm
+
+
+@timed
+def set_algorithm(session: Session, algorithm: SchedulingAlgorithm, now: datetime | None = None) -> int:
+    """Make algorithm the active one and reschedule every card for it.
+    
+    Cards are read in batches of plain rows, adopted with array operations
+    and only the ones that changed are written back, so switching or
+    retuning the algorithm costs a few seconds on hundreds of thousands of
+    cards. Everything happens in one transaction.
+    
+    Args:
+        session: Database session
+        algorithm: The new algorithm, with its parameters
+        now: Optional current time (defaults to now)
+        
+    Returns:
+        Number of schedules changed
+    """
+    from nudge.core.algorithms import iter_card_chunks, store_cards
+    
+    if now is None:
+        now = datetime.now()
+    
+    algorithm.intervals = get_intervals(session)
+    changed_ids: List[int] = []
+    try:
+        for cards in iter_card_chunks(session, _RESCHEDULE_CHUNK):
+            adopted = algorithm.adopt(cards, now)
+            changed = adopted.take(adopted.changed_from(cards))
+            store_cards(session, changed, algorithm.intervals)
+            changed_ids.extend(changed.item_ids.tolist())
+        
+        value = json.dumps({"name": algorithm.name, "params": algorithm.params})
+        session.merge(Setting(key=ALGORITHM_SETTING, value=value))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    
+    get_change_bus().publish(updated=changed_ids)
+    return len(changed_ids)
+
+
+@timed
+def mark_as_reviewed(
+    session: Session, item_id: int, reviewed_at: datetime | None = None, grade: Grade = Grade.GOOD
+) -> ReviewSchedule:
+    """Mark an item as reviewed and schedule its next review.
     
     Args:
         session: Database session
         item_id: ID of the item being reviewed
         reviewed_at: Optional datetime of review (defaults to now)
+        grade: How well the item was recalled (Good advances one interval on the fixed ladder)
         
     Returns:
         Updated ReviewSchedule object
@@ -24,47 +242,91 @@ def mark_as_reviewed(session: Session, item_id: int, reviewed_at: datetime | Non
     Raises:
         ValueError: If item or schedule not found
     """
-    if reviewed_at is None:
-        reviewed_at = datetime.now()
+    mark_many_reviewed(session, [item_id], reviewed_at, grade)
+    # The update bypasses the ORM; reload a copy already in the identity map (expire_on_commit=False)
+    return (
+        session.query(ReviewSchedule)
+        .filter_by(item_id=item_id)
+        .execution_options(populate_existing=True)
+        .one()
+    )
+
+
+@timed
+def mark_many_reviewed(
+    session: Session,
+    item_ids: Iterable[int],
+    reviewed_at: datetime | None = None,
+    grade: Grade = Grade.GOOD,
+) -> int:
+    """Mark many items as reviewed in one transaction.
     
-    # Get the review schedule
-    schedule = session.query(ReviewSchedule).filter_by(item_id=item_id).first()
-    if schedule is None:
-        raise ValueError(f"No review schedule found for item {item_id}")
+    The schedules are read as arrays (per batch of ids), rescheduled by the
+    active algorithm in one vectorized step and written back with a single
+    executemany UPDATE, and each review is appended to the review log (see
+    nudge.core.history); the transaction is committed once. Either every
+    item is updated and logged or none is.
     
-    # Advance to next interval (capped at last interval)
-    new_interval_index = min(schedule.current_interval_index + 1, len(INTERVALS) - 1)
-    next_interval_days = INTERVALS[new_interval_index]
-    next_review_date = reviewed_at + timedelta(days=next_interval_days)
+    Args:
+        session: Database session
+        item_ids: IDs of the items being reviewed
+        reviewed_at: Optional datetime of review (defaults to now)
+        grade: How well the items were recalled
+        
+    Returns:
+        Number of schedules updated
+        
+    Raises:
+        ValueError: If any item has no review schedule
+    """
+    from nudge.core.algorithms import load_cards, store_cards
+    from nudge.core.history import log_reviews
     
-    # Determine status
-    new_status = "mastered" if new_interval_index == len(INTERVALS) - 1 else "learning"
+    if reviewed_at is None:
+        reviewed_at = datetime.now()
     
-    # Update schedule
-    schedule.current_interval_index = new_interval_index
-    schedule.review_count += 1
-    schedule.last_review_date = reviewed_at
-    schedule.next_review_date = next_review_date
-    schedule.status = new_status
+    ids = sorted(set(item_ids))
+    if not ids:
+        return 0
     
-    session.commit()
-    session.refresh(schedule)
+    updated = 0
+    missing: List[int] = []
+    try:
+        algorithm = get_algorithm(session)
+        for start in range(0, len(ids), IN_CLAUSE_BATCH):
+            batch = ids[start:start + IN_CLAUSE_BATCH]
+            cards = load_cards(session, batch)
+            if len(cards) != len(batch):
+                found = set(cards.item_ids.tolist())
+                missing.extend(item_id for item_id in batch if item_id not in found)
+            reviewed = algorithm.review(cards, Grade(grade), reviewed_at)
+            updated += store_cards(session, reviewed, algorithm.intervals)
+            log_reviews(session, reviewed, grade)
+        
+        if missing:
+            raise ValueError(f"No review schedule found for items {missing}")
+        
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
     
-    return schedule
+    get_change_bus().publish(updated=ids)
+    return updated
 
 
-def create_review_schedule(session: Session, item: Item) -> ReviewSchedule:
-    """Create a new review schedule for an item.
+def new_review_schedule(session: Session, item: Item) -> ReviewSchedule:
+    """Add a first review schedule for an item to the session (not committed).
     
     Args:
         session: Database session
-        item: Item to create schedule for
+        item: Item to schedule, already flushed so it has an id
         
     Returns:
         New ReviewSchedule object
     """
     # Start with first interval
-    next_review_date = datetime.now() + timedelta(days=INTERVALS[0])
+    next_review_date = datetime.now() + timedelta(days=get_intervals(session)[0])
     
     schedule = ReviewSchedule(
         item_id=item.id,
@@ -74,14 +336,30 @@ def create_review_schedule(session: Session, item: Item) -> ReviewSchedule:
         next_review_date=next_review_date,
         status="learning"
     )
-    
     session.add(schedule)
+    return schedule
+
+
+@timed
+def create_review_schedule(session: Session, item: Item) -> ReviewSchedule:
+    """Create a new review schedule for an item.
+    
+    Args:
+        session: Database session
+        item: Item to create schedule for
+        
+    Returns:
+        New ReviewSchedule object
+    """
+    schedule = new_review_schedule(session, item)
     session.commit()
+    get_change_bus().publish(updated=[item.id])
     session.refresh(schedule)
     
     return schedule
 
 
+@timed
 def get_due_items(session: Session, days_ahead: int = 0) -> List[Item]:
     """Get items due for review.
     
@@ -104,6 +382,7 @@ def get_due_items(session: Session, days_ahead: int = 0) -> List[Item]:
     return [schedule.item for schedule in schedules]
 
 
+@timed
 def get_upcoming_items(session: Session, days_ahead: int = 7) -> List[Item]:
     """Get items due within the next N days.
     
@@ -128,17 +407,410 @@ def get_upcoming_items(session: Session, days_ahead: int = 7) -> List[Item]:
     return [schedule.item for schedule in schedules]
 
 
-def get_interval_name(interval_index: int) -> str:
+
+def _scheduled_select() -> Select:
+    """SELECT of the ScheduledItem columns, items joined to their schedules."""
+    tag_ids = (
+        select(func.group_concat(item_tags.c.tag_id, ","))
+        .where(item_tags.c.item_id == Item.id)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Item.id,
+            Item.name,
+            tag_ids,
+            Item.date_added,
+            ReviewSchedule.next_review_date,
+            ReviewSchedule.last_review_date,
+            ReviewSchedule.current_interval_index,
+            ReviewSchedule.review_count,
+            ReviewSchedule.id,
+        )
+        .join(Item, Item.id == ReviewSchedule.item_id)
+        .execution_options(yield_per=_YIELD_PER)
+    )
+
+
+def _scheduled_rows(session: Session, statement: Select) -> Iterator[ScheduledItem]:
+    for row in session.execute(statement):
+        tags = tuple(int(tag_id) for tag_id in row[2].split(",")) if row[2] else ()
+        yield ScheduledItem(row[0], row[1], tags, *row[3:])
+
+
+def _iter_scheduled(
+    session: Session,
+    start: datetime | None,
+    end: datetime,
+    limit: int | None,
+    after: ScheduleCursor | None,
+) -> Iterator[ScheduledItem]:
+    """Stream ScheduledItems with start <= next_review_date <= end in (date, schedule id) order."""
+    statement = (
+        _scheduled_select()
+        .where(ReviewSchedule.next_review_date <= end)
+        # The schedule id is the rowid of the next_review_date index entries, so this order needs no sort
+        .order_by(ReviewSchedule.next_review_date, ReviewSchedule.id)
+    )
+    if start is not None:
+        statement = statement.where(ReviewSchedule.next_review_date >= start)
+    if after is not None:
+        statement = statement.where(tuple_(ReviewSchedule.next_review_date, ReviewSchedule.id) > tuple_(*after))
+    if limit is not None:
+        statement = statement.limit(limit)
+    
+    yield from _scheduled_rows(session, statement)
+
+
+def iter_items(session: Session, limit: int | None = None, after: int | None = None) -> Iterator[ScheduledItem]:
+    """Stream every item with its schedule in item id order, in constant memory.
+    
+    Args:
+        session: Database session
+        limit: Optional maximum number of rows
+        after: Optional id of the last item already seen
+        
+    Yields:
+        ScheduledItem for each item
+    """
+    statement = _scheduled_select().order_by(Item.id)
+    if after is not None:
+        statement = statement.where(Item.id > after)
+    if limit is not None:
+        statement = statement.limit(limit)
+    yield from _scheduled_rows(session, statement)
+
+
+def get_scheduled_item(session: Session, item_id: int) -> ScheduledItem | None:
+    """Get one item with its schedule as a ScheduledItem, or None if it does not exist."""
+    rows = list(_scheduled_rows(session, _scheduled_select().where(Item.id == item_id)))
+    return rows[0] if rows else None
+
+
+def iter_due_items(
+    session: Session,
+    days_ahead: int = 0,
+    limit: int | None = None,
+    after: ScheduleCursor | None = None,
+) -> Iterator[ScheduledItem]:
+    """Stream the items due for review, most overdue first, in constant memory.
+    
+    Rows are fetched from the cursor in batches and returned as ScheduledItem
+    tuples; no ORM objects are created. To page through the queue, pass the
+    ``cursor`` of the last row of one page as ``after`` for the next; pages
+    stay consistent while items are reviewed in between, since a reviewed
+    item moves past the end of the queue.
+    
+    Args:
+        session: Database session
+        days_ahead: Number of days ahead to look (0 = due now only)
+        limit: Optional maximum number of rows
+        after: Optional cursor of the last row already seen
+        
+    Yields:
+        ScheduledItem for each due item
+    """
+    cutoff_date = datetime.now() + timedelta(days=days_ahead)
+    yield from _iter_scheduled(session, None, cutoff_date, limit, after)
+
+
+def iter_upcoming_items(
+    session: Session,
+    days_ahead: int = 7,
+    limit: int | None = None,
+    after: ScheduleCursor | None = None,
+) -> Iterator[ScheduledItem]:
+    """Stream the items due within the next N days, soonest first, in constant memory.
+    
+    Args:
+        session: Database session
+        days_ahead: Number of days ahead to look
+        limit: Optional maximum number of rows
+        after: Optional cursor of the last row already seen
+        
+    Yields:
+        ScheduledItem for each upcoming item
+    """
+    now = datetime.now()
+    yield from _iter_scheduled(session, now, now + timedelta(days=days_ahead), limit, after)
+
+
+@timed
+def count_due(session: Session, now: datetime | None = None) -> int:
+    """Count items due for review without loading them.
+    
+    Args:
+        session: Database session
+        now: Optional cutoff (defaults to now)
+        
+    Returns:
+        Number of schedules with a next review date at or before the cutoff
+    """
+    if now is None:
+        now = datetime.now()
+    
+    return session.scalar(
+        select(func.count()).select_from(ReviewSchedule).where(ReviewSchedule.next_review_date <= now)
+    ) or 0
+
+
+@timed
+def get_next_review_date(session: Session, after: datetime | None = None) -> datetime | None:
+    """Get the earliest next review date after a point in time.
+    
+    Answered from the next_review_date index with a single seek.
+    
+    Args:
+        session: Database session
+        after: Optional lower bound, exclusive (defaults to no bound)
+        
+    Returns:
+        Earliest next review date, or None if nothing is scheduled after it
+    """
+    statement = select(func.min(ReviewSchedule.next_review_date))
+    if after is not None:
+        statement = statement.where(ReviewSchedule.next_review_date > after)
+    return session.scalar(statement)
+
+
+@timed
+def due_histogram(session: Session, days_ahead: int = 7, today: date | None = None) -> List[Tuple[date, int]]:
+    """Count the items due on each day from today, without loading them.
+    
+    The schedules due before the end of the range are read from the
+    next_review_date index and counted per day by SQLite. Overdue items are
+    counted in today's entry.
+    
+    Args:
+        session: Database session
+        days_ahead: Number of days after today to include
+        today: Optional first day (defaults to today)
+        
+    Returns:
+        (day, item count) for today and each of the next days_ahead days, zeros included
+    """
+    if today is None:
+        today = date.today()
+    end = datetime.combine(today + timedelta(days=days_ahead + 1), datetime.min.time())
+    
+    # Two-argument max() is SQLite's scalar max; ISO dates compare as strings
+    day = func.max(func.date(ReviewSchedule.next_review_date), today.isoformat())
+    counts: Dict[str, int] = dict(
+        session.execute(
+            select(day, func.count()).where(ReviewSchedule.next_review_date < end).group_by(day)
+        ).all()
+    )
+    
+    days = [today + timedelta(days=offset) for offset in range(days_ahead + 1)]
+    return [(day, counts.get(day.isoformat(), 0)) for day in days]
+
+
+@timed
+def count_by_status(session: Session) -> List[Tuple[str, int]]:
+    """Count schedules per status, answered from the status index.
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        (status, count) for every status in use, sorted by status
+    """
+    rows = session.execute(
+        select(ReviewSchedule.status, func.count())
+        .group_by(ReviewSchedule.status)
+        .order_by(ReviewSchedule.status)
+    )
+    return list(rows)
+
+
+@timed
+def count_by_tag(session: Session, now: datetime | None = None) -> List[Tuple[str, int, int]]:
+    """Count the items with each tag, and how many of them are due.
+    
+    Args:
+        session: Database session
+        now: Optional cutoff for counting as due (defaults to now)
+        
+    Returns:
+        (tag name, item count, due count) for every tag, sorted by name
+    """
+    if now is None:
+        now = datetime.now()
+    
+    due = func.coalesce(func.sum(case((ReviewSchedule.next_review_date <= now, 1), else_=0)), 0)
+    rows = session.execute(
+        select(Tag.name, func.count(item_tags.c.item_id), due)
+        .select_from(Tag)
+        .outerjoin(item_tags, item_tags.c.tag_id == Tag.id)
+        .outerjoin(ReviewSchedule, ReviewSchedule.item_id == item_tags.c.item_id)
+        .group_by(Tag.id)
+        .order_by(Tag.name)
+    )
+    return list(rows)
+
+
+@dataclass(frozen=True)
+class RescheduleReport:
+    """Outcome (or preview) of reschedule_all."""
+    
+    changed: int
+    dry_run: bool
+    # (day, items due) from today, overdue items counted today
+    due_before: List[Tuple[date, int]]
+    due_after: List[Tuple[date, int]]
+    status_before: Dict[str, int]
+    status_after: Dict[str, int]
+    
+    @property
+    def due_shift(self) -> List[Tuple[date, int]]:
+        """Change in the number of items due on each day."""
+        return [(day, after - before) for (day, before), (_, after) in zip(self.due_before, self.due_after)]
+
+
+def _validate_intervals(intervals: Sequence[int]) -> List[int]:
+    steps = [int(days) for days in intervals]
+    if not steps or steps[0] < 1 or any(a >= b for a, b in zip(steps, steps[1:])):
+        raise ValueError(f"Intervals must be positive whole days in increasing order, got {list(intervals)}")
+    return steps
+
+
+@timed
+def reschedule_all(
+    session: Session,
+    new_intervals: Sequence[int] = INTERVALS,
+    policy: str = "nearest",
+    dry_run: bool = False,
+    days_ahead: int = 30,
+    now: datetime | None = None,
+) -> RescheduleReport:
+    """Move every schedule onto a new interval ladder with set-based UPDATEs.
+    
+    The ladder is stored as the collection's own (see get_intervals), so
+    later reviews, imports, the forecast and interval names follow it. Each
+    card's current interval is read from its own dates (next minus last
+    review), so the old ladder need not be known. Policies:
+    
+    - "nearest": move to the step closest to the current interval and
+      schedule the next review that many days after the last one
+    - "index": keep the ladder position (capped at the last step) and
+      schedule the next review for that step's interval
+    - "keep-dates": move to the nearest step but leave review dates alone
+    
+    Cards never reviewed stay where they are. Status follows the new ladder:
+    a card is mastered on its last step. The ids are updated in chunks of
+    id ranges, all in one transaction; only rows that actually change are
+    written. A dry run makes the same updates, measures them and rolls back.
+    
+    This remaps positions on the fixed ladder; cards scheduled by SM-2 or
+    FSRS are better rescheduled with set_algorithm.
+    
+    Args:
+        session: Database session
+        new_intervals: The new ladder, in days
+        policy: One of RESCHEDULE_POLICIES
+        dry_run: Report the effect without changing anything
+        days_ahead: Days after today covered by the due load in the report
+        now: Optional current time for the due load (defaults to now)
+        
+    Returns:
+        RescheduleReport with the number of schedules changed and the due
+        load and status counts before and after
+        
+    Raises:
+        ValueError: If the ladder or policy is invalid
+    """
+    steps = _validate_intervals(new_intervals)
+    if policy not in RESCHEDULE_POLICIES:
+        raise ValueError(f"Unknown reschedule policy '{policy}' (choose from {', '.join(RESCHEDULE_POLICIES)})")
+    today = (now or datetime.now()).date()
+    last_index = len(steps) - 1
+    
+    schedule = ReviewSchedule
+    reviewed = schedule.last_review_date.is_not(None)
+    current_index = func.min(schedule.current_interval_index, last_index)
+    new_index: ColumnElement[int]
+    if policy == "index":
+        new_index = current_index
+    else:
+        # Nearest step: compare the interval with the midpoints between steps
+        interval = func.julianday(schedule.next_review_date) - func.julianday(schedule.last_review_date)
+        new_index = case(
+            (~reviewed, current_index),
+            *[(interval < (low + high) / 2, index) for index, (low, high) in enumerate(zip(steps, steps[1:]))],
+            else_=last_index,
+        )
+    
+    next_review_date: SQLColumnExpression[datetime]
+    if policy == "keep-dates":
+        next_review_date = schedule.next_review_date
+    else:
+        # Date arithmetic on the whole seconds only (SQLite rounds to milliseconds); whole days
+        # leave the time of day alone, so the stored fraction of a second is appended unchanged
+        days = case(dict(enumerate(steps)), value=new_index)
+        shifted = func.strftime(
+            "%Y-%m-%d %H:%M:%S",
+            func.substr(schedule.last_review_date, 1, 19),
+            "+" + cast(days, String) + " days",
+            type_=String,
+        ).concat(func.substr(schedule.last_review_date, 20))
+        next_review_date = case((reviewed, shifted), else_=schedule.next_review_date)
+    status = case((new_index == last_index, "mastered"), else_="learning")
+    
+    due_before = due_histogram(session, days_ahead, today)
+    status_before = dict(count_by_status(session))
+    
+    changed_ids: List[int] = []
+    try:
+        low_id, high_id = session.execute(select(func.min(schedule.id), func.max(schedule.id))).one()
+        for start in range(low_id or 0, (high_id or -1) + 1, _RESCHEDULE_CHUNK):
+            # SET expressions all read the pre-update row values
+            result = session.execute(
+                update(schedule)
+                .where(schedule.id >= start, schedule.id < start + _RESCHEDULE_CHUNK)
+                .where(or_(
+                    schedule.current_interval_index != new_index,
+                    schedule.next_review_date != next_review_date,
+                    schedule.status != status,
+                ))
+                .values(current_interval_index=new_index, next_review_date=next_review_date, status=status)
+                .returning(schedule.item_id)
+                .execution_options(synchronize_session=False)
+            )
+            changed_ids.extend(result.scalars())
+        
+        report = RescheduleReport(
+            changed=len(changed_ids),
+            dry_run=dry_run,
+            due_before=due_before,
+            due_after=due_histogram(session, days_ahead, today),
+            status_before=status_before,
+            status_after=dict(count_by_status(session)),
+        )
+        if dry_run:
+            session.rollback()
+            return report
+        session.merge(Setting(key=INTERVALS_SETTING, value=json.dumps(steps)))
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    
+    get_change_bus().publish(updated=changed_ids)
+    return report
+
+
+def get_interval_name(interval_index: int, intervals: Sequence[int] = INTERVALS) -> str:
     """Get human-readable name for interval.
     
     Args:
-        interval_index: Index into INTERVALS array
+        interval_index: Index into the interval ladder
+        intervals: Interval ladder in days (see get_intervals)
         
     Returns:
         String like "1 day", "3 days", etc.
     """
-    if interval_index < 0 or interval_index >= len(INTERVALS):
+    if interval_index < 0 or interval_index >= len(intervals):
         return "Unknown"
     
-    days = INTERVALS[interval_index]
+    days = intervals[interval_index]
     return f"{days} day" if days == 1 else f"{days} days"
@@ -0,0 +1,152 @@
+"""Full-text search over item names and tag names.
+
+An FTS5 table, ``items_fts``, holds one row per item (rowid = item id) with
+the item name and its space-joined tag names. Triggers on ``items``,
+``item_tags`` and ``tags`` keep it in sync, so writers never have to
+maintain it themselves.
+"""
+import re
+from typing import List
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Connection,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
+    event,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from nudge.core.models import Base, Item, ReviewSchedule
+
+# Kept out of Base.metadata: create_all cannot emit CREATE VIRTUAL TABLE
+items_fts = Table(
+    "items_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("name", String),
+    Column("tags", String),
+)
+
+# Relative bm25 weights of the name and tags columns
+NAME_WEIGHT = 2.0
+TAGS_WEIGHT = 1.0
+
+_ITEM_TAG_NAMES = """
+(SELECT COALESCE(group_concat(tags.name, ' '), '')
+   FROM item_tags JOIN tags ON tags.id = item_tags.tag_id
+  WHERE item_tags.item_id = {item_id})
+"""
+
+SEARCH_INDEX_DDL: List[str] = [
+    # Prefix indexes make 2- and 3-character prefix queries cheap while typing
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "name, tags, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_item_insert AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts (rowid, name, tags) VALUES (new.id, new.name, ''); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_item_update AFTER UPDATE OF name ON items BEGIN "
+    "UPDATE items_fts SET name = new.name WHERE rowid = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_item_delete AFTER DELETE ON items BEGIN "
+    "DELETE FROM items_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_tag_link AFTER INSERT ON item_tags BEGIN "
+    f"UPDATE items_fts SET tags = {_ITEM_TAG_NAMES.format(item_id='new.item_id')} WHERE rowid = new.item_id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_tag_unlink AFTER DELETE ON item_tags BEGIN "
+    f"UPDATE items_fts SET tags = {_ITEM_TAG_NAMES.format(item_id='old.item_id')} WHERE rowid = old.item_id; END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_tag_rename AFTER UPDATE OF name ON tags BEGIN "
+    f"UPDATE items_fts SET tags = {_ITEM_TAG_NAMES.format(item_id='items_fts.rowid')} "
+    "WHERE rowid IN (SELECT item_id FROM item_tags WHERE tag_id = new.id); END",
+]
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the full-text table and its sync triggers if they do not exist."""
+    for statement in SEARCH_INDEX_DDL:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    """Repopulate the full-text table from items and tags."""
+    conn.exec_driver_sql("DELETE FROM items_fts")
+    conn.exec_driver_sql(
+        "INSERT INTO items_fts (rowid, name, tags) "
+        f"SELECT items.id, items.name, {_ITEM_TAG_NAMES.format(item_id='items.id')} FROM items"
+    )
+
+
+# Fresh databases get the index as part of create_all
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: create_search_index(connection))
+
+
+_PHRASE_OR_WORD = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def build_match_query(text: str) -> str:
+    """Translate user search text into an FTS5 MATCH expression.
+
+    Double-quoted text is matched as an exact phrase; every other word is
+    matched as a prefix ("pyth" finds "python"). All terms must match.
+    Punctuation outside phrases is ignored rather than treated as FTS5 syntax.
+
+    Args:
+        text: Raw search box text
+
+    Returns:
+        MATCH expression, or an empty string if text has no searchable terms
+    """
+    terms = []
+    for phrase, word in _PHRASE_OR_WORD.findall(text):
+        if phrase:
+            if _WORD.search(phrase):
+                terms.append(_quote(phrase))
+        else:
+            terms.extend(_quote(token) + "*" for token in _WORD.findall(word))
+    return " AND ".join(terms)
+
+
+def _matches(match_query: str) -> ColumnElement[bool]:
+    return literal_column("items_fts").op("MATCH")(match_query)
+
+
+def match_item_ids(match_query: str) -> Select:
+    """Subquery of item ids matching an FTS5 MATCH expression."""
+    return select(items_fts.c.rowid).where(_matches(match_query))
+
+
+def search_items(session: Session, query: str, limit: int = 50, offset: int = 0) -> List[Item]:
+    """Search items by name and tag names.
+
+    Args:
+        session: Database session
+        query: Search text; words match as prefixes, "quoted text" as a phrase
+        limit: Maximum number of items to return
+        offset: Number of ranked results to skip
+
+    Returns:
+        Matching items, best bm25 rank first, then by next review date
+    """
+    match_query = build_match_query(query)
+    if not match_query:
+        return []
+
+    statement = (
+        select(Item)
+        .join(items_fts, items_fts.c.rowid == Item.id)
+        .join(ReviewSchedule, ReviewSchedule.item_id == Item.id)
+        .where(_matches(match_query))
+        .order_by(func.bm25(literal_column("items_fts"), NAME_WEIGHT, TAGS_WEIGHT), ReviewSchedule.next_review_date)
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(session.scalars(statement))
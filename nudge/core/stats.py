@@ -0,0 +1,233 @@
+"""Collection statistics kept in summary tables.
+
+The dashboard counts (items per status, interval index and tag, reviews per
+day, overdue items) are read from small summary tables instead of being
+recomputed from every schedule. Triggers on ``review_schedules``,
+``item_tags``, ``tags`` and ``review_log`` keep the tables up to date in the
+same transaction as each insert, review and delete, whichever process or
+code path wrote it (the ORM, the vectorized review and reschedule
+UPDATEs, imports), so reading the dashboard costs the same however large
+the collection is.
+
+    stats_schedules    (status, interval_index) -> item_count
+    stats_due_days     next review day ('YYYY-MM-DD') -> item_count
+    stats_tags         tag id -> item_count
+    stats_review_days  review day (review_log.ts // 86400) -> review_count
+
+Rows whose count drops to zero are kept until the next rebuild_stats,
+which recomputes every table from scratch (``nudge stats --rebuild``).
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Column, Connection, Integer, MetaData, String, Table, event, func, select
+from sqlalchemy.orm import Session
+
+from nudge.core.history import SECONDS_PER_DAY, day_number
+from nudge.core.models import Base, ReviewSchedule, Tag
+from nudge.core.perf import timed
+from nudge.core.scheduler import get_intervals
+
+# Kept out of Base.metadata: the tables belong to their triggers, created together below
+_metadata = MetaData()
+stats_schedules = Table(
+    "stats_schedules",
+    _metadata,
+    Column("status", String, primary_key=True),
+    Column("interval_index", Integer, primary_key=True),
+    Column("item_count", Integer),
+)
+stats_due_days = Table("stats_due_days", _metadata, Column("day", String, primary_key=True), Column("item_count", Integer))
+stats_tags = Table("stats_tags", _metadata, Column("tag_id", Integer, primary_key=True), Column("item_count", Integer))
+stats_review_days = Table(
+    "stats_review_days", _metadata, Column("day", Integer, primary_key=True), Column("review_count", Integer)
+)
+
+DEFAULT_REVIEW_DAYS = 30
+
+
+def _count(table: str, keys: List[Tuple[str, str]], count: str, delta: int) -> str:
+    """Trigger statement adding delta to the row of table whose key columns equal the given expressions."""
+    if delta < 0:
+        # The row exists: it was counted when the old value was written
+        condition = " AND ".join(f"{column} = {value}" for column, value in keys)
+        return f"UPDATE {table} SET {count} = {count} - {-delta} WHERE {condition};"
+    columns = ", ".join(column for column, _ in keys)
+    values = ", ".join(value for _, value in keys)
+    return (
+        f"INSERT INTO {table} ({columns}, {count}) VALUES ({values}, {delta}) "
+        f"ON CONFLICT ({columns}) DO UPDATE SET {count} = {count} + {delta};"
+    )
+
+
+def _schedule(row: str, delta: int) -> str:
+    keys = [("status", f"{row}.status"), ("interval_index", f"{row}.current_interval_index")]
+    return _count("stats_schedules", keys, "item_count", delta)
+
+
+def _due_day(row: str, delta: int) -> str:
+    return _count("stats_due_days", [("day", f"substr({row}.next_review_date, 1, 10)")], "item_count", delta)
+
+
+def _tag(row: str, delta: int) -> str:
+    return _count("stats_tags", [("tag_id", f"{row}.tag_id")], "item_count", delta)
+
+
+def _review_day(row: str, delta: int) -> str:
+    return _count("stats_review_days", [("day", f"{row}.ts / {SECONDS_PER_DAY}")], "review_count", delta)
+
+
+STATS_DDL: List[str] = [
+    "CREATE TABLE IF NOT EXISTS stats_schedules ("
+    "status VARCHAR NOT NULL, interval_index INTEGER NOT NULL, item_count INTEGER NOT NULL, "
+    "PRIMARY KEY (status, interval_index)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS stats_due_days (day VARCHAR PRIMARY KEY, item_count INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS stats_tags (tag_id INTEGER PRIMARY KEY, item_count INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS stats_review_days (day INTEGER PRIMARY KEY, review_count INTEGER NOT NULL)",
+    "CREATE TRIGGER IF NOT EXISTS stats_schedule_insert AFTER INSERT ON review_schedules BEGIN "
+    f"{_schedule('new', 1)} {_due_day('new', 1)} END",
+    "CREATE TRIGGER IF NOT EXISTS stats_schedule_delete AFTER DELETE ON review_schedules BEGIN "
+    f"{_schedule('old', -1)} {_due_day('old', -1)} END",
+    # Reviews rewrite every column; only count the rows whose bucket actually moved
+    "CREATE TRIGGER IF NOT EXISTS stats_schedule_update AFTER UPDATE OF status, current_interval_index "
+    "ON review_schedules WHEN old.status IS NOT new.status "
+    "OR old.current_interval_index IS NOT new.current_interval_index BEGIN "
+    f"{_schedule('old', -1)} {_schedule('new', 1)} END",
+    "CREATE TRIGGER IF NOT EXISTS stats_due_day_update AFTER UPDATE OF next_review_date ON review_schedules "
+    "WHEN substr(old.next_review_date, 1, 10) IS NOT substr(new.next_review_date, 1, 10) BEGIN "
+    f"{_due_day('old', -1)} {_due_day('new', 1)} END",
+    f"CREATE TRIGGER IF NOT EXISTS stats_tag_link AFTER INSERT ON item_tags BEGIN {_tag('new', 1)} END",
+    f"CREATE TRIGGER IF NOT EXISTS stats_tag_unlink AFTER DELETE ON item_tags BEGIN {_tag('old', -1)} END",
+    "CREATE TRIGGER IF NOT EXISTS stats_tag_delete AFTER DELETE ON tags BEGIN "
+    "DELETE FROM stats_tags WHERE tag_id = old.id; END",
+    # review_log rows are only inserted or deleted with their item
+    f"CREATE TRIGGER IF NOT EXISTS stats_review_insert AFTER INSERT ON review_log BEGIN {_review_day('new', 1)} END",
+    f"CREATE TRIGGER IF NOT EXISTS stats_review_delete AFTER DELETE ON review_log BEGIN {_review_day('old', -1)} END",
+]
+
+
+def create_stats_tables(conn: Connection) -> None:
+    """Create the summary tables and their triggers if they do not exist."""
+    for statement in STATS_DDL:
+        conn.exec_driver_sql(statement)
+
+
+def rebuild_stats(conn: Connection) -> None:
+    """Recompute every summary table from the schedules, tag links and review log."""
+    for table in ("stats_schedules", "stats_due_days", "stats_tags", "stats_review_days"):
+        conn.exec_driver_sql(f"DELETE FROM {table}")
+    conn.exec_driver_sql(
+        "INSERT INTO stats_schedules SELECT status, current_interval_index, count(*) "
+        "FROM review_schedules GROUP BY status, current_interval_index"
+    )
+    conn.exec_driver_sql(
+        "INSERT INTO stats_due_days SELECT substr(next_review_date, 1, 10) AS day, count(*) "
+        "FROM review_schedules GROUP BY day"
+    )
+    conn.exec_driver_sql("INSERT INTO stats_tags SELECT tag_id, count(*) FROM item_tags GROUP BY tag_id")
+    conn.exec_driver_sql(
+        f"INSERT INTO stats_review_days SELECT ts / {SECONDS_PER_DAY} AS day, count(*) FROM review_log GROUP BY day"
+    )
+
+
+# Fresh databases get the tables as part of create_all
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: create_stats_tables(connection))
+
+
+@dataclass(frozen=True)
+class Dashboard:
+    """Collection statistics at one point in time."""
+
+    items: int
+    by_status: Dict[str, int]
+    # (interval index, items) for every index with items, ascending
+    by_interval: List[Tuple[int, int]]
+    # (tag name, items) for every tag, sorted by name
+    by_tag: List[Tuple[str, int]]
+    # (day, reviews) for the last days, oldest first
+    reviews_per_day: List[Tuple[date, int]]
+    # Items whose next review is due now
+    overdue: int
+    # The interval ladder the indexes of by_interval refer to
+    intervals: List[int]
+
+
+@timed
+def count_overdue(session: Session, now: datetime | None = None) -> int:
+    """Count the items due for review, from the per-day summary.
+
+    Whole days before today come from stats_due_days; only today's items
+    are counted from the schedules (an index range bounded by one day).
+
+    Args:
+        session: Database session
+        now: Optional cutoff (defaults to now)
+
+    Returns:
+        Number of schedules with next_review_date <= now
+    """
+    if now is None:
+        now = datetime.now()
+
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    before_today = session.scalar(
+        select(func.coalesce(func.sum(stats_due_days.c.item_count), 0)).where(stats_due_days.c.day < now.date().isoformat())
+    )
+    today = session.scalar(
+        select(func.count())
+        .select_from(ReviewSchedule)
+        .where(ReviewSchedule.next_review_date >= midnight, ReviewSchedule.next_review_date <= now)
+    )
+    return (before_today or 0) + (today or 0)
+
+
+@timed
+def get_dashboard(session: Session, review_days: int = DEFAULT_REVIEW_DAYS, now: datetime | None = None) -> Dashboard:
+    """Read the dashboard from the summary tables.
+
+    Args:
+        session: Database session
+        review_days: Number of days of reviews to include, ending today
+        now: Optional current time (defaults to now)
+
+    Returns:
+        Dashboard
+    """
+    if now is None:
+        now = datetime.now()
+
+    by_status: Dict[str, int] = {}
+    by_interval: Dict[int, int] = {}
+    rows = session.execute(select(stats_schedules).where(stats_schedules.c.item_count > 0))
+    for status, interval_index, count in rows:
+        by_status[status] = by_status.get(status, 0) + count
+        by_interval[interval_index] = by_interval.get(interval_index, 0) + count
+
+    by_tag = session.execute(
+        select(Tag.name, func.coalesce(stats_tags.c.item_count, 0))
+        .select_from(Tag)
+        .outerjoin(stats_tags, stats_tags.c.tag_id == Tag.id)
+        .order_by(Tag.name)
+    )
+
+    first = now.date() - timedelta(days=review_days - 1)
+    rows = session.execute(
+        select(stats_review_days.c.day, stats_review_days.c.review_count).where(
+            stats_review_days.c.day.between(day_number(first), day_number(now.date()))
+        )
+    )
+    reviews: Dict[int, int] = dict(rows.all())
+
+    return Dashboard(
+        items=sum(by_status.values()),
+        by_status=by_status,
+        by_interval=sorted(by_interval.items()),
+        by_tag=list(by_tag),
+        reviews_per_day=[
+            (first + timedelta(days=offset), reviews.get(day_number(first) + offset, 0))
+            for offset in range(review_days)
+        ],
+        overdue=count_overdue(session, now),
+        intervals=get_intervals(session),
+    )
@@ -0,0 +1,194 @@
+"""Tag colors and helpers shared by the UI and non-GUI code paths."""
+import random
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from sqlalchemy import Connection, Engine, insert, select
+from sqlalchemy.orm import Session
+
+from nudge.core.events import ChangeBus, ItemChanges, get_change_bus
+from nudge.core.models import Tag
+from nudge.core.perf import timed
+from nudge.core.scheduler import IN_CLAUSE_BATCH
+
+# Material Design color palette
+PRESET_COLORS = [
+    "#FF6B6B",  # Red
+    "#4ECDC4",  # Teal
+    "#45B7D1",  # Blue
+    "#FFA07A",  # Orange
+    "#98D8C8",  # Mint
+    "#F7DC6F",  # Yellow
+    "#BB8FCE",  # Purple
+    "#85C1E2",  # Light Blue
+    "#F8B88B",  # Peach
+    "#52BE80",  # Green
+]
+
+
+def get_or_create_tag_color(tag_name: str, existing_tags: Dict[str, str]) -> str:
+    """Get color for a tag or create a random one.
+    
+    Args:
+        tag_name: Name of the tag
+        existing_tags: Dictionary of {tag_name: color}
+        
+    Returns:
+        Hex color code
+    """
+    if tag_name in existing_tags:
+        return existing_tags[tag_name]
+    return random.choice(PRESET_COLORS)
+
+
+class TagInfo(NamedTuple):
+    """Cached identity and color of a tag."""
+
+    id: int
+    name: str
+    color: str
+
+
+class TagRegistry:
+    """Process-wide cache of tag names to ids and colors.
+    
+    Names are resolved from the cache first; the rest are looked up with a
+    set-based ``IN`` query and any still missing are inserted in one
+    executemany, so handling tags costs O(new tags) rather than a query per
+    tag. Only committed tags are cached: tags inserted by ``resolve`` are
+    picked up from the change bus once their writer publishes them, and any
+    tag id on the bus invalidates the cached entry. The cache belongs to one
+    database; a session bound to a different engine starts it afresh.
+    """
+    
+    def __init__(self, bus: ChangeBus | None = None):
+        self._lock = threading.Lock()
+        self._tags: Dict[str, TagInfo] = {}
+        # Whether _tags holds every tag in the database
+        self._complete = False
+        # Ids inserted by resolve() that have not been published as committed yet
+        self._uncommitted: Set[int] = set()
+        # Engine the cached tags were read from
+        self._bind: Engine | Connection | None = None
+        (bus or get_change_bus()).subscribe(self._on_changes)
+    
+    def _on_changes(self, changes: ItemChanges) -> None:
+        if changes.tags:
+            with self._lock:
+                self._uncommitted -= changes.tags
+            self.invalidate(changes.tags)
+    
+    def invalidate(self, tag_ids: Iterable[int] | None = None) -> None:
+        """Drop cached tags.
+        
+        Args:
+            tag_ids: Ids of the tags to drop (defaults to all of them)
+        """
+        with self._lock:
+            if tag_ids is None:
+                self._tags = {}
+            else:
+                dropped = set(tag_ids)
+                self._tags = {name: tag for name, tag in self._tags.items() if tag.id not in dropped}
+            self._complete = False
+    
+    def _use_bind(self, session: Session) -> None:
+        """Drop the cache if session is bound to a different database than it was read from."""
+        bind = session.get_bind()
+        with self._lock:
+            if bind is not self._bind:
+                self._bind = bind
+                self._tags = {}
+                self._complete = False
+                self._uncommitted = set()
+    
+    def get_tags(self, session: Session) -> List[TagInfo]:
+        """Get every tag, sorted by name.
+        
+        Loads the (id, name, color) columns of all tags on first use or after
+        an invalidation, without touching their items.
+        
+        Args:
+            session: Database session
+            
+        Returns:
+            List of TagInfo
+        """
+        self._use_bind(session)
+        with self._lock:
+            if self._complete:
+                return sorted(self._tags.values(), key=lambda tag: tag.name)
+        
+        tags = [TagInfo(*row) for row in session.execute(select(Tag.id, Tag.name, Tag.color))]
+        with self._lock:
+            self._tags = {tag.name: tag for tag in tags}
+            self._complete = True
+        return sorted(tags, key=lambda tag: tag.name)
+    
+    @timed
+    def resolve(self, session: Session, names: Iterable[str]) -> Tuple[Dict[str, TagInfo], List[int]]:
+        """Map tag names to tags, inserting the ones that do not exist yet.
+        
+        New tags get a random preset color. The caller owns the transaction
+        and should publish the created ids on the change bus after committing.
+        
+        Args:
+            session: Database session
+            names: Tag names to resolve
+            
+        Returns:
+            Tuple of ({tag_name: TagInfo}, ids of the tags created)
+        """
+        self._use_bind(session)
+        resolved: Dict[str, TagInfo] = {}
+        pending = []
+        with self._lock:
+            for name in sorted(set(names)):
+                tag = self._tags.get(name)
+                if tag is None:
+                    pending.append(name)
+                else:
+                    resolved[name] = tag
+        
+        found: List[TagInfo] = []
+        for start in range(0, len(pending), IN_CLAUSE_BATCH):
+            batch = pending[start:start + IN_CLAUSE_BATCH]
+            found.extend(TagInfo(*row) for row in session.execute(
+                select(Tag.id, Tag.name, Tag.color).where(Tag.name.in_(batch))
+            ))
+        resolved.update((tag.name, tag) for tag in found)
+        with self._lock:
+            # A tag created earlier in a transaction that may still roll back is not cached
+            self._tags.update((tag.name, tag) for tag in found if tag.id not in self._uncommitted)
+        
+        missing = [name for name in pending if name not in resolved]
+        created: List[int] = []
+        if missing:
+            rows = session.execute(
+                # Rows are matched up by name, so one multi-row INSERT in any order will do
+                insert(Tag).returning(Tag.id, Tag.name, Tag.color),
+                [{"name": name, "color": get_or_create_tag_color(name, {})} for name in missing],
+            )
+            for row in rows:
+                tag = TagInfo(*row)
+                resolved[tag.name] = tag
+                created.append(tag.id)
+            with self._lock:
+                self._uncommitted.update(created)
+        return resolved, created
+
+
+# Global registry instance
+_registry_instance: TagRegistry | None = None
+
+
+def get_tag_registry() -> TagRegistry:
+    """Get or create the global tag registry.
+    
+    Returns:
+        TagRegistry instance
+    """
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = TagRegistry()
+    return _registry_instance
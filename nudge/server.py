@@ -0,0 +1,491 @@
+"""Local HTTP/JSON API over the scheduler (``nudge serve``).
+
+Endpoints (all JSON):
+
+    GET    /items?limit=&after=           items in id order
+    POST   /items                         {"name": ..., "tags": [...]} -> the new item
+    GET    /items/<id>
+    DELETE /items/<id>
+    POST   /items/<id>/review             {"grade": "good"} -> the item after the review
+    POST   /review                        {"ids": [...], "grade": "good"} -> {"updated": n}
+    GET    /tags
+    GET    /due?days=&limit=&after=       items due for review, most overdue first
+    GET    /upcoming?days=&limit=&after=  items due in the next days, soonest first
+
+List responses are keyset-paginated: ``{"items": [...], "next": cursor}``,
+where ``next`` is passed back as ``after`` for the following page and is
+null on the last one.
+
+Each request checks a session out of the engine's connection pool for its
+own use and returns it when done. The due and upcoming queues carry an
+ETag, which changes whenever any connection or process commits to the
+database (SQLite's data_version, watched on one dedicated connection) or
+the clock passes the next review date that would change the queue. The
+server remembers the tag and encoded body of recent queue pages until
+then: a request whose If-None-Match still matches is answered with 304,
+and a repeated request with the same body, neither running the query.
+
+The server binds to localhost by default and has no authentication.
+"""
+import hashlib
+import json
+import re
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy.orm import Session
+
+from nudge.core.database import Database
+from nudge.core.events import ItemChanges, get_change_bus
+from nudge.core.items import create_item, delete_item
+from nudge.core.scheduler import (
+    Grade,
+    ScheduleCursor,
+    ScheduledItem,
+    get_next_review_date,
+    get_scheduled_item,
+    iter_due_items,
+    iter_items,
+    iter_upcoming_items,
+    mark_as_reviewed,
+    mark_many_reviewed,
+)
+from nudge.core.tags import get_tag_registry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Largest request body accepted, in bytes
+MAX_BODY = 1024 * 1024
+
+# Parsed query string, as returned by parse_qs
+Query = Dict[str, List[str]]
+# Status and JSON payload (None for no body) returned by a route handler
+Response = Tuple[HTTPStatus, Any]
+# Route handler: (session, path match, query, body) -> Response
+Handler = Callable[[Session, "re.Match[str]", Query, Dict[str, Any]], Response]
+
+
+class ApiError(Exception):
+    """Error answered with an HTTP status and a JSON {"error": message} body."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ChangeMonitor:
+    """Cheap check for whether the database may have changed.
+
+    ``PRAGMA data_version`` changes whenever another connection, in this
+    process or another, commits. It is read on one connection held for the
+    monitor alone, which never writes; the change bus generation covers
+    writes that share a connection with it (in-memory databases).
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._lock = threading.Lock()
+        self._connection = db.engine.raw_connection()
+        self._generation = 0
+        self._unsubscribe = get_change_bus().subscribe(self._on_changes)
+
+    def _on_changes(self, changes: ItemChanges) -> None:
+        with self._lock:
+            self._generation += 1
+
+    def version(self) -> Tuple[int, int]:
+        with self._lock:
+            cursor = self._connection.cursor()
+            try:
+                data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+            finally:
+                cursor.close()
+            return data_version, self._generation
+
+    def close(self) -> None:
+        self._unsubscribe()
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass
+class CachedQueue:
+    """ETag and, once requested, encoded body of one due or upcoming page."""
+
+    version: Tuple[int, int]
+    # The clock passing this changes the page even without commits; None if nothing would
+    valid_until: datetime | None
+    etag: str
+    body: bytes | None = None
+
+
+class QueueCache:
+    """Least recently used CachedQueue entries by request path and query."""
+
+    def __init__(self, size: int = 256) -> None:
+        self.size = size
+        self._entries: OrderedDict[str, CachedQueue] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: Tuple[int, int], now: datetime) -> CachedQueue | None:
+        """Get the entry for key if the database and the clock have not moved past it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or (entry.valid_until is not None and now >= entry.valid_until):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedQueue) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+def _item_json(item: ScheduledItem, tag_names: Dict[int, str]) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "name": item.name,
+        "tags": sorted(tag_names.get(tag_id, "") for tag_id in item.tag_ids),
+        "date_added": item.date_added.isoformat(),
+        "next_review_date": item.next_review_date.isoformat(),
+        "last_review_date": item.last_review_date.isoformat() if item.last_review_date else None,
+        "interval_index": item.interval_index,
+        "review_count": item.review_count,
+    }
+
+
+def _encode_cursor(cursor: ScheduleCursor) -> str:
+    return f"{cursor[0].isoformat()},{cursor[1]}"
+
+
+def _decode_cursor(text: str) -> ScheduleCursor:
+    try:
+        when, schedule_id = text.rsplit(",", 1)
+        return datetime.fromisoformat(when), int(schedule_id)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid cursor '{text}'") from None
+
+
+def _int_param(query: Dict[str, List[str]], name: str, default: int, low: int = 0, high: int | None = None) -> int:
+    if name not in query:
+        return default
+    try:
+        value = int(query[name][0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer") from None
+    if value < low or (high is not None and value > high):
+        bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{name}' must be {bounds}")
+    return value
+
+
+def _grade(body: Dict[str, Any]) -> Grade:
+    name = str(body.get("grade", "good"))
+    try:
+        return Grade[name.upper()]
+    except KeyError:
+        choices = ", ".join(grade.name.lower() for grade in Grade)
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown grade '{name}' (choose from {choices})") from None
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering the API from one Database."""
+
+    daemon_threads = True
+
+    def __init__(self, db: Database, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False) -> None:
+        self.db = db
+        self.verbose = verbose
+        self.monitor = ChangeMonitor(db)
+        self.queue_cache = QueueCache()
+        super().__init__((host, port), ApiRequestHandler)
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """A pooled session for one request."""
+        session = self.db.get_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.monitor.close()
+
+    # Route handlers: (session, match, query, body) -> (status, JSON payload or None)
+
+    def list_items(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        after = _int_param(query, "after", 0) if "after" in query else None
+        items = list(iter_items(session, limit=limit, after=after))
+        return HTTPStatus.OK, self._page(session, items, items[-1].id if len(items) == limit else None)
+
+    def get_item(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        return HTTPStatus.OK, self._item(session, int(match["id"]))
+
+    def add_item(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        name = body.get("name")
+        tags = body.get("tags", [])
+        if not isinstance(name, str) or not name.strip():
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'name' must be a non-empty string")
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'tags' must be a list of strings")
+        item_id = create_item(session, name.strip(), tags).id
+        return HTTPStatus.CREATED, self._item(session, item_id)
+
+    def remove_item(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        try:
+            delete_item(session, int(match["id"]))
+        except ValueError as e:
+            raise ApiError(HTTPStatus.NOT_FOUND, str(e)) from None
+        return HTTPStatus.NO_CONTENT, None
+
+    def review_item(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        item_id = int(match["id"])
+        grade = _grade(body)
+        try:
+            mark_as_reviewed(session, item_id, grade=grade)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.NOT_FOUND, str(e)) from None
+        return HTTPStatus.OK, self._item(session, item_id)
+
+    def review_many(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        ids = body.get("ids")
+        if not isinstance(ids, list) or not all(isinstance(item_id, int) for item_id in ids):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "'ids' must be a list of item ids")
+        grade = _grade(body)
+        try:
+            updated = mark_many_reviewed(session, ids, grade=grade)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.NOT_FOUND, str(e)) from None
+        return HTTPStatus.OK, {"updated": updated}
+
+    def list_tags(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        tags = get_tag_registry().get_tags(session)
+        return HTTPStatus.OK, {"tags": [{"id": tag.id, "name": tag.name, "color": tag.color} for tag in tags]}
+
+    def due(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        return self._queue(session, query, iter_due_items, default_days=0)
+
+    def upcoming(self, session: Session, match: re.Match[str], query: Query, body: Dict[str, Any]) -> Response:
+        return self._queue(session, query, iter_upcoming_items, default_days=7)
+
+    def _queue(
+        self, session: Session, query: Query, fetch: Callable[..., Iterator[ScheduledItem]], default_days: int
+    ) -> Response:
+        days = _int_param(query, "days", default_days, 0, 36500)
+        limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        after = _decode_cursor(query["after"][0]) if "after" in query else None
+        items = list(fetch(session, days_ahead=days, limit=limit, after=after))
+        next_cursor = _encode_cursor(items[-1].cursor) if len(items) == limit else None
+        return HTTPStatus.OK, self._page(session, items, next_cursor)
+
+    def queue_entry(self, path: str, query_string: str) -> CachedQueue:
+        """Cache entry for a due or upcoming page, found or created without running the queue query.
+
+        Without commits, a queue only changes when the clock passes the next
+        review date beyond its window, or (for upcoming) the first one
+        inside it; a new entry costs those two index seeks.
+        """
+        key = f"{path}?{query_string}"
+        version = self.monitor.version()
+        now = datetime.now()
+        entry = self.queue_cache.get(key, version, now)
+        if entry is not None:
+            return entry
+
+        days = _int_param(parse_qs(query_string), "days", 0 if path == "/due" else 7, 0, 36500)
+        window = timedelta(days=days)
+        with self.session() as session:
+            boundaries = [get_next_review_date(session, after=now + window)]
+            limits = [boundaries[0] - window] if boundaries[0] is not None else []
+            if path == "/upcoming":
+                boundaries.append(get_next_review_date(session, after=now))
+                if boundaries[1] is not None:
+                    limits.append(boundaries[1])
+        tag = f"{version}|{boundaries}|{key}"
+        etag = '"' + hashlib.blake2b(tag.encode(), digest_size=16).hexdigest() + '"'
+        entry = CachedQueue(version, min(limits, default=None), etag)
+        self.queue_cache.put(key, entry)
+        return entry
+
+    def _page(self, session: Session, items: List[ScheduledItem], next_cursor: Any) -> Dict[str, Any]:
+        tag_names = {tag.id: tag.name for tag in get_tag_registry().get_tags(session)}
+        return {"items": [_item_json(item, tag_names) for item in items], "next": next_cursor}
+
+    def _item(self, session: Session, item_id: int) -> Dict[str, Any]:
+        item = get_scheduled_item(session, item_id)
+        if item is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Item {item_id} not found")
+        tag_names = {tag.id: tag.name for tag in get_tag_registry().get_tags(session)}
+        return _item_json(item, tag_names)
+
+
+# Path pattern -> {method: ApiServer handler name}
+ROUTES: List[Tuple[re.Pattern, Dict[str, str]]] = [
+    (re.compile(pattern), handlers)
+    for pattern, handlers in [
+        (r"/items", {"GET": "list_items", "POST": "add_item"}),
+        (r"/items/(?P<id>\d+)", {"GET": "get_item", "DELETE": "remove_item"}),
+        (r"/items/(?P<id>\d+)/review", {"POST": "review_item"}),
+        (r"/review", {"POST": "review_many"}),
+        (r"/tags", {"GET": "list_tags"}),
+        (r"/due", {"GET": "due"}),
+        (r"/upcoming", {"GET": "upcoming"}),
+    ]
+]
+
+# Paths answered with an ETag
+_CACHED_PATHS = ("/due", "/upcoming")
+
+
+def _route(method: str, path: str) -> Tuple[re.Match[str], str]:
+    """Find the route for a request: the path match and the ApiServer handler name.
+
+    Raises:
+        ApiError: 404 if no route has the path, 405 if none takes the method
+    """
+    for pattern, handlers in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            if method not in handlers:
+                raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+            return match, handlers[method]
+    raise ApiError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches etag: "*", or the tag in its list (W/ prefixes ignored)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """Dispatches requests to the ApiServer's route handlers."""
+
+    # Keep-alive connections, so clients do not reconnect per request
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle's algorithm the body waits ~40 ms for an ACK
+    disable_nagle_algorithm = True
+    server: ApiServer
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_PATCH(self) -> None:
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        try:
+            body = self._read_body()
+            match, name = _route(method, path)
+            handler: Handler = getattr(self.server, name)
+            if method == "GET" and path in _CACHED_PATHS:
+                self._send_cached(path, url.query, handler, match, body)
+                return
+
+            with self.server.session() as session:
+                status, payload = handler(session, match, parse_qs(url.query), body)
+            self._send(status, payload)
+        except ApiError as e:
+            self._send(e.status, {"error": e.message})
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _send_cached(
+        self, path: str, query_string: str, handler: Handler, match: re.Match[str], body: Dict[str, Any]
+    ) -> None:
+        """Answer a due or upcoming page from its cache entry, running the handler only if its body is not cached."""
+        entry = self.server.queue_entry(path, query_string)
+        if _etag_matches(self.headers.get("If-None-Match"), entry.etag):
+            self._send(HTTPStatus.NOT_MODIFIED, None, entry.etag)
+            return
+        if entry.body is None:
+            with self.server.session() as session:
+                _status, payload = handler(session, match, parse_qs(query_string), body)
+            entry.body = json.dumps(payload).encode()
+        self._send_bytes(HTTPStatus.OK, entry.body, entry.etag)
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from None
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return body
+
+    def _send(self, status: HTTPStatus, payload: Any, etag: str | None = None) -> None:
+        self._send_bytes(status, None if payload is None else json.dumps(payload).encode(), etag)
+
+    def _send_bytes(self, status: HTTPStatus, data: bytes | None, etag: str | None = None) -> None:
+        self.send_response(status)
+        if data is not None:
+            self.send_header("Content-Type", "application/json")
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", str(len(data or b"")))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(db: Database, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False) -> None:
+    """Serve the API until interrupted.
+
+    Args:
+        db: Database to serve
+        host: Interface to bind (localhost by default)
+        port: TCP port
+        verbose: Log every request to stderr
+    """
+    server = ApiServer(db, host, port, verbose)
+    print(f"Serving Nudge on http://{host}:{server.server_address[1]} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,171 @@
+"""Background database access for the GUI."""
+import sys
+from functools import partial
+from typing import Any, Callable, Dict
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+from sqlalchemy.orm import Session
+
+from nudge.core.database import Database, get_database
+from nudge.core.events import get_change_bus
+
+
+def _report_error(error: Exception) -> None:
+    print(f"Database request failed: {error!r}", file=sys.stderr)
+
+
+class DatabaseRequest(QObject):
+    """Handle for one piece of work submitted to a DatabaseWorker.
+
+    The outcome is delivered to the submitter's callbacks on the GUI thread.
+    A cancelled request never reaches them: if it has not started it is
+    skipped, and if its query is running SQLite aborts it and the outcome
+    is discarded.
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    # SQLite VM instructions between checks of the cancelled flag
+    PROGRESS_INTERVAL = 1000
+
+    def __init__(self, key: str | None = None) -> None:
+        super().__init__()
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancel the request, aborting its query if one is running."""
+        self.cancelled = True
+
+    def _attach(self, dbapi_connection: Any) -> None:
+        """Abort statements on dbapi_connection with SQLITE_INTERRUPT once cancelled.
+
+        A progress handler rather than ``interrupt()``, which has no effect
+        when it lands between two statements of the same request.
+        """
+        dbapi_connection.set_progress_handler(lambda: self.cancelled, self.PROGRESS_INTERVAL)
+
+    @staticmethod
+    def _detach(dbapi_connection: Any) -> None:
+        dbapi_connection.set_progress_handler(None, 0)
+
+
+class DatabaseWorker(QObject):
+    """Runs database work on a small thread pool, each task in its own session.
+
+    Results are delivered back to the GUI thread through signals, so callers
+    never block on SQLite. Requests submitted with the same key supersede
+    each other: submitting a new search cancels the one still running for the
+    previous keystroke.
+
+    Committed changes published on the change bus, from any thread, are
+    re-emitted as ``changes`` so GUI code receives them on its own thread.
+    """
+
+    # ItemChanges from the change bus
+    changes = pyqtSignal(object)
+
+    MAX_THREADS = 2
+
+    def __init__(self, db: Database | None = None, max_threads: int = MAX_THREADS, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.db = db or get_database()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Requests are kept alive until their outcome has been delivered
+        self._active: Dict[int, DatabaseRequest] = {}
+        self._latest: Dict[str, DatabaseRequest] = {}
+        self._unsubscribe = get_change_bus().subscribe(self.changes.emit)
+
+    def submit(
+        self,
+        fn: Callable[[Session], Any],
+        on_result: Callable[[Any], object] | None = None,
+        on_error: Callable[[Exception], object] | None = None,
+        key: str | None = None,
+    ) -> DatabaseRequest:
+        """Run fn(session) in the background.
+
+        Args:
+            fn: Work to run; receives a fresh session and should return plain
+                data (ORM objects become detached once the session closes)
+            on_result: Called on the GUI thread with fn's return value
+            on_error: Called on the GUI thread with the exception fn raised
+                (defaults to printing it to stderr)
+            key: Optional key; a pending request with the same key is cancelled
+
+        Returns:
+            Handle that can be used to cancel the request
+        """
+        if key is not None and key in self._latest:
+            self._latest[key].cancel()
+
+        request = DatabaseRequest(key)
+        # Connected from the GUI thread, so delivery is queued onto it
+        request.finished.connect(partial(self._deliver, request, on_result))
+        request.failed.connect(partial(self._deliver, request, on_error or _report_error))
+        self._active[id(request)] = request
+        if key is not None:
+            self._latest[key] = request
+
+        self.pool.start(partial(self._run, request, fn))
+        return request
+
+    def _run(self, request: DatabaseRequest, fn: Callable[[Session], Any]) -> None:
+        """Execute a request on a pool thread."""
+        if request.cancelled:
+            request.failed.emit(None)
+            return
+
+        session = self.db.get_session()
+        dbapi_connection = session.connection().connection.dbapi_connection
+        request._attach(dbapi_connection)
+        try:
+            result = fn(session)
+        except Exception as e:
+            session.rollback()
+            request.failed.emit(e)
+        else:
+            request.finished.emit(result)
+        finally:
+            request._detach(dbapi_connection)
+            session.close()
+
+    def _deliver(self, request: DatabaseRequest, callback: Callable[[Any], object] | None, value: Any) -> None:
+        """Hand a request's outcome to its callback on the GUI thread."""
+        self._active.pop(id(request), None)
+        if request.key is not None and self._latest.get(request.key) is request:
+            del self._latest[request.key]
+        if request.cancelled or callback is None:
+            return
+        callback(value)
+
+    def pending_count(self) -> int:
+        """Number of requests whose outcome has not been delivered yet."""
+        return len(self._active)
+
+    def shutdown(self, timeout_ms: int = 5000) -> None:
+        """Cancel outstanding requests and wait for running ones to stop."""
+        self._unsubscribe()
+        for request in list(self._active.values()):
+            request.cancel()
+        self.pool.waitForDone(timeout_ms)
+
+
+# Global worker instance
+_worker_instance: DatabaseWorker | None = None
+
+
+def get_worker() -> DatabaseWorker:
+    """Get or create the global database worker.
+
+    Must be called from the GUI thread.
+
+    Returns:
+        DatabaseWorker instance
+    """
+    global _worker_instance
+    if _worker_instance is None:
+        _worker_instance = DatabaseWorker()
+    return _worker_instance
@@ -0,0 +1,84 @@
+"""Due-review notifications driven by the review schedule."""
+from datetime import datetime
+from typing import Tuple
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+from sqlalchemy.orm import Session
+
+from nudge.core.events import ItemChanges
+from nudge.core.scheduler import count_due, get_next_review_date
+from nudge.services.db_worker import DatabaseWorker, get_worker
+
+# QTimer intervals are a signed 32-bit millisecond count (about 24.8 days)
+MAX_TIMER_MS = 2**31 - 1
+
+
+def _due_state(now: datetime, session: Session) -> Tuple[int, datetime | None]:
+    """Count items due at now and find when the next one becomes due."""
+    return count_due(session, now), get_next_review_date(session, after=now)
+
+
+class ReviewNotifier(QObject):
+    """Announces items becoming due without polling.
+
+    Instead of checking on an interval, the notifier asks for the earliest
+    next review date and arms a single timer for that instant. When it fires
+    the due count is refreshed and the timer re-armed for the following
+    date. Every committed change reported by the worker re-arms the timer
+    for the new earliest date; between those events the notifier runs no
+    queries at all.
+    """
+
+    # Current number of due items, emitted whenever it changes
+    due_count_changed = pyqtSignal(int)
+    # Number of items that have become due since the last check
+    items_became_due = pyqtSignal(int)
+
+    def __init__(self, worker: DatabaseWorker | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.worker = worker or get_worker()
+        self.due_count: int | None = None
+        self.next_review_date: datetime | None = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        # A coarse timer may fire up to 5% early, which on a day-long wait is over an hour
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.check)
+        self.worker.changes.connect(self.schedules_changed)
+
+    def start(self) -> None:
+        """Run the first check and arm the timer."""
+        self.check()
+
+    def schedules_changed(self, changes: ItemChanges) -> None:
+        """Re-check after items or their review schedules changed."""
+        self.check()
+
+    def check(self) -> None:
+        """Refresh the due count and re-arm the timer for the next due date."""
+        self.timer.stop()
+        now = datetime.now()
+        self.worker.submit(
+            lambda session: _due_state(now, session),
+            lambda result: self._on_due_state(*result),
+            key=f"review-notifier-{id(self)}",
+        )
+
+    def _on_due_state(self, due_count: int, next_review_date: datetime | None) -> None:
+        previous = self.due_count
+        self.due_count = due_count
+        self.next_review_date = next_review_date
+
+        if due_count != previous:
+            self.due_count_changed.emit(due_count)
+            # Reviewing or deleting items lowers the count; only announce increases
+            newly_due = due_count - (previous or 0)
+            if newly_due > 0:
+                self.items_became_due.emit(newly_due)
+
+        if next_review_date is not None:
+            # Measured from now, so time spent on the query is not waited twice
+            delay = (next_review_date - datetime.now()).total_seconds() * 1000
+            # The timer is re-armed from the database if it wakes before anything is due
+            self.timer.start(min(max(int(delay) + 1, 0), MAX_TIMER_MS))
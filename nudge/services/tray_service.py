@@ -1,21 +1,61 @@
 """System tray service for background operation."""
-from PyQt6.QtGui import QAction, QIcon
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QAction, QColor, QFont, QIcon, QPainter, QPixmap
 from PyQt6.QtWidgets import QMenu, QSystemTrayIcon
 from sqlalchemy.orm import Session
 
-from nudge.ui.dialogs.add_item_dialog import AddItemDialog
+from nudge.core.items import create_item
+from nudge.services.db_worker import get_worker
+from nudge.services.notifier import ReviewNotifier
+
+ICON_SIZE = 64
+ICON_COLOR = QColor("#4A90D9")
+BADGE_COLOR = QColor("#E5484D")
+
+
+def render_tray_icon(due_count: int = 0) -> QIcon:
+    """Draw the tray icon, with a badge showing the due count if there is one."""
+    pixmap = QPixmap(ICON_SIZE, ICON_SIZE)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(ICON_COLOR)
+    painter.drawEllipse(4, 4, ICON_SIZE - 8, ICON_SIZE - 8)
+    
+    if due_count > 0:
+        badge = QRect(ICON_SIZE // 2 - 4, 0, ICON_SIZE // 2 + 4, ICON_SIZE // 2 + 4)
+        painter.setBrush(BADGE_COLOR)
+        painter.drawEllipse(badge)
+        
+        font = QFont()
+        font.setBold(True)
+        font.setPixelSize(ICON_SIZE // 4 if due_count < 100 else ICON_SIZE // 6)
+        painter.setFont(font)
+        painter.setPen(Qt.GlobalColor.white)
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, str(due_count) if due_count < 1000 else "999+")
+    
+    painter.end()
+    return QIcon(pixmap)
 
 
 class TrayService:
     """System tray icon and menu."""
     
-    def __init__(self, app, main_window, session: Session):
+    def __init__(self, app, main_window, session: Session, notifier: ReviewNotifier | None = None):
         self.app = app
         self.main_window = main_window
         self.session = session
+        self.worker = get_worker()
+        self.notifier = notifier or ReviewNotifier(self.worker)
         
         self.tray_icon = QSystemTrayIcon(app)
         self.setup_tray()
+        
+        # Badge and notifications are pushed by the notifier; nothing here polls
+        self.notifier.due_count_changed.connect(self.update_due_count)
+        self.notifier.items_became_due.connect(self.notify_due)
     
     def setup_tray(self):
         """Set up system tray icon and menu."""
@@ -43,12 +83,14 @@ class TrayService:
         
         self.tray_icon.setContextMenu(menu)
         
-        # Set icon (using a simple placeholder text-based icon)
-        # In production, you'd want to use an actual icon file
+        # Set icon (drawn at runtime; the badge is redrawn as items fall due)
+        self.tray_icon.setIcon(render_tray_icon())
         self.tray_icon.setToolTip("Nudge - Study Reminder")
         
         # Double-click to show window
         self.tray_icon.activated.connect(self.on_tray_activated)
+        # Clicking a due notification opens the window
+        self.tray_icon.messageClicked.connect(self.show_window)
         
         self.tray_icon.show()
     
@@ -63,6 +105,14 @@ class TrayService:
             self.main_window.raise_()
             self.show_action.setText("Hide Window")
     
+    def show_window(self) -> None:
+        """Show and raise the main window."""
+        if not self.main_window.isVisible():
+            self.toggle_window()
+        else:
+            self.main_window.activateWindow()
+            self.main_window.raise_()
+    
     def on_tray_activated(self, reason):
         """Handle tray icon activation."""
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
@@ -70,44 +120,44 @@ class TrayService:
     
     def quick_add(self):
         """Show quick add dialog."""
-        dialog = AddItemDialog(self.session, self.main_window)
+        # Imported on first use to keep it out of startup
+        from nudge.ui.dialogs.add_item_dialog import AddItemDialog
+        
+        dialog = AddItemDialog(self.session, self.main_window, worker=self.worker)
         if dialog.exec():
             item_name, tag_names = dialog.get_item_data()
-            
-            # Create item (same logic as main window)
-            from nudge.core.models import Item, Tag
-            from nudge.core.scheduler import create_review_schedule
-            
-            item = Item(name=item_name)
-            
-            for tag_name in tag_names:
-                tag = self.session.query(Tag).filter_by(name=tag_name).first()
-                if not tag:
-                    from nudge.ui.widgets.tag_input import get_or_create_tag_color
-                    existing_tags = {t.name: t.color for t in self.session.query(Tag).all()}
-                    color = get_or_create_tag_color(tag_name, existing_tags)
-                    tag = Tag(name=tag_name, color=color)
-                    self.session.add(tag)
-                    self.session.flush()  # Flush to ensure tag gets an ID
-                item.tags.append(tag)
-            
-            self.session.add(item)
-            self.session.flush()  # Flush to ensure item gets an ID before review schedule
-            self.session.commit()
-            
-            create_review_schedule(self.session, item)
-            
-            # Refresh main window if visible
-            if self.main_window.isVisible():
-                self.main_window.refresh_data()
-            
-            self.tray_icon.showMessage(
-                "Item Added",
-                f"'{item_name}' has been added to your study list.",
-                QSystemTrayIcon.MessageIcon.Information,
-                2000
+            self.worker.submit(
+                lambda session: create_item(session, item_name, tag_names).id,
+                lambda item_id: self.on_item_added(item_name),
             )
     
+    def on_item_added(self, item_name: str) -> None:
+        """Confirm once a quick-added item is saved."""
+        self.tray_icon.showMessage(
+            "Item Added",
+            f"'{item_name}' has been added to your study list.",
+            QSystemTrayIcon.MessageIcon.Information,
+            2000
+        )
+    
+    def update_due_count(self, due_count: int) -> None:
+        """Show the number of due items on the tray icon."""
+        self.tray_icon.setIcon(render_tray_icon(due_count))
+        if due_count:
+            self.tray_icon.setToolTip(f"Nudge - {due_count} item{'s' if due_count != 1 else ''} due for review")
+        else:
+            self.tray_icon.setToolTip("Nudge - Study Reminder")
+    
+    def notify_due(self, newly_due: int) -> None:
+        """Show a desktop notification when items have become due."""
+        due_count = self.notifier.due_count
+        self.tray_icon.showMessage(
+            "Time to Review",
+            f"You have {due_count} item{'s' if due_count != 1 else ''} due for review.",
+            QSystemTrayIcon.MessageIcon.Information,
+            5000
+        )
+    
     def quit_app(self):
         """Quit the application."""
         self.tray_icon.hide()
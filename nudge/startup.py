@@ -0,0 +1,46 @@
+"""Timing of GUI startup phases for ``nudge --profile-startup``."""
+import sys
+import time
+from typing import List, TextIO, Tuple
+
+
+class StartupProfiler:
+    """Records how long each startup phase took.
+
+    Each ``mark`` closes the phase that started at the previous mark (or
+    when the profiler was created) and names it.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """End the current phase.
+
+        Args:
+            phase: Name of the phase that just finished
+
+        Returns:
+            Duration of the phase in seconds
+        """
+        now = time.perf_counter()
+        duration = now - self._last
+        self._last = now
+        self.phases.append((phase, duration))
+        return duration
+
+    @property
+    def total(self) -> float:
+        """Seconds from creation to the last mark."""
+        return self._last - self.started
+
+    def report(self, file: TextIO | None = None) -> None:
+        """Print a per-phase timing table (to stderr by default)."""
+        file = file or sys.stderr
+        width = max([len(phase) for phase, _ in self.phases] + [len("total")])
+        print("Startup profile:", file=file)
+        for phase, duration in self.phases:
+            print(f"  {phase:<{width}}  {duration * 1000:8.1f} ms", file=file)
+        print(f"  {'total':<{width}}  {self.total * 1000:8.1f} ms", file=file)
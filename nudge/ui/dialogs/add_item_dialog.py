@@ -9,16 +9,18 @@ from PyQt6.QtWidgets import (
 )
 from sqlalchemy.orm import Session
 
-from nudge.core.models import Tag
+from nudge.core.tags import get_tag_registry
+from nudge.services.db_worker import DatabaseWorker
 from nudge.ui.widgets.tag_input import TagInputWidget
 
 
 class AddItemDialog(QDialog):
     """Dialog for adding a new study item."""
     
-    def __init__(self, session: Session, parent=None):
+    def __init__(self, session: Session, parent=None, worker: DatabaseWorker | None = None):
         super().__init__(parent)
         self.session = session
+        self.worker = worker
         self.item_name = ""
         self.selected_tags = []
         
@@ -51,10 +53,13 @@ class AddItemDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
-    def load_tags(self):
-        """Load existing tags from database."""
-        tags = self.session.query(Tag).all()
-        self.tag_widget.update_available_tags(tags)
+    def load_tags(self) -> None:
+        """Load existing tags from the tag registry, in the background if a worker is available."""
+        registry = get_tag_registry()
+        if self.worker is None:
+            self.tag_widget.update_available_tags(registry.get_tags(self.session))
+        else:
+            self.worker.submit(registry.get_tags, self.tag_widget.update_available_tags)
     
     def accept(self):
         """Handle OK button click."""
@@ -0,0 +1,120 @@
+"""Dialog showing collection statistics."""
+from typing import Any, List, Sequence
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QShowEvent
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from nudge.core.stats import DEFAULT_REVIEW_DAYS, Dashboard, get_dashboard
+from nudge.services.db_worker import DatabaseWorker
+from nudge.ui.widgets.forecast_chart import ForecastChart
+
+
+def _table(headers: List[str]) -> QTableWidget:
+    table = QTableWidget(0, len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    vertical, horizontal = table.verticalHeader(), table.horizontalHeader()
+    if vertical is not None and horizontal is not None:
+        vertical.setVisible(False)
+        horizontal.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        horizontal.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+    return table
+
+
+def _fill(table: QTableWidget, rows: Sequence[Sequence[Any]]) -> None:
+    table.setSortingEnabled(False)
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            cell = QTableWidgetItem()
+            # Numbers as display data, so sorting is numeric
+            cell.setData(Qt.ItemDataRole.DisplayRole, value)
+            table.setItem(row, column, cell)
+    table.setSortingEnabled(True)
+
+
+class StatsDialog(QDialog):
+    """Items per status, interval step and tag, reviews per day and the overdue count.
+
+    Everything is read from the statistics summary tables (see
+    nudge.core.stats) on the database worker, so opening the dialog takes
+    the same time for any collection size. It refreshes after every change
+    while visible.
+    """
+
+    def __init__(self, worker: DatabaseWorker, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.worker = worker
+
+        self.setup_ui()
+        self.worker.changes.connect(self.refresh)
+
+    def setup_ui(self) -> None:
+        """Set up the user interface."""
+        self.setWindowTitle("Statistics")
+        self.setMinimumSize(560, 520)
+
+        layout = QVBoxLayout(self)
+
+        summary = QFormLayout()
+        self.items_label = QLabel()
+        self.overdue_label = QLabel()
+        self.learning_label = QLabel()
+        self.mastered_label = QLabel()
+        summary.addRow("Items:", self.items_label)
+        summary.addRow("Due now:", self.overdue_label)
+        summary.addRow("Learning:", self.learning_label)
+        summary.addRow("Mastered:", self.mastered_label)
+        layout.addLayout(summary)
+
+        layout.addWidget(QLabel(f"Reviews, last {DEFAULT_REVIEW_DAYS} days"))
+        self.reviews_chart = ForecastChart(highlight_start=False, empty_text="No reviews yet")
+        layout.addWidget(self.reviews_chart)
+
+        tables = QHBoxLayout()
+        self.interval_table = _table(["Step", "Interval (days)", "Items"])
+        tables.addWidget(self.interval_table)
+        self.tag_table = _table(["Tag", "Items"])
+        tables.addWidget(self.tag_table)
+        layout.addLayout(tables)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def showEvent(self, event: QShowEvent | None) -> None:
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self, *args: Any) -> None:
+        """Reload the dashboard on the worker if the dialog is open."""
+        if self.isVisible():
+            self.worker.submit(get_dashboard, self.show_dashboard, key="stats-dashboard")
+
+    def show_dashboard(self, dashboard: Dashboard) -> None:
+        """Display a dashboard."""
+        self.items_label.setText(str(dashboard.items))
+        self.overdue_label.setText(str(dashboard.overdue))
+        self.learning_label.setText(str(dashboard.by_status.get("learning", 0)))
+        self.mastered_label.setText(str(dashboard.by_status.get("mastered", 0)))
+        if dashboard.reviews_per_day:
+            self.reviews_chart.set_forecast(
+                dashboard.reviews_per_day[0][0], [count for _, count in dashboard.reviews_per_day]
+            )
+        _fill(self.interval_table, [
+            (index, dashboard.intervals[index] if index < len(dashboard.intervals) else "", count)
+            for index, count in dashboard.by_interval
+        ])
+        _fill(self.tag_table, dashboard.by_tag)
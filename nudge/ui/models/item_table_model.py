@@ -0,0 +1,598 @@
+"""Windowed table model over the study items."""
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Callable, ClassVar, Dict, List, NamedTuple, Set, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from sqlalchemy import ScalarSelect, Select, SQLColumnExpression, func, or_, select
+from sqlalchemy.orm import Session
+
+from nudge.core.events import ItemChanges
+from nudge.core.models import Item, ReviewSchedule, Tag, item_tags
+from nudge.core.perf import call_timed
+from nudge.core.scheduler import IN_CLAUSE_BATCH, get_interval_name, get_intervals
+from nudge.core.search import build_match_query, match_item_ids
+from nudge.services.db_worker import DatabaseWorker
+
+# Keyset cursor: (sort value, tie-breaking id) of the last row of a page
+Cursor = Tuple[Any, int]
+
+OVERDUE_COLOR = QColor("#FFE5E5")  # Light red
+DUE_TODAY_COLOR = QColor("#FFF8E5")  # Light yellow
+
+# Parent of every row: the model is a flat table
+_ROOT = QModelIndex()
+
+
+class ItemRow(NamedTuple):
+    """Display-ready values for one table row.
+
+    Built once when its page is fetched, so ``data()`` is a tuple lookup.
+    """
+
+    id: int
+    name: str
+    # Formatted text for each of ItemTableModel.COLUMNS
+    texts: Tuple[str, str, str, str, str]
+    next_review_date: datetime
+    background: QColor | None
+    # Keyset cursor values
+    sort_value: Any
+    sort_id: int
+
+
+def _tags_display() -> ScalarSelect[str]:
+    """Correlated subquery giving an item's comma-joined tag names."""
+    return (
+        select(func.coalesce(func.group_concat(Tag.name, ", "), ""))
+        .select_from(item_tags.join(Tag, Tag.id == item_tags.c.tag_id))
+        .where(item_tags.c.item_id == Item.id)
+        .scalar_subquery()
+    )
+
+
+def _make_row(
+    today: date,
+    intervals: List[int],
+    item_id: int,
+    name: str,
+    tags: str,
+    date_added: datetime,
+    next_review_date: datetime,
+    interval_index: int,
+    sort_value: Any,
+    sort_id: int,
+) -> ItemRow:
+    due = next_review_date.date()
+    if due < today:
+        background = OVERDUE_COLOR
+    elif due == today:
+        background = DUE_TODAY_COLOR
+    else:
+        background = None
+
+    texts = (
+        name,
+        tags,
+        date_added.date().isoformat(),
+        due.isoformat(),
+        get_interval_name(interval_index, intervals),
+    )
+    return ItemRow(item_id, name, texts, next_review_date, background, sort_value, sort_id)
+
+
+def _fetch_rows(statement: Select, today: date, session: Session) -> List[ItemRow]:
+    """Execute a page query and build its display rows (runs on the worker thread)."""
+    intervals = get_intervals(session)
+    return [_make_row(today, intervals, *values) for values in session.execute(statement)]
+
+
+def _fetch_many(statements: List[Select], today: date, session: Session) -> List[ItemRow]:
+    """Execute several row queries and concatenate their display rows."""
+    return [row for statement in statements for row in _fetch_rows(statement, today, session)]
+
+
+class ItemTableModel(QAbstractTableModel):
+    """Table model for displaying study items.
+
+    Rows are fetched lazily in pages with keyset pagination over
+    (sort key, id), so the cost of opening or scrolling the table does not
+    depend on the collection size. Every sortable column is backed by an
+    index, and the id is the rowid of the table that owns the sort key, so
+    SQLite reads each page straight off the index, with search filters or
+    without. Only the most recently displayed pages are kept in memory; a
+    page evicted after scrolling out of view is re-fetched between its
+    neighbours' cursors if it is displayed again.
+
+    Pages are read with a column projection rather than ORM objects and
+    stored as compact ItemRow tuples with every cell already formatted.
+
+    Committed changes are applied in place: ``apply_changes`` re-reads just
+    the affected items and inserts, updates, moves or removes their rows, so
+    scroll position and selection survive an add, review or delete.
+
+    Given a DatabaseWorker, every query runs off the GUI thread, the model
+    updates itself when results arrive and it follows the worker's change
+    notifications; without one, queries run inline on ``session``.
+    """
+
+    loaded = pyqtSignal()
+
+    COLUMNS: ClassVar[List[str]] = ["Name", "Tags", "Date Added", "Next Review", "Interval"]
+    PAGE_SIZE = 200
+    MAX_RESIDENT_PAGES = 8
+    # Bigger changes (such as an import chunk) reload the table instead
+    MAX_INCREMENTAL_CHANGES = 1000
+
+    def __init__(
+        self,
+        session: Session,
+        page_size: int = PAGE_SIZE,
+        max_resident_pages: int = MAX_RESIDENT_PAGES,
+        worker: DatabaseWorker | None = None,
+    ) -> None:
+        super().__init__()
+        self.session = session
+        self.worker = worker
+        self.page_size = page_size
+        self.max_resident_pages = max(2, max_resident_pages)
+
+        self.sort_column = 3  # Next Review
+        self.ascending = True
+        self.search_text = ""
+        self._match_query = ""
+
+        # Overdue/due-today highlighting is relative to the day of the last refresh
+        self._today = date.today()
+        self._row_count = 0
+        self._exhausted = True
+        # Bumped by every load so late results from an earlier load are ignored
+        self._generation = 0
+        self._reloading = False
+        self._fetching = False
+        self._loading_pages: Set[int] = set()
+        # Per fetched page: cursor of its last row when fetched, the page's upper bound
+        self._page_cursors: List[Cursor] = []
+        # Per fetched page: ids of its rows in display order, kept while the rows are evicted
+        self._page_ids: List[array] = []
+        # Per fetched page: index of its first row
+        self._page_starts: List[int] = []
+        # Resident pages in least-recently-displayed order
+        self._pages: OrderedDict[int, List[ItemRow]] = OrderedDict()
+        # Changes waiting to be applied, one batch at a time
+        self._pending_refresh: Set[int] = set()
+        self._pending_deleted: Set[int] = set()
+        self._applying_changes = False
+
+        if worker is not None:
+            worker.changes.connect(self.apply_changes)
+        self.load_items()
+
+    def _sort_key(self) -> Tuple[SQLColumnExpression[Any], SQLColumnExpression[int]]:
+        """SQL expressions (sort key, tie-breaking id) for the current sort column.
+
+        Each key matches an index, and an index entry already ends in its
+        table's rowid, so ordering by (key, rowid) needs no sort step.
+        """
+        if self.sort_column == 0:  # Name
+            return func.lower(Item.name), Item.id
+        elif self.sort_column == 1:  # Tags
+            return Item.tag_key, Item.id
+        elif self.sort_column == 2:  # Date Added
+            return Item.date_added, Item.id
+        elif self.sort_column == 4:  # Interval
+            return ReviewSchedule.current_interval_index, ReviewSchedule.id
+        return ReviewSchedule.next_review_date, ReviewSchedule.id
+
+    def _rows_statement(self) -> Select:
+        """Select display rows matching the current search, unordered."""
+        sort_key, sort_id = self._sort_key()
+
+        statement = (
+            select(
+                Item.id,
+                Item.name,
+                _tags_display(),
+                Item.date_added,
+                ReviewSchedule.next_review_date,
+                ReviewSchedule.current_interval_index,
+                sort_key,
+                sort_id,
+            )
+            .join(ReviewSchedule, ReviewSchedule.item_id == Item.id)
+        )
+        if self._match_query:
+            statement = statement.where(Item.id.in_(match_item_ids(self._match_query)))
+        return statement
+
+    def _page_statement(self, after: Cursor | None, upto: Cursor | None = None) -> Select:
+        """Build the query for the rows following one cursor.
+
+        Without ``upto`` this is one page of at most page_size rows; with it,
+        every row up to and including that cursor.
+        """
+        sort_key, sort_id = self._sort_key()
+        statement = self._rows_statement()
+
+        # (key, id) > (v, i) spelled so that the key alone bounds an index range seek
+        if after is not None:
+            value, last_id = after
+            if self.ascending:
+                statement = statement.where(sort_key >= value, or_(sort_key > value, sort_id > last_id))
+            else:
+                statement = statement.where(sort_key <= value, or_(sort_key < value, sort_id < last_id))
+        if upto is not None:
+            value, last_id = upto
+            if self.ascending:
+                statement = statement.where(sort_key <= value, or_(sort_key < value, sort_id <= last_id))
+            else:
+                statement = statement.where(sort_key >= value, or_(sort_key > value, sort_id >= last_id))
+
+        if self.ascending:
+            statement = statement.order_by(sort_key, sort_id)
+        else:
+            statement = statement.order_by(sort_key.desc(), sort_id.desc())
+        return statement if upto is not None else statement.limit(self.page_size)
+
+    def _query(self, name: str, fetch: Callable[[Session], List[ItemRow]], callback: Callable[[List[ItemRow]], None], key: str | None = None) -> None:
+        """Run fetch through the worker (or inline without one) and pass its rows to callback.
+
+        The fetch is timed as "item_table_model.<name>" while instrumentation is enabled.
+        """
+        fetch = partial(call_timed, f"item_table_model.{name}", fetch)
+        if self.worker is None:
+            callback(fetch(self.session))
+        else:
+            self.worker.submit(fetch, callback, key=key)
+
+    def _request_page(self, name: str, after: Cursor | None, callback: Callable[[List[ItemRow]], None], key: str | None = None, upto: Cursor | None = None) -> None:
+        """Fetch the rows following a cursor and pass them to callback.
+
+        The query is built here, on the GUI thread, from the current sort and
+        search settings; the worker thread only executes it and formats rows.
+        """
+        self._query(name, partial(_fetch_rows, self._page_statement(after, upto), self._today), callback, key)
+
+    def _before(self, a: Cursor, b: Cursor) -> bool:
+        """Whether a row with cursor a is displayed before one with cursor b."""
+        return a < b if self.ascending else a > b
+
+    def _count_before(self, cursors: List[Cursor], cursor: Cursor) -> int:
+        """Number of leading cursors (in display order) displayed before cursor."""
+        low, high = 0, len(cursors)
+        while low < high:
+            middle = (low + high) // 2
+            if self._before(cursors[middle], cursor):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _store_page(self, page: int, rows: List[ItemRow]) -> None:
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_resident_pages:
+            self._pages.popitem(last=False)
+
+    def _update_starts(self) -> None:
+        """Recompute page offsets and the row count after page lengths changed."""
+        start = 0
+        self._page_starts = []
+        for ids in self._page_ids:
+            self._page_starts.append(start)
+            start += len(ids)
+        self._row_count = start
+
+    def _page(self, page: int) -> List[ItemRow] | None:
+        """Get a resident page of rows, or start re-fetching it if it was evicted.
+
+        With a worker the re-fetch completes later and the rows are announced
+        with dataChanged, so this returns None meanwhile.
+        """
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        if page not in self._loading_pages:
+            self._loading_pages.add(page)
+            after = self._page_cursors[page - 1] if page > 0 else None
+            # The last page has no upper bound once everything has been fetched
+            last = page == len(self._page_cursors) - 1 and self._exhausted
+            upto = None if last else self._page_cursors[page]
+            self._request_page("refetch_page", after, partial(self._on_page_refetched, self._generation, page), upto=upto)
+        return self._pages.get(page)
+
+    def _on_page_refetched(self, generation: int, page: int, rows: List[ItemRow]) -> None:
+        if generation != self._generation:
+            return
+        self._loading_pages.discard(page)
+        first = self._page_starts[page]
+        known = len(self._page_ids[page])
+        # The page can differ in length if another connection wrote meanwhile
+        if len(rows) < known:
+            self.beginRemoveRows(QModelIndex(), first + len(rows), first + known - 1)
+        elif len(rows) > known:
+            self.beginInsertRows(QModelIndex(), first + known, first + len(rows) - 1)
+        self._page_ids[page] = array("q", (row.id for row in rows))
+        self._store_page(page, rows)
+        self._update_starts()
+        if len(rows) < known:
+            self.endRemoveRows()
+        elif len(rows) > known:
+            self.endInsertRows()
+
+        if self.worker is not None and rows:
+            self.dataChanged.emit(self.index(first, 0), self.index(first + len(rows) - 1, len(self.COLUMNS) - 1))
+        self._flush_changes()
+
+    def load_items(self) -> None:
+        """Reload the model from the database, starting with the first page.
+
+        The current rows stay on screen until the new first page arrives;
+        results of an older load, fetch or re-fetch are discarded.
+        """
+        self._generation += 1
+        self._reloading = True
+        self._today = date.today()
+        self._request_page("load_items", None, partial(self._on_first_page, self._generation), key=f"item-table-{id(self)}")
+
+    def _on_first_page(self, generation: int, rows: List[ItemRow]) -> None:
+        if generation != self._generation:
+            return
+        self.beginResetModel()
+        self._reloading = False
+        self._exhausted = len(rows) < self.page_size
+        self._fetching = False
+        self._loading_pages = set()
+        self._page_cursors = []
+        self._page_ids = []
+        self._page_starts = []
+        self._row_count = 0
+        self._pages = OrderedDict()
+        self._append_page(rows)
+        self.endResetModel()
+        self.loaded.emit()
+        self._flush_changes()
+
+    def _append_page(self, rows: List[ItemRow]) -> None:
+        if not rows:
+            return
+        page = len(self._page_cursors)
+        last = rows[-1]
+        self._page_cursors.append((last.sort_value, last.sort_id))
+        self._page_ids.append(array("q", (row.id for row in rows)))
+        self._page_starts.append(self._row_count)
+        self._store_page(page, rows)
+        self._row_count += len(rows)
+
+    def canFetchMore(self, parent: QModelIndex = _ROOT) -> bool:
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = _ROOT) -> None:
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        self._fetching = True
+        after = self._page_cursors[-1] if self._page_cursors else None
+        self._request_page("fetch_more", after, partial(self._on_next_page, self._generation))
+
+    def _on_next_page(self, generation: int, rows: List[ItemRow]) -> None:
+        if generation != self._generation:
+            return
+        self._fetching = False
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(rows) - 1)
+            self._append_page(rows)
+            self.endInsertRows()
+        self._flush_changes()
+
+    def apply_changes(self, changes: ItemChanges) -> None:
+        """Update the rows of items inserted, updated or deleted by a committed write.
+
+        Deleted items lose their rows. Inserted and updated items are re-read
+        with the current sort and search; each row is then updated where it
+        is, moved to its new sorted position, added, or removed if it no
+        longer matches the search. Rows are only placed among pages that have
+        already been fetched, so an item sorting past them appears once
+        scrolling fetches its page.
+        """
+        self._pending_refresh |= changes.inserted | changes.updated
+        self._pending_deleted |= changes.deleted
+        self._flush_changes()
+
+    def _flush_changes(self) -> None:
+        """Start applying pending changes unless a query they could race with is in flight."""
+        # A page query may have run before the change was committed; apply it afterwards
+        if self._applying_changes or self._reloading or self._fetching or self._loading_pages:
+            return
+        if not (self._pending_refresh or self._pending_deleted):
+            return
+
+        refresh, deleted = self._pending_refresh, self._pending_deleted
+        self._pending_refresh, self._pending_deleted = set(), set()
+        if len(refresh) + len(deleted) > self.MAX_INCREMENTAL_CHANGES:
+            self.load_items()
+            return
+
+        ids = sorted(refresh)
+        statements = [
+            self._rows_statement().where(Item.id.in_(ids[start:start + IN_CLAUSE_BATCH]))
+            for start in range(0, len(ids), IN_CLAUSE_BATCH)
+        ]
+        self._applying_changes = True
+        self._query(
+            "apply_changes",
+            partial(_fetch_many, statements, self._today),
+            partial(self._on_changed_rows, self._generation, refresh, deleted),
+        )
+
+    def _on_changed_rows(self, generation: int, refresh: Set[int], deleted: Set[int], rows: List[ItemRow]) -> None:
+        self._applying_changes = False
+        # A reload since the changes were read already includes them
+        if generation == self._generation:
+            fresh = {row.id: row for row in rows}
+            self._apply_rows(deleted | (refresh - fresh.keys()), fresh)
+        self._flush_changes()
+
+    def _apply_rows(self, gone: Set[int], fresh: Dict[int, ItemRow]) -> None:
+        """Remove the rows of gone ids and place the fresh rows in sort order."""
+        affected = gone | fresh.keys()
+        page_of: Dict[int, int] = {}
+        for index, ids in enumerate(self._page_ids):
+            for item_id in affected.intersection(ids):
+                page_of[item_id] = index
+
+        for item_id in gone:
+            if item_id in page_of:
+                self._remove_row(page_of[item_id], item_id)
+
+        for item_id, row in fresh.items():
+            page = page_of.get(item_id)
+            target = self._target_page(row)
+            if page is not None and page == target and self._replace_row(page, row):
+                continue
+            if page is not None:
+                self._remove_row(page, item_id)
+            if target is not None:
+                self._insert_row(target, row)
+
+    def _target_page(self, row: ItemRow) -> int | None:
+        """Page a row sorts into, or None if it sorts past the fetched pages."""
+        page = self._count_before(self._page_cursors, (row.sort_value, row.sort_id))
+        if page < len(self._page_cursors):
+            return page
+        # Past the last fetched row: only the last page can take it, once nothing is left to fetch
+        if self._exhausted:
+            return max(page - 1, 0)
+        return None
+
+    def _replace_row(self, page: int, row: ItemRow) -> bool:
+        """Update a row in place if it keeps its position; returns False if it has to move."""
+        rows = self._pages.get(page)
+        if rows is None:
+            # Not displayed; the page is re-read in full before it is
+            return True
+
+        offset = self._page_ids[page].index(row.id)
+        cursor = (row.sort_value, row.sort_id)
+        if offset > 0 and not self._before((rows[offset - 1].sort_value, rows[offset - 1].sort_id), cursor):
+            return False
+        if offset + 1 < len(rows) and not self._before(cursor, (rows[offset + 1].sort_value, rows[offset + 1].sort_id)):
+            return False
+
+        rows[offset] = row
+        position = self._page_starts[page] + offset
+        self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.COLUMNS) - 1))
+        return True
+
+    def _remove_row(self, page: int, item_id: int) -> None:
+        ids = self._page_ids[page]
+        offset = ids.index(item_id)
+        position = self._page_starts[page] + offset
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del ids[offset]
+        rows = self._pages.get(page)
+        if rows is not None:
+            del rows[offset]
+        self._update_starts()
+        self.endRemoveRows()
+
+    def _insert_row(self, page: int, row: ItemRow) -> None:
+        if page == len(self._page_ids):
+            # First row of an empty table
+            self._page_cursors.append((row.sort_value, row.sort_id))
+            self._page_ids.append(array("q"))
+            self._page_starts.append(self._row_count)
+            self._store_page(page, [])
+
+        rows = self._pages.get(page)
+        if rows is None:
+            # Any position will do: an evicted page is re-read in full before it is displayed
+            offset = 0
+        else:
+            offset = self._count_before([(other.sort_value, other.sort_id) for other in rows], (row.sort_value, row.sort_id))
+        position = self._page_starts[page] + offset
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._page_ids[page].insert(offset, row.id)
+        if rows is not None:
+            rows.insert(offset, row)
+        self._update_starts()
+        self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = _ROOT) -> int:
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent: QModelIndex = _ROOT) -> int:
+        return len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        row = self.get_item_at_row(index.row())
+        if row is None:
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.texts[index.column()]
+
+        elif role == Qt.ItemDataRole.BackgroundRole:
+            # Highlight overdue items
+            if index.column() == 3:
+                return row.background
+
+        elif role == Qt.ItemDataRole.UserRole:
+            # Store item ID for actions
+            return row.id
+
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def get_item_at_row(self, row: int) -> ItemRow | None:
+        """Get the display row at a specific row index, if it is resident."""
+        if not 0 <= row < self._row_count:
+            return None
+        page = bisect_right(self._page_starts, row) - 1
+        rows = self._page(page)
+        offset = row - self._page_starts[page]
+        return rows[offset] if rows is not None and offset < len(rows) else None
+
+    def item_id_at_row(self, row: int) -> int | None:
+        """Get the item id at a row index; known for every fetched row, resident or not."""
+        if not 0 <= row < self._row_count:
+            return None
+        page = bisect_right(self._page_starts, row) - 1
+        return int(self._page_ids[page][row - self._page_starts[page]])
+
+    def resident_row_count(self) -> int:
+        """Number of rows currently held in memory."""
+        return sum(len(rows) for rows in self._pages.values())
+
+    def set_search_text(self, text: str) -> None:
+        """Filter rows to items matching a full-text search of names and tags.
+
+        Matching rows keep the current column sort order rather than being
+        ranked by relevance, so paging and header sorting work unchanged.
+        """
+        self.search_text = text.strip()
+        self._match_query = build_match_query(self.search_text)
+        self.load_items()
+
+    def sort_items(self, column: int, ascending: bool = True) -> None:
+        """Sort items by the specified column."""
+        self.sort_column = column
+        self.ascending = ascending
+        self.load_items()
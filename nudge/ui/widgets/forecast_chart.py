@@ -0,0 +1,113 @@
+"""Bar chart of the review workload forecast."""
+from datetime import date, timedelta
+from typing import List, Sequence, Tuple
+
+from PyQt6.QtCore import QPoint, QRect, QSize, Qt
+from PyQt6.QtGui import QColor, QMouseEvent, QPainter, QPaintEvent
+from PyQt6.QtWidgets import QToolTip, QWidget
+
+BAR_COLOR = QColor("#4A90D9")
+TODAY_COLOR = QColor("#E0584B")  # Today's bar includes everything overdue
+AXIS_COLOR = QColor("#888888")
+# Days are summed into weeks once a day's bar would be narrower than this
+MIN_BAR_WIDTH = 3
+
+
+class ForecastChart(QWidget):
+    """Reviews per day (or per week, for long horizons) as a bar chart.
+
+    Hovering a bar shows its date and count. The first bar is highlighted
+    unless highlight_start is False (for past days, where it is not today).
+    """
+
+    def __init__(
+        self, parent: QWidget | None = None, highlight_start: bool = True, empty_text: str = "No reviews scheduled"
+    ) -> None:
+        super().__init__(parent)
+        self.highlight_start = highlight_start
+        self.empty_text = empty_text
+        self.start = date.today()
+        self.counts: List[int] = []
+        self.setMouseTracking(True)
+        self.setMinimumHeight(100)
+
+    def sizeHint(self) -> QSize:
+        return QSize(600, 140)
+
+    def set_forecast(self, start: date, counts: Sequence[int]) -> None:
+        """Show a forecast.
+
+        Args:
+            start: Day of the first count
+            counts: Number of reviews on each day from start
+        """
+        self.start = start
+        self.counts = [int(count) for count in counts]
+        self.update()
+
+    def _bars(self) -> Tuple[int, List[int]]:
+        """Days per bar and the bar values."""
+        plot_width = max(1, self._plot_rect().width())
+        days_per_bar = 1 if len(self.counts) * MIN_BAR_WIDTH <= plot_width else 7
+        values = [sum(self.counts[i:i + days_per_bar]) for i in range(0, len(self.counts), days_per_bar)]
+        return days_per_bar, values
+
+    def _plot_rect(self) -> QRect:
+        # Room for the scale on the left and the month labels below
+        return self.rect().adjusted(40, 8, -8, -20)
+
+    def paintEvent(self, event: QPaintEvent | None) -> None:
+        painter = QPainter(self)
+        plot = self._plot_rect()
+        days_per_bar, values = self._bars()
+
+        painter.setPen(AXIS_COLOR)
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        if not any(values):
+            painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, self.empty_text)
+            painter.end()
+            return
+
+        peak = max(values) or 1
+        label_rect = QRect(0, plot.top() - 6, plot.left() - 6, 14)
+        painter.drawText(label_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, str(peak))
+
+        bar_width = plot.width() / len(values)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for position, value in enumerate(values):
+            height = round(value / peak * plot.height())
+            if height == 0:
+                continue
+            left = plot.left() + round(position * bar_width)
+            right = plot.left() + round((position + 1) * bar_width)
+            painter.setBrush(TODAY_COLOR if position == 0 and self.highlight_start else BAR_COLOR)
+            painter.drawRect(left, plot.bottom() - height, max(1, right - left - 1), height)
+
+        # Label the first day of each month
+        painter.setPen(AXIS_COLOR)
+        for offset in range(len(self.counts)):
+            day = self.start + timedelta(days=offset)
+            if day.day == 1:
+                x = plot.left() + round(offset / days_per_bar * bar_width)
+                painter.drawText(QPoint(x, plot.bottom() + 15), day.strftime("%b"))
+        painter.end()
+
+    def mouseMoveEvent(self, event: QMouseEvent | None) -> None:
+        plot = self._plot_rect()
+        days_per_bar, values = self._bars()
+        if event is None:
+            return
+        x = event.position().toPoint().x()
+        if not values or not plot.left() <= x <= plot.right():
+            QToolTip.hideText()
+            return
+        position = min(len(values) - 1, int((x - plot.left()) / plot.width() * len(values)))
+        first = self.start + timedelta(days=position * days_per_bar)
+        if days_per_bar == 1:
+            label = first.strftime("%a %Y-%m-%d")
+        else:
+            label = f"Week of {first.isoformat()}"
+        count = values[position]
+        QToolTip.showText(
+            event.globalPosition().toPoint(), f"{label}: {count} review{'s' if count != 1 else ''}", self
+        )
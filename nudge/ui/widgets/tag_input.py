@@ -14,20 +14,7 @@ from PyQt6.QtWidgets import (
 )
 
 from nudge.core.models import Tag
-
-# Material Design color palette
-PRESET_COLORS = [
-    "#FF6B6B",  # Red
-    "#4ECDC4",  # Teal
-    "#45B7D1",  # Blue
-    "#FFA07A",  # Orange
-    "#98D8C8",  # Mint
-    "#F7DC6F",  # Yellow
-    "#BB8FCE",  # Purple
-    "#85C1E2",  # Light Blue
-    "#F8B88B",  # Peach
-    "#52BE80",  # Green
-]
+from nudge.core.tags import PRESET_COLORS, TagInfo, get_or_create_tag_color  # noqa: F401 - re-exported
 
 
 class TagChip(QWidget):
@@ -200,25 +187,10 @@ class TagInputWidget(QWidget):
             color = self.available_tags.get(tag_name, random.choice(PRESET_COLORS))
             self.add_tag(tag_name, color)
     
-    def update_available_tags(self, tags: List[Tag]):
+    def update_available_tags(self, tags: List[TagInfo]) -> None:
         """Update the list of available tags."""
         self.available_tags = {tag.name: tag.color for tag in tags}
         current_text = self.combo.currentText()
         self.combo.clear()
         self.combo.addItems(sorted(self.available_tags.keys()))
         self.combo.setCurrentText(current_text)
-
-
-def get_or_create_tag_color(tag_name: str, existing_tags: dict) -> str:
-    """Get color for a tag or create a random one.
-    
-    Args:
-        tag_name: Name of the tag
-        existing_tags: Dictionary of {tag_name: color}
-        
-    Returns:
-        Hex color code
-    """
-    if tag_name in existing_tags:
-        return existing_tags[tag_name]
-    return random.choice(PRESET_COLORS)
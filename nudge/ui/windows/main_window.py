@@ -1,12 +1,12 @@
 """Main application window."""
-from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, Any, Tuple
 
-from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import QModelIndex, Qt
 from PyQt6.QtWidgets import (
+    QComboBox,
     QHBoxLayout,
     QHeaderView,
+    QLabel,
     QLineEdit,
     QMainWindow,
     QMessageBox,
@@ -18,115 +18,43 @@ from PyQt6.QtWidgets import (
 from sqlalchemy.orm import Session
 
 from nudge.core.database import get_database
-from nudge.core.models import Item, Tag
-from nudge.core.scheduler import get_interval_name, mark_as_reviewed
-from nudge.ui.dialogs.add_item_dialog import AddItemDialog
+from nudge.core.items import create_item, delete_items
+from nudge.core.models import Item, ReviewSchedule
+from nudge.core.scheduler import Grade, mark_many_reviewed
+from nudge.services.db_worker import get_worker
+from nudge.ui.models.item_table_model import ItemTableModel  # Re-exported
+from nudge.ui.widgets.forecast_chart import ForecastChart
 
+if TYPE_CHECKING:
+    from datetime import datetime
 
-class ItemTableModel(QAbstractTableModel):
-    """Table model for displaying study items."""
-    
-    COLUMNS = ["Name", "Tags", "Date Added", "Next Review", "Interval"]
-    
-    def __init__(self, session: Session):
-        super().__init__()
-        self.session = session
-        self.items: List[Item] = []
-        self.load_items()
-    
-    def load_items(self):
-        """Load items from database."""
-        self.beginResetModel()
-        self.items = (
-            self.session.query(Item)
-            .join(Item.review_schedule)
-            .order_by(Item.review_schedule.property.mapper.class_.next_review_date)
-            .all()
-        )
-        self.endResetModel()
-    
-    def rowCount(self, parent=QModelIndex()):
-        return len(self.items)
-    
-    def columnCount(self, parent=QModelIndex()):
-        return len(self.COLUMNS)
-    
-    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
-        if not index.isValid():
-            return None
-        
-        item = self.items[index.row()]
-        col = index.column()
-        
-        if role == Qt.ItemDataRole.DisplayRole:
-            if col == 0:  # Name
-                return item.name
-            elif col == 1:  # Tags
-                return ", ".join(tag.name for tag in item.tags)
-            elif col == 2:  # Date Added
-                return item.date_added.strftime("%Y-%m-%d")
-            elif col == 3:  # Next Review
-                if item.review_schedule:
-                    return item.review_schedule.next_review_date.strftime("%Y-%m-%d")
-                return ""
-            elif col == 4:  # Interval
-                if item.review_schedule:
-                    return get_interval_name(item.review_schedule.current_interval_index)
-                return ""
-        
-        elif role == Qt.ItemDataRole.BackgroundRole:
-            # Highlight overdue items
-            if col == 3 and item.review_schedule:
-                if item.review_schedule.next_review_date.date() < datetime.now().date():
-                    return QColor("#FFE5E5")  # Light red
-                elif item.review_schedule.next_review_date.date() == datetime.now().date():
-                    return QColor("#FFF8E5")  # Light yellow
-        
-        elif role == Qt.ItemDataRole.UserRole:
-            # Store item ID for actions
-            return item.id
-        
-        return None
-    
-    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
-        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
-            return self.COLUMNS[section]
-        return None
-    
-    def get_item_at_row(self, row: int) -> Item | None:
-        """Get item at specific row."""
-        if 0 <= row < len(self.items):
-            return self.items[row]
-        return None
+    from nudge.core.forecast import WorkloadForecast
+
+# (label, days) choices for the forecast horizon
+FORECAST_RANGES = [("3 months", 91), ("6 months", 182), ("12 months", 365)]
+
+
+def _forecast(session: Session, horizon_days: int) -> "WorkloadForecast":
+    """Worker task computing the review forecast."""
+    # Imported here so NumPy loads on the worker, after startup
+    from nudge.core.forecast import forecast_workload
     
-    def sort_items(self, column: int, ascending: bool = True):
-        """Sort items by the specified column."""
-        reverse = not ascending
-        
-        if column == 0:  # Name
-            self.items.sort(key=lambda x: x.name.lower(), reverse=reverse)
-        elif column == 1:  # Tags
-            self.items.sort(key=lambda x: ", ".join(tag.name for tag in x.tags).lower(), reverse=reverse)
-        elif column == 2:  # Date Added
-            self.items.sort(key=lambda x: x.date_added, reverse=reverse)
-        elif column == 3:  # Next Review
-            self.items.sort(key=lambda x: x.review_schedule.next_review_date if x.review_schedule else datetime.max, reverse=reverse)
-        elif column == 4:  # Interval
-            self.items.sort(key=lambda x: x.review_schedule.current_interval_index if x.review_schedule else -1, reverse=reverse)
-        
-        self.layoutChanged.emit()
+    return forecast_workload(session, horizon_days)
 
 
 class MainWindow(QMainWindow):
     """Main application window."""
     
-    def __init__(self):
+    def __init__(self, session: Session | None = None):
         super().__init__()
         self.db = get_database()
-        self.session = self.db.get_session()
+        self.session = session or self.db.get_session()
+        # All database work for the window runs here, off the GUI thread;
+        # the table follows the worker's change notifications
+        self.worker = get_worker()
         
+        # The table model starts loading its first page when it is created
         self.setup_ui()
-        self.load_data()
     
     def setup_ui(self):
         """Set up the user interface."""
@@ -157,20 +85,26 @@ class MainWindow(QMainWindow):
         self.refresh_btn.clicked.connect(self.refresh_data)
         toolbar.addWidget(self.refresh_btn)
         
+        # Statistics button
+        self.stats_btn = QPushButton("Statistics")
+        self.stats_btn.clicked.connect(self.show_statistics)
+        toolbar.addWidget(self.stats_btn)
+        self.stats_dialog = None
+        
         layout.addLayout(toolbar)
         
         # Table view
         self.table = QTableView()
         self.table.setAlternatingRowColors(True)
         self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.table.setSortingEnabled(True)
         self.table.horizontalHeader().sortIndicatorChanged.connect(self.on_sort_changed)
         self.table.doubleClicked.connect(self.on_table_double_click)
         
-        self.model = ItemTableModel(self.session)
+        self.model = ItemTableModel(self.session, worker=self.worker)
         self.table.setModel(self.model)
         
         layout.addWidget(self.table)
@@ -178,16 +112,54 @@ class MainWindow(QMainWindow):
         # Action buttons
         action_layout = QHBoxLayout()
         
-        self.mark_reviewed_btn = QPushButton("Mark as Reviewed")
+        self.mark_reviewed_btn = QPushButton("Mark Selected as Reviewed")
         self.mark_reviewed_btn.clicked.connect(self.mark_as_reviewed)
         action_layout.addWidget(self.mark_reviewed_btn)
         
+        # How well the selected items were recalled
+        self.grade_combo = QComboBox()
+        for grade in Grade:
+            self.grade_combo.addItem(grade.name.capitalize(), grade)
+        self.grade_combo.setCurrentIndex(self.grade_combo.findData(Grade.GOOD))
+        action_layout.addWidget(self.grade_combo)
+        
         self.delete_btn = QPushButton("Delete Item")
         self.delete_btn.clicked.connect(self.delete_item)
         action_layout.addWidget(self.delete_btn)
         
         action_layout.addStretch()
         layout.addLayout(action_layout)
+        
+        # Review workload forecast, computed once the table has loaded and after every change
+        forecast_header = QHBoxLayout()
+        forecast_header.addWidget(QLabel("Review forecast"))
+        forecast_header.addStretch()
+        self.forecast_range = QComboBox()
+        for label, days in FORECAST_RANGES:
+            self.forecast_range.addItem(label, days)
+        self.forecast_range.setCurrentIndex(1)
+        self.forecast_range.currentIndexChanged.connect(self.refresh_forecast)
+        forecast_header.addWidget(self.forecast_range)
+        layout.addLayout(forecast_header)
+        
+        self.forecast_chart = ForecastChart()
+        layout.addWidget(self.forecast_chart)
+        
+        self.model.loaded.connect(self._on_first_load)
+        self.worker.changes.connect(self.refresh_forecast)
+    
+    def _on_first_load(self) -> None:
+        self.model.loaded.disconnect(self._on_first_load)
+        self.refresh_forecast()
+    
+    def refresh_forecast(self, *args: Any) -> None:
+        """Recompute the review forecast on the worker; a newer request supersedes a running one."""
+        horizon_days = self.forecast_range.currentData()
+        self.worker.submit(
+            lambda session: _forecast(session, horizon_days),
+            lambda forecast: self.forecast_chart.set_forecast(forecast.start, forecast.counts.tolist()),
+            key="review-forecast",
+        )
     
     def load_data(self):
         """Load data into the table."""
@@ -197,101 +169,101 @@ class MainWindow(QMainWindow):
         """Refresh the table data."""
         self.session.expire_all()
         self.load_data()
+        self.refresh_forecast()
     
     def on_search(self, text: str):
         """Handle search text change."""
-        # Simple filtering - reload with filter
-        text = text.lower().strip()
-        if not text:
-            self.load_data()
-            return
-        
-        self.model.beginResetModel()
-        all_items = self.session.query(Item).all()
-        self.model.items = [
-            item for item in all_items
-            if text in item.name.lower() or
-            any(text in tag.name.lower() for tag in item.tags)
-        ]
-        self.model.endResetModel()
+        # Filtering happens in the model's paged query
+        self.model.set_search_text(text)
     
     def add_item(self):
         """Show dialog to add new item."""
-        dialog = AddItemDialog(self.session, self)
+        # Imported on first use to keep it out of startup
+        from nudge.ui.dialogs.add_item_dialog import AddItemDialog
+        
+        dialog = AddItemDialog(self.session, self, worker=self.worker)
         if dialog.exec():
             item_name, tag_names = dialog.get_item_data()
-            
-            # Create item
-            from nudge.core.models import Item, Tag
-            from nudge.core.scheduler import create_review_schedule
-            
-            item = Item(name=item_name)
-            
-            # Add tags
-            for tag_name in tag_names:
-                tag = self.session.query(Tag).filter_by(name=tag_name).first()
-                if not tag:
-                    # Create new tag with random color
-                    from nudge.ui.widgets.tag_input import get_or_create_tag_color
-                    existing_tags = {t.name: t.color for t in self.session.query(Tag).all()}
-                    color = get_or_create_tag_color(tag_name, existing_tags)
-                    tag = Tag(name=tag_name, color=color)
-                    self.session.add(tag)
-                    self.session.flush()  # Flush to ensure tag gets an ID
-                item.tags.append(tag)
-            
-            self.session.add(item)
-            self.session.flush()  # Flush to ensure item gets an ID before review schedule
-            self.session.commit()
-            
-            # Create review schedule
-            create_review_schedule(self.session, item)
-            
-            self.refresh_data()
+            self.worker.submit(
+                lambda session: create_item(session, item_name, tag_names).id,
+                on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to add item: {str(e)}"),
+            )
+    
+    def show_statistics(self) -> None:
+        """Show the statistics dialog."""
+        # Imported on first use to keep it out of startup
+        from nudge.ui.dialogs.stats_dialog import StatsDialog
+        
+        if self.stats_dialog is None:
+            self.stats_dialog = StatsDialog(self.worker, self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
     
     def mark_as_reviewed(self):
-        """Mark selected item as reviewed."""
+        """Mark all selected items as reviewed."""
         selected = self.table.selectionModel().selectedRows()
         if not selected:
             QMessageBox.warning(self, "No Selection", "Please select an item to mark as reviewed.")
             return
         
-        row = selected[0].row()
-        item = self.model.get_item_at_row(row)
+        # Ids are known for every fetched row, including ones on pages evicted from memory
+        row_ids = [self.model.item_id_at_row(index.row()) for index in selected]
+        ids = [item_id for item_id in row_ids if item_id is not None]
+        if not ids:
+            return
+        grade = self.grade_combo.currentData()
+        
+        def review(session: Session) -> Tuple[int, str, "datetime"]:
+            count = mark_many_reviewed(session, ids, grade=grade)
+            schedule = session.query(ReviewSchedule).filter_by(item_id=ids[0]).one()
+            name = session.query(Item.name).filter_by(id=ids[0]).scalar()
+            return count, name, schedule.next_review_date
         
-        if item:
-            try:
-                mark_as_reviewed(self.session, item.id)
-                self.refresh_data()
+        def on_reviewed(result: Tuple[int, str, "datetime"]) -> None:
+            count, name, next_review_date = result
+            if len(ids) == 1:
                 QMessageBox.information(
                     self, "Success",
-                    f"Item '{item.name}' marked as reviewed!\nNext review: {item.review_schedule.next_review_date.strftime('%Y-%m-%d')}"
+                    f"Item '{name}' marked as reviewed!\nNext review: {next_review_date.strftime('%Y-%m-%d')}"
                 )
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to mark item as reviewed: {str(e)}")
+            else:
+                QMessageBox.information(self, "Success", f"{count} items marked as reviewed!")
+        
+        self.worker.submit(
+            review,
+            on_reviewed,
+            lambda e: QMessageBox.critical(self, "Error", f"Failed to mark items as reviewed: {str(e)}"),
+        )
     
     def delete_item(self):
-        """Delete selected item."""
+        """Delete all selected items."""
         selected = self.table.selectionModel().selectedRows()
         if not selected:
             QMessageBox.warning(self, "No Selection", "Please select an item to delete.")
             return
         
-        row = selected[0].row()
-        item = self.model.get_item_at_row(row)
+        row_ids = [self.model.item_id_at_row(index.row()) for index in selected]
+        ids = [item_id for item_id in row_ids if item_id is not None]
+        if not ids:
+            return
+        
+        if len(ids) == 1:
+            item = self.model.get_item_at_row(selected[0].row())
+            question = f"Delete item '{item.name}'?" if item else "Delete the selected item?"
+        else:
+            question = f"Delete {len(ids)} items?"
+        reply = QMessageBox.question(
+            self, "Confirm Delete",
+            f"{question}\nThis cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
         
-        if item:
-            reply = QMessageBox.question(
-                self, "Confirm Delete",
-                f"Delete item '{item.name}'?\nThis cannot be undone.",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.No
+        if reply == QMessageBox.StandardButton.Yes:
+            self.worker.submit(
+                lambda session: delete_items(session, ids),
+                on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to delete items: {str(e)}"),
             )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                self.session.delete(item)
-                self.session.commit()
-                self.refresh_data()
     
     def on_sort_changed(self, logicalIndex, order):
         """Handle sort order change."""
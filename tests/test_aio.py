@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("greenlet")
+pytest.importorskip("aiosqlite")
+
+from nudge.core import aio  # noqa: E402
+from nudge.core.database import SCHEMA_VERSION, Database, get_schema_version  # noqa: E402
+from nudge.core.items import create_item  # noqa: E402
+from nudge.core.models import Item  # noqa: E402
+
+
+def test_async_database_shares_schema_and_queries(tmp_path):
+    db_path = str(tmp_path / "nudge.db")
+
+    async def scenario():
+        async with aio.AsyncDatabase(db_path) as db:
+            async with db.engine.connect() as conn:
+                assert await conn.run_sync(get_schema_version) == SCHEMA_VERSION
+                assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+
+            # Any synchronous core function runs through db.run
+            items = [await db.run(lambda s, i=i: create_item(s, f"async item {i}", ["python"]).id) for i in range(3)]
+            async with db.get_session() as session:
+                assert await aio.count_due(session, datetime.now() + timedelta(days=2)) == 3
+                due = await aio.get_due_items(session, days_ahead=2, limit=2)
+                assert [row.id for row in due] == items[:2]
+
+                schedule = await aio.mark_as_reviewed(session, items[0])
+                assert schedule.review_count == 1
+                assert await aio.mark_many_reviewed(session, items[1:]) == 2
+                with pytest.raises(ValueError, match="999"):
+                    await aio.mark_many_reviewed(session, [999])
+
+                found = await aio.search_items(session, "async")
+                assert [tag.name for tag in found[0].tags] == ["python"]
+                assert found[0].review_schedule.review_count == 1
+                assert await aio.count_by_status(session) == [("learning", 3)]
+                assert await aio.count_by_tag(session) == [("python", 3, 0)]
+
+                item = Item(name="scheduled later")
+                session.add(item)
+                await session.commit()
+                schedule = await aio.create_review_schedule(session, item)
+                assert schedule.item_id == item.id
+
+            # Many concurrent readers share the pool
+            async def count():
+                async with db.get_session() as session:
+                    return await aio.count_due(session, datetime.now() + timedelta(days=400))
+
+            assert await asyncio.gather(*(count() for _ in range(50))) == [4] * 50
+
+    asyncio.run(scenario())
+
+    # The sync path sees the same data
+    db = Database(db_path)
+    session = db.get_session()
+    try:
+        assert session.query(Item).count() == 4
+    finally:
+        session.close()
+        db.close()
+
+
+def test_reviewing_twice_in_one_session_returns_the_current_schedule(tmp_path):
+    async def scenario():
+        async with aio.AsyncDatabase(str(tmp_path / "nudge.db")) as db:
+            item_id = await db.run(lambda s: create_item(s, "decorators", ["python"]).id)
+            async with db.get_session() as session:
+                first = await aio.mark_as_reviewed(session, item_id)
+                assert (first.review_count, first.current_interval_index) == (1, 1)
+                second = await aio.mark_as_reviewed(session, item_id)
+                assert (second.review_count, second.current_interval_index) == (2, 2)
+
+    asyncio.run(scenario())
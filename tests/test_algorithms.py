@@ -0,0 +1,132 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from nudge import cli
+from nudge.core.algorithms import FSRS, SM2, load_cards
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.models import ReviewSchedule
+from nudge.core.scheduler import (
+    INTERVALS,
+    Grade,
+    count_due,
+    get_algorithm,
+    make_algorithm,
+    mark_as_reviewed,
+    mark_many_reviewed,
+    set_algorithm,
+)
+
+NOW = datetime(2024, 3, 1, 9, 0)
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    yield session
+    session.close()
+    db.close()
+
+
+def _import(session, schedules):
+    """Import one item per (interval index, review count, days since last review) triple."""
+    records = []
+    for i, (index, reviews, days_ago) in enumerate(schedules):
+        last = NOW - timedelta(days=days_ago) if reviews else None
+        next_review = (last or NOW) + timedelta(days=INTERVALS[index])
+        records.append(ImportRecord(f"item {i}", [], NOW - timedelta(days=400), next_review, last, index, reviews))
+    import_records(session, records)
+    return list(range(1, len(records) + 1))
+
+
+def test_fixed_ladder_grades(session):
+    ids = _import(session, [(3, 4, 14)] * 4)
+    for item_id, grade in zip(ids, Grade):
+        schedule = mark_as_reviewed(session, item_id, NOW, grade=grade)
+        assert schedule.review_count == 5
+    indexes = [s.current_interval_index for s in session.query(ReviewSchedule).order_by(ReviewSchedule.item_id)]
+    assert indexes == [0, 3, 4, 5]
+
+
+def test_sm2_intervals_grow_by_ease(session):
+    set_algorithm(session, SM2(), NOW)
+    (item_id,) = _import(session, [(0, 0, 0)])
+    reviewed_at, gaps = NOW, []
+    for _ in range(3):
+        schedule = mark_as_reviewed(session, item_id, reviewed_at, grade=Grade.GOOD)
+        gaps.append((schedule.next_review_date - reviewed_at).days)
+        reviewed_at = schedule.next_review_date
+    # Good (q=4) leaves the ease at 2.5
+    assert gaps == [1, 6, 15]
+    assert schedule.ease == pytest.approx(2.5)
+
+    schedule = mark_as_reviewed(session, item_id, reviewed_at, grade=Grade.AGAIN)
+    assert schedule.next_review_date - reviewed_at == timedelta(days=1)
+    assert schedule.ease == pytest.approx(2.5 - 0.54)
+    assert schedule.current_interval_index == 0
+
+
+def test_fsrs_matches_scalar_formulas(session):
+    fsrs = FSRS()
+    w = fsrs.w
+    set_algorithm(session, fsrs, NOW)
+    new_id, reviewed_id = _import(session, [(0, 0, 0), (3, 4, 20)])
+
+    schedule = mark_as_reviewed(session, new_id, NOW, grade=Grade.GOOD)
+    assert schedule.stability == pytest.approx(w[2])
+    assert schedule.difficulty == pytest.approx(w[4])
+    assert schedule.next_review_date == NOW + timedelta(days=round(w[2]))
+
+    # Imported with a 14 day interval but no FSRS state: that interval is taken as its stability
+    stability, difficulty = 14.0, w[4]
+    recall = (1 + FSRS.FACTOR * 20 / stability) ** FSRS.DECAY
+    expected = stability * (
+        1 + math.exp(w[8]) * (11 - difficulty) * stability ** -w[9] * (math.exp(w[10] * (1 - recall)) - 1) * w[15]
+    )
+    schedule = mark_as_reviewed(session, reviewed_id, NOW, grade=Grade.HARD)
+    assert schedule.stability == pytest.approx(expected)
+    assert schedule.difficulty == pytest.approx(w[7] * w[4] + (1 - w[7]) * (difficulty + w[6]))
+    # At 90% desired retention the interval equals the stability
+    assert schedule.next_review_date == NOW + timedelta(days=round(expected))
+
+
+def test_switching_algorithms_reschedules_in_bulk(session):
+    ids = _import(session, [(index, 3, days_ago) for index in range(len(INTERVALS)) for days_ago in (0, 5, 30)])
+    due_before = count_due(session, NOW)
+
+    assert set_algorithm(session, make_algorithm("fsrs"), NOW) == len(ids)
+    assert get_algorithm(session).name == "fsrs"
+    # Stability starts at the current interval, so the schedule is unchanged at 90% retention
+    assert count_due(session, NOW) == due_before
+    cards = load_cards(session, ids)
+    assert np.all(cards.stability == [INTERVALS[index] for index in range(len(INTERVALS)) for _ in range(3)])
+
+    # Lower retention stretches every interval
+    assert set_algorithm(session, make_algorithm("fsrs", {"desired_retention": 0.7}), NOW) == len(ids)
+    assert get_algorithm(session).params["desired_retention"] == 0.7
+    assert count_due(session, NOW) < due_before
+    assert np.all(load_cards(session, ids).next_review >= cards.next_review)
+
+    # Switching back keeps the dates and state
+    assert set_algorithm(session, make_algorithm("fixed"), NOW) == 0
+    assert mark_many_reviewed(session, ids, NOW) == len(ids)
+
+    with pytest.raises(ValueError, match="Unknown"):
+        make_algorithm("leitner")
+    with pytest.raises(ValueError, match="desired_retention"):
+        make_algorithm("fsrs", {"desired_retention": 2})
+
+
+def test_cli_algorithm_and_grade(tmp_path, capsys):
+    db_path = str(tmp_path / "nudge.db")
+    assert cli.main(["add", "Decorators", "--db", db_path]) == 0
+    assert cli.main(["algorithm", "fsrs", "-p", "desired_retention=0.85", "--db", db_path]) == 0
+    assert cli.main(["review", "1", "--grade", "easy", "--db", db_path]) == 0
+    assert cli.main(["algorithm", "--db", db_path]) == 0
+    out = capsys.readouterr().out
+    assert "Switched to fsrs" in out
+    assert "desired_retention = 0.85" in out
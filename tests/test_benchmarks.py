@@ -0,0 +1,45 @@
+import io
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from benchmarks.generator import generate_database, generate_records
+from benchmarks.runner import Timing, compare, run
+from nudge.core.database import Database
+from nudge.core.models import Item, ReviewSchedule
+
+NOW = datetime(2024, 3, 1)
+
+
+def test_generator_is_deterministic():
+    first = list(generate_records(300, seed=7, now=NOW))
+    assert first == list(generate_records(300, seed=7, now=NOW))
+    assert first != list(generate_records(300, seed=8, now=NOW))
+
+    # A mix of new and reviewed items, some of them overdue
+    assert any(record.review_count == 0 for record in first)
+    assert any(record.interval_index > 2 for record in first)
+    assert any(record.next_review_date < NOW for record in first)
+    assert all(record.last_review_date is None or record.last_review_date <= NOW for record in first)
+
+
+def test_generated_database_and_run(tmp_path):
+    path = generate_database(tmp_path / "bench.db", 500, seed=7)
+    db = Database(str(path))
+    session = db.get_session()
+    try:
+        assert session.scalar(select(func.count()).select_from(Item)) == 500
+        assert session.scalar(select(func.count()).select_from(ReviewSchedule)) == 500
+    finally:
+        session.close()
+        db.close()
+
+    results = run([500], "scheduler.*", repeat=2, min_time=0, data_dir=tmp_path, seed=7)
+    assert set(results) >= {"scheduler.get_due_items", "scheduler.mark_as_reviewed"}
+    assert all(timing.samples >= 2 for sizes in results.values() for timing in sizes.values())
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"10": Timing(5, 1.0, 1.0, 1.0)}, "b": {"10": Timing(5, 1.0, 1.0, 1.0)}}
+    current = {"a": {"10": Timing(5, 1.1, 1.1, 1.1)}, "b": {"10": Timing(5, 2.0, 2.0, 2.0)}}
+    assert compare(current, baseline, threshold=1.25, file=io.StringIO()) == ["b@10"]
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from nudge import cli
+from nudge.core.exporter import EXPORT_FORMATS
+from nudge.core.importer import DEFAULT_CHUNK_SIZE, FORMATS
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Budget for the import time of nudge's own modules on the CLI path; the
+# rest is the interpreter and SQLAlchemy
+NUDGE_IMPORT_BUDGET_US = 50_000
+
+
+def test_add_review_and_export_round_trip(tmp_path, capsys):
+    db = str(tmp_path / "nudge.db")
+    assert cli.main(["add", "Decorators", "-t", "python", "-t", "advanced", "--db", db]) == 0
+    assert cli.main(["add", "Joins", "--db", db]) == 0
+    assert cli.main(["review", "1", "--db", db]) == 0
+    capsys.readouterr()
+
+    assert cli.main(["upcoming", "--days", "5", "--db", db]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    # Ordered by next review: the reviewed item moved three days out
+    assert lines[0].endswith("Joins")
+    assert lines[1].endswith("Decorators  [advanced, python]")
+
+    export = tmp_path / "deck.jsonl"
+    assert cli.main(["export", str(export), "--db", db]) == 0
+    copy = str(tmp_path / "copy.db")
+    assert cli.main(["import", str(export), "-q", "--db", copy]) == 0
+    capsys.readouterr()
+    assert cli.main(["stats", "--db", copy]) == 0
+    stats = capsys.readouterr().out
+    assert "Items:     2" in stats and "Tags:      2" in stats
+    assert cli.main(["stats", "--rebuild", "--db", db]) == 0
+    stats = capsys.readouterr().out
+    assert "Streak:    1 days (longest 1)" in stats and "By step:   0: 1, 1: 1" in stats
+
+
+def test_errors_exit_non_zero(tmp_path, capsys):
+    assert cli.main(["review", "42", "--db", str(tmp_path / "nudge.db")]) == 1
+    assert "No review schedule found" in capsys.readouterr().err
+
+
+def test_parser_defaults_match_core():
+    assert cli.IMPORT_FORMATS == FORMATS
+    assert cli.EXPORT_FORMATS == EXPORT_FORMATS
+    assert cli.DEFAULT_CHUNK_SIZE == DEFAULT_CHUNK_SIZE
+
+
+def test_cli_startup_does_not_import_gui(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "nudge", "due", "--count", "--db", str(tmp_path / "nudge.db")],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+        check=True,
+    )
+    assert completed.stdout.strip() == "0"
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us, _, name = line[len("import time:"):].split("|")
+            if self_us.strip().isdigit():
+                modules[name.strip()] = int(self_us)
+    assert "nudge.cli" in modules
+    assert not [name for name in modules if name.split(".")[0] in ("PyQt6", "numpy")]
+    assert sum(us for name, us in modules.items() if name.split(".")[0] == "nudge") < NUDGE_IMPORT_BUDGET_US
+
+
+def test_help_runs_the_cli_without_qt(tmp_path):
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    for flag in ("--help", "-h"):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "nudge", flag],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=tmp_path,
+            check=True,
+        )
+        assert completed.stdout.startswith("usage: nudge")
+        assert "PyQt6" not in completed.stderr
@@ -0,0 +1,147 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from nudge.core import database
+from nudge.core.database import SCHEMA_VERSION, Database
+
+LEGACY_SCHEMA = """
+CREATE TABLE items (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    date_added DATETIME NOT NULL
+);
+CREATE TABLE tags (
+    id INTEGER NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL UNIQUE,
+    color VARCHAR NOT NULL
+);
+CREATE TABLE item_tags (
+    item_id INTEGER NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags (id) ON DELETE CASCADE,
+    PRIMARY KEY (item_id, tag_id)
+);
+CREATE TABLE review_schedules (
+    id INTEGER NOT NULL PRIMARY KEY,
+    item_id INTEGER NOT NULL UNIQUE REFERENCES items (id) ON DELETE CASCADE,
+    current_interval_index INTEGER NOT NULL,
+    review_count INTEGER NOT NULL,
+    last_review_date DATETIME,
+    next_review_date DATETIME NOT NULL,
+    status VARCHAR NOT NULL
+);
+INSERT INTO items (id, name, date_added) VALUES (1, 'Decorators', '2024-01-01 00:00:00');
+INSERT INTO review_schedules VALUES (1, 1, 0, 0, NULL, '2024-01-02 00:00:00', 'learning');
+"""
+
+
+def _index_names(db: Database, table: str) -> set:
+    return {index["name"] for index in inspect(db.engine).get_indexes(table)}
+
+
+def _user_version(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_fresh_database_is_stamped_with_latest_version(tmp_path):
+    db_path = str(tmp_path / "nudge.db")
+    db = Database(db_path)
+    try:
+        assert "ix_review_schedules_status_next_review_date" in _index_names(db, "review_schedules")
+        assert "ix_item_tags_tag_id" in _index_names(db, "item_tags")
+    finally:
+        db.close()
+    assert _user_version(db_path) == SCHEMA_VERSION
+
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    db = Database(db_path)
+    try:
+        assert {
+            "ix_review_schedules_next_review_date",
+            "ix_review_schedules_status_next_review_date",
+        } <= _index_names(db, "review_schedules")
+        assert "ix_item_tags_tag_id" in _index_names(db, "item_tags")
+        assert {"ix_review_log_item_id_ts", "ix_review_log_ts"} <= _index_names(db, "review_log")
+        with db.engine.connect() as connection:
+            assert connection.exec_driver_sql("SELECT name FROM items").scalar() == "Decorators"
+            # Every review gets its own row, even two of one item in the same second
+            connection.exec_driver_sql(
+                "INSERT INTO review_log (item_id, ts, grade, interval_days) VALUES (1, 1704103200, 1, 1), (1, 1704103200, 3, 3)"
+            )
+            assert connection.exec_driver_sql("SELECT count(*) FROM review_log").scalar() == 2
+            connection.rollback()
+            # The search index is backfilled from existing items
+            assert connection.exec_driver_sql("SELECT rowid FROM items_fts WHERE items_fts MATCH 'deco*'").scalar() == 1
+            assert connection.exec_driver_sql("SELECT tag_key FROM items").scalar() == ""
+    finally:
+        db.close()
+    assert _user_version(db_path) == SCHEMA_VERSION
+
+    # Re-opening an up-to-date database is a no-op
+    Database(db_path).close()
+    assert _user_version(db_path) == SCHEMA_VERSION
+
+
+def test_failed_migration_leaves_the_database_untouched(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    def fail(conn):
+        raise RuntimeError("backfill failed")
+
+    monkeypatch.setattr(database, "rebuild_tag_keys", fail)
+    with pytest.raises(RuntimeError, match="backfill"):
+        Database(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        assert "tag_key" not in {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+        assert conn.execute("SELECT count(*) FROM sqlite_master WHERE name = 'items_fts'").fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert _user_version(db_path) == 0
+
+    monkeypatch.undo()
+    Database(db_path).close()
+    assert _user_version(db_path) == SCHEMA_VERSION
+
+
+def test_profile_pragmas_are_applied_on_connect(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    try:
+        with db.engine.connect() as connection:
+            pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("foreign_keys") == 1
+            assert pragma("busy_timeout") == db.profile.busy_timeout_ms
+            assert pragma("temp_store") == 2  # MEMORY
+    finally:
+        db.close()
+
+
+def test_foreign_key_cascades_fire(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    try:
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO items (id, name, date_added) VALUES (1, 'a', '2024-01-01')")
+            connection.exec_driver_sql(
+                "INSERT INTO review_schedules (item_id, current_interval_index, review_count, next_review_date, status)"
+                " VALUES (1, 0, 0, '2024-01-02', 'learning')"
+            )
+            connection.exec_driver_sql("DELETE FROM items WHERE id = 1")
+            assert connection.exec_driver_sql("SELECT COUNT(*) FROM review_schedules").scalar() == 0
+    finally:
+        db.close()
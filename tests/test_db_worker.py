@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from sqlalchemy import text
+
+from nudge.core.database import Database
+from nudge.services.db_worker import DatabaseWorker
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def worker(qapp, tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    worker = DatabaseWorker(db)
+    yield worker
+    worker.shutdown()
+    db.close()
+
+
+def _wait(qapp, worker, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while worker.pending_count() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert worker.pending_count() == 0
+
+
+def test_results_are_delivered_on_the_gui_thread(qapp, worker):
+    delivered = []
+    worker.submit(
+        lambda session: (session.execute(text("SELECT 42")).scalar(), threading.get_ident()),
+        lambda result: delivered.append((result, threading.get_ident())),
+    )
+    _wait(qapp, worker)
+
+    [((value, worker_thread), gui_thread)] = delivered
+    assert value == 42
+    assert gui_thread == threading.get_ident() != worker_thread
+
+
+def test_errors_go_to_on_error(qapp, worker):
+    errors = []
+    worker.submit(lambda session: session.execute(text("SELECT * FROM missing")), on_error=errors.append)
+    _wait(qapp, worker)
+    assert len(errors) == 1
+
+
+def test_same_key_supersedes_pending_request(qapp, worker):
+    started = threading.Event()
+
+    def slow(session):
+        started.set()
+        # Runs until interrupted by cancel()
+        return session.execute(
+            text("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c")
+        ).scalar()
+
+    results = []
+    first = worker.submit(slow, results.append, on_error=results.append, key="search")
+    assert started.wait(5)
+    worker.submit(lambda session: "latest", results.append, key="search")
+    _wait(qapp, worker)
+
+    assert first.cancelled
+    assert results == ["latest"]
@@ -0,0 +1,53 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from nudge.core.database import Database
+from nudge.core.forecast import forecast_workload, project_reviews, review_offsets
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.scheduler import INTERVALS
+
+
+def _simulate(interval_indexes, due_days, horizon_days):
+    """Reference: step each card forward one review at a time."""
+    counts = [0] * horizon_days
+    for index, day in zip(interval_indexes, due_days):
+        day = max(day, 0)
+        while day < horizon_days:
+            counts[day] += 1
+            index = min(index + 1, len(INTERVALS) - 1)
+            day += INTERVALS[index]
+    return counts
+
+
+def test_review_offsets_follow_the_ladder():
+    assert review_offsets(0, 30) == [0, 3, 10, 24]
+    assert review_offsets(len(INTERVALS) - 1, 365) == [0, 120, 240, 360]
+
+
+def test_projection_matches_step_by_step_simulation():
+    rng = np.random.default_rng(3)
+    indexes = rng.integers(0, len(INTERVALS), 2000)
+    days = rng.integers(-20, 400, 2000)
+    assert project_reviews(indexes, days, 365).tolist() == _simulate(indexes, days, 365)
+
+
+def test_forecast_workload(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    today = date.today()
+    noon = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    import_records(session, [
+        # Overdue, counted today
+        ImportRecord(name="a", interval_index=0, next_review_date=noon - timedelta(days=5)),
+        ImportRecord(name="b", interval_index=2, next_review_date=noon + timedelta(days=2)),
+        # Beyond the horizon
+        ImportRecord(name="c", interval_index=6, next_review_date=noon + timedelta(days=200)),
+    ])
+
+    forecast = forecast_workload(session, 30)
+    assert forecast.start == today
+    assert forecast.counts.tolist() == _simulate([0, 2], [0, 2], 30)
+    assert forecast.dates[2] == today + timedelta(days=2)
+    session.close()
+    db.close()
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from nudge.core.database import Database
+from nudge.core.history import (
+    RetentionPoint,
+    Streak,
+    TagAccuracy,
+    accuracy_by_tag,
+    from_timestamp,
+    retention_curve,
+    review_streak,
+    reviews_per_day,
+)
+from nudge.core.items import create_item, delete_item
+from nudge.core.models import ReviewLog
+from nudge.core.scheduler import Grade, mark_as_reviewed, mark_many_reviewed
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    yield session
+    session.close()
+    db.close()
+
+
+def test_reviews_are_logged_with_the_schedule(session):
+    python = create_item(session, "decorators", ["python"]).id
+    rust = create_item(session, "lifetimes", ["rust"]).id
+    start = datetime(2026, 3, 2, 9, 30)
+
+    mark_as_reviewed(session, python, start, Grade.GOOD)
+    mark_many_reviewed(session, [python, rust], start + timedelta(days=3), Grade.AGAIN)
+    with pytest.raises(ValueError):
+        mark_many_reviewed(session, [rust, 999], start + timedelta(days=4))
+
+    rows = session.query(ReviewLog).order_by(ReviewLog.ts, ReviewLog.item_id).all()
+    assert [(row.item_id, from_timestamp(row.ts), row.grade, row.interval_days) for row in rows] == [
+        (python, start, Grade.GOOD, 3),
+        (python, start + timedelta(days=3), Grade.AGAIN, 1),
+        (rust, start + timedelta(days=3), Grade.AGAIN, 1),
+    ]
+
+    delete_item(session, rust)
+    assert session.query(ReviewLog).filter_by(item_id=rust).count() == 0
+
+
+def test_reviews_within_one_second_are_all_logged(session):
+    item_id = create_item(session, "decorators", ["python"]).id
+    second = datetime(2026, 3, 2, 9, 0)
+
+    mark_as_reviewed(session, item_id, second + timedelta(milliseconds=100), Grade.AGAIN)
+    schedule = mark_as_reviewed(session, item_id, second + timedelta(milliseconds=900), Grade.GOOD)
+
+    rows = session.query(ReviewLog).filter_by(item_id=item_id).order_by(ReviewLog.id).all()
+    assert schedule.review_count == len(rows) == 2
+    assert [(from_timestamp(row.ts), row.grade) for row in rows] == [(second, Grade.AGAIN), (second, Grade.GOOD)]
+
+
+def test_history_aggregates(session):
+    python = [create_item(session, f"python {i}", ["python"]).id for i in range(2)]
+    rust = create_item(session, "rust", ["rust", "python"]).id
+    start = datetime(2026, 3, 2, 9, 30)
+    day = timedelta(days=1)
+
+    # Reviews on days 0, 1, 2 and 5: gaps of 1 day (three, one forgotten) and 5 days
+    mark_many_reviewed(session, [*python, rust], start)
+    mark_many_reviewed(session, python, start + day)
+    mark_as_reviewed(session, python[0], start + 2 * day, Grade.AGAIN)
+    mark_as_reviewed(session, rust, start + 5 * day, Grade.HARD)
+
+    assert retention_curve(session) == [RetentionPoint(1, 3, 2), RetentionPoint(5, 1, 1)]
+    assert retention_curve(session, max_days=2) == [RetentionPoint(1, 3, 2), RetentionPoint(2, 1, 1)]
+    assert retention_curve(session, since=start + 2 * day)[0].retention == 0.0
+
+    assert review_streak(session, today=date(2026, 3, 7)) == Streak(current=1, longest=3)
+    assert review_streak(session, today=date(2026, 3, 9)) == Streak(current=0, longest=3)
+    assert reviews_per_day(session, days=4, today=date(2026, 3, 5)) == [
+        (date(2026, 3, 2), 3), (date(2026, 3, 3), 2), (date(2026, 3, 4), 1), (date(2026, 3, 5), 0),
+    ]
+
+    assert accuracy_by_tag(session) == [TagAccuracy("python", 7, 6), TagAccuracy("rust", 2, 2)]
+    assert accuracy_by_tag(session, since=start + day)[0] == TagAccuracy("python", 4, 3)
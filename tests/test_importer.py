@@ -0,0 +1,95 @@
+from nudge.core.database import Database
+from nudge.core.exporter import export_file
+from nudge.core.importer import import_file
+from nudge.core.items import create_item
+from nudge.core.models import Item, Tag
+
+
+def test_import_csv_in_chunks(tmp_path):
+    deck = tmp_path / "deck.csv"
+    deck.write_text(
+        "name,tags,interval_index\n"
+        "Decorators,python;advanced,6\n"
+        "Generators,python,\n"
+        ",orphan,\n"
+        "Closures,\"python,scope\",1\n"
+    )
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    try:
+        result = import_file(session, deck, chunk_size=2)
+        assert (result.items, result.tags_created, result.skipped, result.chunks) == (3, 3, 1, 2)
+
+        items = {item.name: item for item in session.query(Item).all()}
+        assert sorted(tag.name for tag in items["Decorators"].tags) == ["advanced", "python"]
+        assert items["Decorators"].review_schedule.status == "mastered"
+        assert items["Closures"].review_schedule.current_interval_index == 1
+        assert session.query(Tag).count() == 3
+
+        # Re-importing reuses existing tags
+        assert import_file(session, deck).tags_created == 0
+    finally:
+        session.close()
+        db.close()
+
+
+def test_import_anki_tsv(tmp_path):
+    deck = tmp_path / "deck.txt"
+    deck.write_text("#separator:tab\n#tags column:3\nbonjour\thello\tfrench vocab\nmerci\tthanks\tfrench\n")
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    try:
+        assert import_file(session, deck).items == 2
+        merci = session.query(Item).filter_by(name="merci").one()
+        assert [tag.name for tag in merci.tags] == ["french"]
+    finally:
+        session.close()
+        db.close()
+
+
+def test_tags_with_commas_survive_a_csv_round_trip(tmp_path):
+    deck = tmp_path / "deck.csv"
+    db = Database(str(tmp_path / "nudge.db"))
+    copy = Database(str(tmp_path / "copy.db"))
+    session, copy_session = db.get_session(), copy.get_session()
+    try:
+        create_item(session, "Biography", ["Smith, John"])
+        create_item(session, "Letters", ["Smith, John", "history"])
+        assert export_file(session, deck) == 2
+        import_file(copy_session, deck)
+
+        items = {item.name: sorted(tag.name for tag in item.tags) for item in copy_session.query(Item).all()}
+        assert items == {"Biography": ["Smith, John"], "Letters": ["Smith, John", "history"]}
+    finally:
+        session.close()
+        copy_session.close()
+        db.close()
+        copy.close()
+
+
+def test_tags_with_separators_survive_csv_and_jsonl_round_trips(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    expected = {
+        "Templates": ["C; C++", "python"],
+        "Pointers": ["C; C++"],
+        "Quotes": ['say "hi"'],
+        "Biography": ["Smith, John"],
+    }
+    try:
+        for name, tags in expected.items():
+            create_item(session, name, tags)
+        for deck in (tmp_path / "deck.csv", tmp_path / "deck.jsonl"):
+            assert export_file(session, deck) == len(expected)
+            copy = Database(str(tmp_path / f"{deck.suffix[1:]}.db"))
+            copy_session = copy.get_session()
+            try:
+                import_file(copy_session, deck)
+                items = {item.name: sorted(tag.name for tag in item.tags) for item in copy_session.query(Item).all()}
+                assert items == expected, deck.suffix
+            finally:
+                copy_session.close()
+                copy.close()
+    finally:
+        session.close()
+        db.close()
@@ -0,0 +1,166 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.ui.models.item_table_model import ItemTableModel
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    import_records(session, (ImportRecord(name=f"item {i:03d}", tags=[f"tag{i % 3}"]) for i in range(250)))
+    yield session
+    session.close()
+    db.close()
+
+
+def _all_ids(model):
+    while model.canFetchMore():
+        model.fetchMore()
+    return [model.data(model.index(row, 0), Qt.ItemDataRole.UserRole) for row in range(model.rowCount())]
+
+
+def test_pages_are_fetched_lazily_and_evicted(qapp, session):
+    model = ItemTableModel(session, page_size=20, max_resident_pages=3)
+    assert model.rowCount() == 20
+    assert model.canFetchMore()
+
+    ids = _all_ids(model)
+    assert len(ids) == len(set(ids)) == 250
+    assert not model.canFetchMore()
+    assert model.resident_row_count() <= 3 * 20
+
+    # Ids stay known for rows whose page was evicted
+    assert model.item_id_at_row(0) == ids[0] and model.item_id_at_row(249) == ids[-1]
+    assert model.item_id_at_row(250) is None
+
+    # An evicted page is re-fetched from its cursor
+    assert model.data(model.index(0, 0)) == model.get_item_at_row(0).name
+
+
+def test_sort_and_search_are_applied_in_sql(qapp, session):
+    model = ItemTableModel(session, page_size=20)
+    model.sort_items(0, ascending=False)
+    assert model.data(model.index(0, 0)) == "item 249"
+    assert len(_all_ids(model)) == 250
+
+    model.set_search_text("TAG1")
+    assert len(_all_ids(model)) == 83
+
+
+def test_tag_sort_uses_persisted_key(qapp, session):
+    from nudge.core.models import Item, Tag
+
+    session.query(Tag).filter_by(name="tag2").one().name = "a-first"
+    session.commit()
+    assert session.query(Item).filter_by(name="item 002").one().tag_key == "a-first"
+
+    model = ItemTableModel(session, page_size=20)
+    model.sort_items(1)
+    assert model.data(model.index(0, 1)) == "a-first"
+    assert model.data(model.index(0, 0)) == "item 002"  # ties fall back to the item id
+    assert len(_all_ids(model)) == 250
+
+
+@pytest.fixture
+def bus_model(qapp, session):
+    from nudge.core.events import get_change_bus
+
+    model = ItemTableModel(session, page_size=20, max_resident_pages=3)
+    unsubscribe = get_change_bus().subscribe(model.apply_changes)
+    yield model
+    unsubscribe()
+
+
+def _signals(model):
+    seen = []
+    model.modelReset.connect(lambda: seen.append("reset"))
+    model.rowsInserted.connect(lambda parent, first, last: seen.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: seen.append(("removed", first, last)))
+    model.dataChanged.connect(lambda top, bottom: seen.append(("changed", top.row(), bottom.row())))
+    return seen
+
+
+def _assert_matches_fresh_model(model, session):
+    expected = ItemTableModel(session, page_size=20)
+    expected.sort_items(model.sort_column, model.ascending)
+    expected.set_search_text(model.search_text)
+    assert _all_ids(model) == _all_ids(expected)
+
+
+def test_changes_update_only_affected_rows(bus_model, session):
+    from nudge.core.items import create_item, delete_item
+    from nudge.core.scheduler import mark_many_reviewed
+
+    model = bus_model
+    model.sort_items(0)  # Name
+    model.fetchMore()
+    seen = _signals(model)
+
+    # Reviewing under the name sort keeps the row in place
+    reviewed = model.get_item_at_row(5)
+    mark_many_reviewed(session, [reviewed.id])
+    assert seen == [("changed", 5, 5)]
+    assert model.get_item_at_row(5).texts[4] == "3 days"
+
+    seen.clear()
+    delete_item(session, model.get_item_at_row(3).id)
+    assert seen == [("removed", 3, 3)]
+
+    seen.clear()
+    create_item(session, "item 010a", [])
+    assert "reset" not in seen and seen[0] == ("inserted", 10, 10)
+    assert model.get_item_at_row(10).name == "item 010a"
+    _assert_matches_fresh_model(model, session)
+
+
+def test_deleting_many_items_removes_their_rows(bus_model, session):
+    from nudge.core.items import delete_items
+
+    model = bus_model
+    ids = [model.item_id_at_row(row) for row in (1, 2)]
+    with pytest.raises(ValueError, match="not found"):
+        delete_items(session, [*ids, 9999])
+    assert model.rowCount() == 20
+
+    assert delete_items(session, ids) == 2
+    assert model.rowCount() == 18
+    _assert_matches_fresh_model(model, session)
+
+
+def test_changed_rows_move_to_their_sorted_position(bus_model, session):
+    from nudge.core.scheduler import mark_many_reviewed
+
+    model = bus_model  # Next Review, ascending
+    first = model.get_item_at_row(0)
+    mark_many_reviewed(session, [first.id])
+
+    # Its next review moved out of the fetched range
+    assert first.id not in [model.get_item_at_row(row).id for row in range(model.rowCount())]
+    assert model.rowCount() == 19
+    _assert_matches_fresh_model(model, session)
+
+
+def test_changes_respect_the_search_filter(bus_model, session):
+    from nudge.core.items import create_item
+
+    model = bus_model
+    model.set_search_text("tag1")
+    count = len(_all_ids(model))
+    create_item(session, "unrelated", ["tag2"])
+    create_item(session, "related", ["tag1"])
+    assert model.rowCount() == count + 1
+    _assert_matches_fresh_model(model, session)
@@ -0,0 +1,88 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from nudge.core.database import Database
+from nudge.core.items import create_item
+from nudge.core.models import ReviewSchedule
+from nudge.services.db_worker import DatabaseWorker
+from nudge.services.notifier import ReviewNotifier
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def notifier(qapp, db):
+    worker = DatabaseWorker(db)
+    notifier = ReviewNotifier(worker)
+    yield notifier
+    worker.shutdown()
+
+
+def _process_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert condition()
+
+
+def _set_due(db, item_id, when):
+    session = db.get_session()
+    session.query(ReviewSchedule).filter_by(item_id=item_id).update({"next_review_date": when})
+    session.commit()
+    session.close()
+
+
+def test_timer_is_armed_for_the_next_due_date(qapp, db, notifier):
+    session = db.get_session()
+    overdue = create_item(session, "overdue", []).id
+    later = create_item(session, "later", []).id
+    session.close()
+    _set_due(db, overdue, datetime.now() - timedelta(days=1))
+    _set_due(db, later, datetime.now() + timedelta(hours=2))
+
+    counts = []
+    notifier.due_count_changed.connect(counts.append)
+    notifier.start()
+    _process_until(qapp, lambda: counts)
+
+    assert counts == [1]
+    assert notifier.timer.isActive()
+    remaining = timedelta(milliseconds=notifier.timer.remainingTime())
+    assert timedelta(hours=2) - timedelta(seconds=5) < remaining <= timedelta(hours=2)
+
+
+def test_items_becoming_due_are_announced_when_the_timer_fires(qapp, db, notifier):
+    session = db.get_session()
+    item_id = create_item(session, "soon", []).id
+    session.close()
+    _set_due(db, item_id, datetime.now() + timedelta(milliseconds=200))
+
+    newly_due = []
+    notifier.items_became_due.connect(newly_due.append)
+    notifier.start()
+    _process_until(qapp, lambda: notifier.due_count == 0)
+    assert notifier.timer.isActive()
+
+    _process_until(qapp, lambda: newly_due)
+    assert newly_due == [1]
+    assert notifier.due_count == 1
+    # Nothing else is scheduled, so the notifier goes idle
+    assert not notifier.timer.isActive()
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from nudge import cli
+from nudge.core import perf
+from nudge.core.database import Database
+from nudge.core.items import create_item
+from nudge.core.scheduler import get_due_items
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    recorder = perf.enable(tmp_path / "trace.jsonl")
+    yield recorder
+    perf.disable()
+
+
+def test_normalize_sql_groups_repeated_shapes():
+    assert perf.normalize_sql("SELECT *\n  FROM tags WHERE name IN (?, ?, ?)") == "SELECT * FROM tags WHERE name IN (?...)"
+    assert perf.normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ?), ..."
+
+
+def test_statements_and_timers_are_recorded(recorder, tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    for i in range(3):
+        create_item(session, f"item {i}", ["python", f"tag{i}"])
+    session.expunge_all()
+    assert len(get_due_items(session, days_ahead=2)) == 3
+    session.close()
+    db.close()
+
+    create = recorder.timers["items.create_item"]
+    assert create.count == 3
+    assert create.queries > 0
+    assert recorder.timers["tags.TagRegistry.resolve"].count == 3
+
+    due = recorder.timers["scheduler.get_due_items"]
+    # One query for the schedules, then more for each item: the lazy loads show up as queries per call
+    assert due.queries >= 1 + 3
+    item_loads = [stat for sql, stat in recorder.statements.items() if sql.startswith("SELECT items.") and "items.id = ?" in sql]
+    assert item_loads and item_loads[0].count >= 3
+    assert recorder.statements["INSERT INTO item_tags (item_id, tag_id) VALUES (?, ?)"].rows == 6
+    assert all(stat.p95 <= stat.total for stat in recorder.statements.values())
+
+    # The trace aggregates to the same numbers
+    recorder.close()
+    replayed = perf.PerfRecorder.from_trace(recorder.trace_path)
+    assert replayed.timers["items.create_item"].queries == create.queries
+    assert {sql: stat.count for sql, stat in replayed.statements.items()} == {
+        sql: stat.count for sql, stat in recorder.statements.items()
+    }
+
+
+def test_failed_statement_leaves_no_start_time(recorder, tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    with db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing"))
+        conn.execute(text("SELECT 1"))
+        assert not conn.info["nudge_perf_started"]
+    db.close()
+
+    assert "SELECT * FROM missing" not in recorder.statements
+    assert recorder.statements["SELECT 1"].count == 1
+
+
+def test_timed_is_a_plain_call_while_disabled():
+    assert perf.get_recorder() is None
+    assert perf.call_timed("anything", lambda x: x + 1, 1) == 2
+
+
+def test_stats_perf(tmp_path, capsys):
+    db_path = str(tmp_path / "nudge.db")
+    trace = tmp_path / "trace.jsonl"
+    assert cli.main(["add", "Decorators", "-t", "python", "--db", db_path, "--trace", str(trace)]) == 0
+    assert perf.get_recorder() is None
+
+    assert cli.main(["stats", "--db", db_path, "--perf"]) == 0
+    out = capsys.readouterr().out
+    assert "Items:     1" in out
+    assert "stats.get_dashboard" in out
+
+    assert cli.main(["stats", "--perf", str(trace)]) == 0
+    out = capsys.readouterr().out
+    assert "items.create_item" in out
+    assert "INSERT INTO items" in out
@@ -0,0 +1,195 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.models import Item, ReviewSchedule, Tag
+from nudge.core.scheduler import (
+    INTERVALS,
+    count_by_status,
+    count_by_tag,
+    count_due,
+    create_review_schedule,
+    due_histogram,
+    get_interval_name,
+    get_intervals,
+    get_next_review_date,
+    iter_due_items,
+    iter_upcoming_items,
+    mark_as_reviewed,
+    mark_many_reviewed,
+    reschedule_all,
+)
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    yield session
+    session.close()
+    db.close()
+
+
+def _add_items(session, count):
+    items = [Item(name=f"item {i}") for i in range(count)]
+    session.add_all(items)
+    session.commit()
+    for item in items:
+        create_review_schedule(session, item)
+    return [item.id for item in items]
+
+
+def test_mark_many_reviewed_matches_single_review(session):
+    ids = _add_items(session, 3)
+    reviewed_at = datetime(2024, 1, 1, 9, 0)
+    session.query(ReviewSchedule).filter_by(item_id=ids[2]).update({"current_interval_index": len(INTERVALS) - 2})
+    session.commit()
+
+    assert mark_many_reviewed(session, ids[1:], reviewed_at) == 2
+    mark_as_reviewed(session, ids[0], reviewed_at)
+
+    schedules = {s.item_id: s for s in session.query(ReviewSchedule).all()}
+    for item_id in ids[:2]:
+        schedule = schedules[item_id]
+        assert schedule.current_interval_index == 1
+        assert schedule.review_count == 1
+        assert schedule.last_review_date == reviewed_at
+        assert schedule.next_review_date == reviewed_at + timedelta(days=INTERVALS[1])
+        assert schedule.status == "learning"
+    assert schedules[ids[2]].status == "mastered"
+    assert schedules[ids[2]].next_review_date == reviewed_at + timedelta(days=INTERVALS[-1])
+
+
+def test_mark_many_reviewed_is_all_or_nothing(session):
+    ids = _add_items(session, 2)
+    with pytest.raises(ValueError, match="999"):
+        mark_many_reviewed(session, [*ids, 999])
+    assert all(s.review_count == 0 for s in session.query(ReviewSchedule).all())
+
+
+def test_count_due_and_next_review_date(session):
+    ids = _add_items(session, 3)
+    base = datetime(2024, 1, 1)
+    for offset, item_id in enumerate(ids):
+        session.query(ReviewSchedule).filter_by(item_id=item_id).update({"next_review_date": base + timedelta(days=offset)})
+    session.commit()
+
+    assert count_due(session, base - timedelta(seconds=1)) == 0
+    assert count_due(session, base + timedelta(days=1)) == 2
+    assert get_next_review_date(session) == base
+    assert get_next_review_date(session, after=base) == base + timedelta(days=1)
+    assert get_next_review_date(session, after=base + timedelta(days=2)) is None
+
+
+def test_aggregate_counts_do_not_load_items(session):
+    today = date.today()
+    noon = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    import_records(session, [
+        ImportRecord(name="overdue", tags=["python"], next_review_date=noon - timedelta(days=3)),
+        ImportRecord(name="today", tags=["python", "sql"], next_review_date=noon),
+        ImportRecord(name="in two days", tags=["sql"], next_review_date=noon + timedelta(days=2)),
+        ImportRecord(name="next month", interval_index=len(INTERVALS) - 1, next_review_date=noon + timedelta(days=30)),
+    ])
+    session.expunge_all()
+
+    assert due_histogram(session, days_ahead=3) == [
+        (today, 2),
+        (today + timedelta(days=1), 0),
+        (today + timedelta(days=2), 1),
+        (today + timedelta(days=3), 0),
+    ]
+    assert count_by_status(session) == [("learning", 3), ("mastered", 1)]
+    assert count_by_tag(session, now=noon) == [("python", 2, 2), ("sql", 2, 1)]
+    assert len(session.identity_map) == 0
+
+
+def test_streaming_due_queue_pages_with_keyset_cursor(session):
+    now = datetime.now()
+    # Ties on the date are ordered by schedule id
+    dates = [now - timedelta(days=i % 4) for i in range(25)] + [now + timedelta(days=2)]
+    import_records(session, [
+        ImportRecord(name=f"item {i}", tags=["python", f"t{i % 2}"], next_review_date=due) for i, due in enumerate(dates)
+    ])
+    session.expunge_all()
+
+    everything = list(iter_due_items(session))
+    assert len(everything) == 25
+    assert [row.cursor for row in everything] == sorted(row.cursor for row in everything)
+
+    pages, after = [], None
+    while True:
+        page = list(iter_due_items(session, limit=10, after=after))
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1].cursor
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [row for page in pages for row in page] == everything
+
+    first = everything[0]
+    tag_names = {tag.id: tag.name for tag in session.query(Tag)}
+    assert sorted(tag_names[tag_id] for tag_id in first.tag_ids) == sorted(["python", f"t{int(first.name.split()[1]) % 2}"])
+    session.expunge_all()
+
+    upcoming = list(iter_upcoming_items(session, days_ahead=3))
+    assert [row.name for row in upcoming] == ["item 25"]
+    assert len(session.identity_map) == 0
+
+
+def test_reschedule_all_remaps_onto_new_ladder(session):
+    now = datetime(2024, 3, 1, 9, 0)
+    last = now - timedelta(days=2, microseconds=250)
+    import_records(session, [
+        ImportRecord(name="new", next_review_date=now + timedelta(days=1)),
+        ImportRecord(name="week", next_review_date=last + timedelta(days=7), last_review_date=last, interval_index=2, review_count=3),
+        ImportRecord(name="mastered", next_review_date=last + timedelta(days=120), last_review_date=last, interval_index=6, review_count=7),
+    ])
+    ladder = [1, 3, 7, 14, 30, 60, 120, 240]
+
+    preview = reschedule_all(session, ladder, "index", dry_run=True, now=now)
+    assert preview.changed == 1 and preview.dry_run
+    assert preview.status_before == {"learning": 2, "mastered": 1}
+    assert preview.status_after == {"learning": 3}
+    assert session.query(ReviewSchedule).filter_by(status="mastered").count() == 1
+
+    # A 7 day interval is nearest to the 5 day step, 120 days to the 80 day step
+    report = reschedule_all(session, [2, 5, 10, 20, 40, 80], "nearest", days_ahead=10, now=now)
+    assert report.changed == 2
+    schedules = {s.item.name: s for s in session.query(ReviewSchedule)}
+    assert schedules["new"].next_review_date == now + timedelta(days=1)
+    assert schedules["week"].current_interval_index == 1
+    assert schedules["week"].next_review_date == last + timedelta(days=5)
+    assert (schedules["mastered"].current_interval_index, schedules["mastered"].status) == (5, "mastered")
+    assert dict(report.due_shift)[(last + timedelta(days=7)).date()] == -1
+    assert dict(report.due_shift)[(last + timedelta(days=5)).date()] == 1
+
+    # Already on the ladder: nothing to do
+    assert reschedule_all(session, [2, 5, 10, 20, 40, 80], "nearest", now=now).changed == 0
+    with pytest.raises(ValueError, match="increasing"):
+        reschedule_all(session, [3, 1])
+    with pytest.raises(ValueError, match="policy"):
+        reschedule_all(session, ladder, "closest")
+
+
+def test_reschedule_all_keeps_the_new_ladder(session):
+    now = datetime(2024, 3, 1, 9, 0)
+    last = now - timedelta(days=2)
+    import_records(session, [
+        ImportRecord(name="week", next_review_date=last + timedelta(days=7), last_review_date=last, interval_index=2),
+    ])
+    item_id = session.query(Item.id).scalar()
+
+    reschedule_all(session, [1, 3, 7], "index", now=now)
+    assert get_intervals(session) == [1, 3, 7]
+    assert get_interval_name(2, get_intervals(session)) == "7 days"
+
+    schedule = mark_as_reviewed(session, item_id, now)
+    assert (schedule.current_interval_index, schedule.status) == (2, "mastered")
+    assert schedule.next_review_date == now + timedelta(days=7)
+
+    import_records(session, [ImportRecord(name="imported", interval_index=5, last_review_date=now)])
+    imported = session.query(ReviewSchedule).join(Item).filter(Item.name == "imported").one()
+    assert (imported.current_interval_index, imported.status) == (2, "mastered")
+    assert imported.next_review_date == now + timedelta(days=7)
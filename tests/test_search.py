@@ -0,0 +1,55 @@
+import pytest
+
+from nudge.core import search_items
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.models import Item, Tag
+from nudge.core.search import build_match_query
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    import_records(session, [
+        ImportRecord(name="Python decorators", tags=["python"]),
+        ImportRecord(name="French vocabulary", tags=["language"]),
+        ImportRecord(name="Closures and scope", tags=["python", "advanced"]),
+    ])
+    yield session
+    session.close()
+    db.close()
+
+
+def _names(items):
+    return [item.name for item in items]
+
+
+def test_build_match_query():
+    assert build_match_query('pyth "exact phrase" c++') == '"pyth"* AND "exact phrase" AND "c"*'
+    assert build_match_query("  -- ") == ""
+
+
+def test_prefix_phrase_and_ranking(session):
+    # The name column outranks the tags column
+    assert _names(search_items(session, "pyth")) == ["Python decorators", "Closures and scope"]
+    assert _names(search_items(session, '"and scope"')) == ["Closures and scope"]
+    assert _names(search_items(session, '"scope and"')) == []
+    assert _names(search_items(session, "pyth", limit=1, offset=1)) == ["Closures and scope"]
+
+
+def test_index_follows_renames_and_deletes(session):
+    tag = session.query(Tag).filter_by(name="language").one()
+    tag.name = "francais"
+    item = session.query(Item).filter_by(name="Python decorators").one()
+    item.name = "Wrappers"
+    session.commit()
+
+    assert _names(search_items(session, "franc")) == ["French vocabulary"]
+    assert _names(search_items(session, "wrap")) == ["Wrappers"]
+
+    session.delete(session.query(Tag).filter_by(name="advanced").one())
+    session.delete(item)
+    session.commit()
+    assert _names(search_items(session, "advanced")) == []
+    assert _names(search_items(session, "python")) == ["Closures and scope"]
@@ -0,0 +1,79 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from nudge.core.database import Database
+from nudge.server import ApiServer
+
+
+@pytest.fixture
+def client(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    server = ApiServer(db, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    def request(method, path, body=None, headers=None):
+        payload = json.dumps(body) if body is not None else None
+        connection.request(method, path, payload, headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else None, response.getheader("ETag")
+
+    yield request
+    connection.close()
+    server.shutdown()
+    server.server_close()
+    db.close()
+
+
+def test_items_and_pagination(client):
+    for i in range(5):
+        status, item, _ = client("POST", "/items", {"name": f"item {i}", "tags": ["python"]})
+        assert status == 201
+    assert item == {**item, "name": "item 4", "tags": ["python"], "review_count": 0}
+
+    first = client("GET", "/items?limit=3")[1]
+    assert [row["name"] for row in first["items"]] == ["item 0", "item 1", "item 2"]
+    rest = client("GET", f"/items?limit=3&after={first['next']}")[1]
+    assert [row["name"] for row in rest["items"]] == ["item 3", "item 4"] and rest["next"] is None
+
+    assert client("GET", "/tags")[1]["tags"][0]["name"] == "python"
+    assert client("DELETE", f"/items/{item['id']}")[0] == 204
+    assert client("GET", f"/items/{item['id']}")[0] == 404
+    assert client("POST", "/items", {"tags": []})[0] == 400
+    assert client("PUT", "/items")[0] == 405
+    assert client("GET", "/nowhere")[0] == 404
+
+
+def test_due_queue_etag_and_reviews(client):
+    ids = [client("POST", "/items", {"name": f"item {i}"})[1]["id"] for i in range(3)]
+
+    status, page, etag = client("GET", "/due?days=2&limit=2")
+    assert status == 200 and etag
+    assert [row["id"] for row in page["items"]] == ids[:2]
+    rest = client("GET", f"/due?days=2&limit=2&after={page['next']}")[1]
+    assert [row["id"] for row in rest["items"]] == ids[2:]
+
+    # Unchanged queue: answered from the server's or the client's copy
+    assert client("GET", "/due?days=2&limit=2") == (200, page, etag)
+    for header in (etag, f'"stale", W/{etag}', "*"):
+        assert client("GET", "/due?days=2&limit=2", headers={"If-None-Match": header})[:2] == (304, None)
+    # Tags are compared whole, not searched for in the header
+    assert client("GET", "/due?days=2&limit=2", headers={"If-None-Match": f'"{etag}"'})[0] == 200
+
+    status, item, _ = client("POST", f"/items/{ids[0]}/review", {"grade": "easy"})
+    assert status == 200 and item["review_count"] == 1 and item["interval_index"] == 2
+    status, page, new_etag = client("GET", "/due?days=2&limit=2", headers={"If-None-Match": etag})
+    assert status == 200 and new_etag != etag
+    assert [row["id"] for row in page["items"]] == ids[1:]
+
+    assert client("POST", "/review", {"ids": ids[1:], "grade": "good"})[1] == {"updated": 2}
+    assert client("GET", "/due?days=2")[1]["items"] == []
+    assert client("POST", "/review", {"ids": [999]})[0] == 404
+    assert client("POST", "/review", {"ids": ids, "grade": "perfect"})[0] == 400
+    assert client("GET", "/upcoming?days=30")[1]["items"][0]["id"] == ids[1]
+    assert client("GET", "/due?after=garbage")[0] == 400
@@ -0,0 +1,17 @@
+import io
+
+from nudge.startup import StartupProfiler
+
+
+def test_profiler_reports_each_phase():
+    profiler = StartupProfiler()
+    first = profiler.mark("imports")
+    second = profiler.mark("database")
+    assert first >= 0 and second >= 0
+    assert abs(profiler.total - (first + second)) < 1e-9
+
+    out = io.StringIO()
+    profiler.report(out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "Startup profile:"
+    assert [line.split()[0] for line in lines[1:]] == ["imports", "database", "total"]
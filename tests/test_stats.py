@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from nudge.core.database import Database
+from nudge.core.importer import ImportRecord, import_records
+from nudge.core.items import create_item, delete_item
+from nudge.core.models import Tag
+from nudge.core.scheduler import Grade, count_due, make_algorithm, mark_many_reviewed, reschedule_all, set_algorithm
+from nudge.core.stats import get_dashboard, rebuild_stats
+
+
+@pytest.fixture
+def session(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    session = db.get_session()
+    yield session
+    session.close()
+    db.close()
+
+
+def _rebuilt(session, now):
+    dashboard = get_dashboard(session, review_days=7, now=now)
+    rebuild_stats(session.connection())
+    session.commit()
+    return dashboard, get_dashboard(session, review_days=7, now=now)
+
+
+def test_summary_tables_follow_every_write(session):
+    now = datetime.now()
+    ids = [create_item(session, f"item {i}", ["python"] if i % 2 else ["python", "sql"]).id for i in range(6)]
+    import_records(session, [
+        ImportRecord("imported", ["sql"], next_review_date=now - timedelta(days=3), interval_index=2, review_count=2),
+    ])
+
+    dashboard = get_dashboard(session, review_days=7, now=now)
+    assert dashboard.items == 7 and dashboard.by_status == {"learning": 7}
+    assert dashboard.by_interval == [(0, 6), (2, 1)]
+    assert dashboard.by_tag == [("python", 6), ("sql", 4)]
+    # New items are first due tomorrow
+    assert dashboard.overdue == count_due(session, now) == 1
+
+    mark_many_reviewed(session, ids[:3], now, Grade.EASY)
+    mark_many_reviewed(session, ids[:1], now, Grade.AGAIN)
+    dashboard = get_dashboard(session, review_days=7, now=now + timedelta(days=2))
+    assert dashboard.by_interval == [(0, 4), (2, 3)]
+    assert dashboard.reviews_per_day[-3] == (now.date(), 4)
+    assert dashboard.overdue == count_due(session, now + timedelta(days=2)) == 5
+
+    set_algorithm(session, make_algorithm("sm2"), now=now)
+    reschedule_all(session, [1, 3, 7, 14], policy="index", now=now)
+    delete_item(session, ids[1])
+    session.delete(session.query(Tag).filter_by(name="sql").one())
+    session.commit()
+
+    incremental, rebuilt = _rebuilt(session, now)
+    assert incremental == rebuilt
+    assert incremental.items == 6 and incremental.by_tag == [("python", 5)]
+    assert incremental.reviews_per_day[-1] == (now.date(), 3)
+    assert incremental.overdue == count_due(session, now)
+    assert count_due(session, now + timedelta(days=30)) == get_dashboard(session, now=now + timedelta(days=30)).overdue
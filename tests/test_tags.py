@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import event
+
+from nudge.core.database import Database
+from nudge.core.events import ChangeBus
+from nudge.core.models import Tag
+from nudge.core.tags import TagRegistry
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "nudge.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def statements(db):
+    seen = []
+    listener = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    yield seen
+    event.remove(db.engine, "before_cursor_execute", listener)
+
+
+def test_resolve_creates_missing_tags_in_bulk(db, statements):
+    bus = ChangeBus()
+    registry = TagRegistry(bus)
+    session = db.get_session()
+    session.add(Tag(name="python", color="#FF6B6B"))
+    session.commit()
+
+    statements.clear()
+    tags, created = registry.resolve(session, ["python", "sql", "rust", "sql"])
+    session.commit()
+    assert sorted(tags) == ["python", "rust", "sql"]
+    assert tags["python"].color == "#FF6B6B"
+    assert sorted(created) == sorted([tags["rust"].id, tags["sql"].id])
+    assert [s.split()[0] for s in statements] == ["SELECT", "INSERT"]
+
+    # Existing tags are cached; created ones once their commit is published
+    statements.clear()
+    registry.resolve(session, ["python"])
+    assert statements == []
+    bus.publish(tags=created)
+    registry.resolve(session, ["python", "sql", "rust"])
+    assert len(statements) == 1
+    statements.clear()
+    registry.resolve(session, ["python", "sql", "rust"])
+    assert statements == []
+    session.close()
+
+
+def test_rolled_back_tags_are_not_cached(db):
+    registry = TagRegistry(ChangeBus())
+    session = db.get_session()
+    registry.resolve(session, ["temp"])
+    # Found again within the same transaction, then rolled back
+    registry.resolve(session, ["temp"])
+    session.rollback()
+
+    assert registry.get_tags(session) == []
+    tags, created = registry.resolve(session, ["temp"])
+    assert created == [tags["temp"].id]
+    session.close()
+
+
+def test_get_tags_is_cached_until_invalidated(db, statements):
+    bus = ChangeBus()
+    registry = TagRegistry(bus)
+    session = db.get_session()
+    _, created = registry.resolve(session, ["b", "a"])
+    session.commit()
+    bus.publish(tags=created)
+
+    assert [tag.name for tag in registry.get_tags(session)] == ["a", "b"]
+    statements.clear()
+    registry.get_tags(session)
+    assert statements == []
+
+    _, created = registry.resolve(session, ["c"])
+    session.commit()
+    bus.publish(tags=created)
+    assert [tag.name for tag in registry.get_tags(session)] == ["a", "b", "c"]
+    session.close()
+
+
+def test_create_item_commits_once_and_publishes_one_insert(db):
+    from nudge.core.events import get_change_bus
+    from nudge.core.items import create_item
+
+    session = db.get_session()
+    commits = []
+    event.listen(session, "after_commit", commits.append)
+    published = []
+    unsubscribe = get_change_bus().subscribe(published.append)
+    try:
+        item = create_item(session, "decorators", ["python"])
+    finally:
+        unsubscribe()
+
+    assert len(commits) == 1
+    assert len(published) == 1 and published[0].inserted == {item.id} and not published[0].updated
+    assert [tag.name for tag in item.tags] == ["python"] and published[0].tags == {item.tags[0].id}
+    assert item.review_schedule.status == "learning"
+    session.close()